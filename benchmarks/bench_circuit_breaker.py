@@ -0,0 +1,111 @@
+"""Chain latency while the gateway degrades, with and without a circuit breaker.
+
+The LLM recognizer runs first with keyword fallback against a fake gateway
+that is healthy, then hangs past the client timeout, then recovers. Run from
+the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_circuit_breaker.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "tests"))
+
+from fake_gateway import FakeGateway  # noqa: E402
+
+from sage_libs.sage_agentic.intent.base import (  # noqa: E402
+    ChainedIntentRecognizer,
+    IntentRecognitionContext,
+)
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker  # noqa: E402
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer  # noqa: E402
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer  # noqa: E402
+from sage_libs.sage_agentic.intent.metrics import IntentMetrics  # noqa: E402
+
+
+async def phase(
+    chain: ChainedIntentRecognizer, requests: int, concurrency: int
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    served_by_llm = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal served_by_llm
+        async with semaphore:
+            start = time.perf_counter()
+            result = await chain.classify(IntentRecognitionContext(message=f"hello #{i}"))
+            latencies.append(time.perf_counter() - start)
+            served_by_llm += result.trace[-1].startswith("LLMIntentRecognizer")
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, served_by_llm
+
+
+async def scenario(gateway: FakeGateway, breaker: CircuitBreaker, args: argparse.Namespace) -> None:
+    metrics = IntentMetrics()
+    metrics.watch_circuit("LLMIntentRecognizer", breaker)
+    llm = LLMIntentRecognizer(
+        control_plane_url=gateway.url, timeout=args.timeout, circuit_breaker=breaker
+    )
+    chain = ChainedIntentRecognizer([llm, KeywordIntentRecognizer()], metrics=metrics)
+    for name, latency in (
+        ("healthy", args.latency),
+        ("degraded", args.timeout * 4),
+        ("probing", args.latency),
+        ("recovered", args.latency),
+    ):
+        gateway.latency = latency
+        if name == "probing":
+            # Give the breaker time to half-open and probe.
+            await asyncio.sleep(breaker.open_seconds)
+        latencies, by_llm = await phase(chain, args.requests, args.concurrency)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"  {name:<10} p50={statistics.median(latencies) * 1000:8.1f} ms  "
+            f"p99={p99 * 1000:8.1f} ms  served by LLM={by_llm:4d}/{args.requests}  "
+            f"circuit={breaker.state}"
+        )
+    transitions = {
+        state: int(metrics.circuit_transitions.value("LLMIntentRecognizer", state))
+        for state in ("open", "half_open", "closed")
+    }
+    print(f"  transitions={transitions} rejected={breaker.rejected}")
+    await llm.aclose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="healthy latency (s)")
+    parser.add_argument("--timeout", type=float, default=0.5, help="client timeout (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    gateway = FakeGateway(latency=args.latency)
+    await gateway.start()
+    try:
+        print("no breaker (never opens):")
+        await scenario(gateway, CircuitBreaker(failure_rate=2.0, slow_call_rate=2.0), args)
+        print("circuit breaker:")
+        await scenario(
+            gateway,
+            CircuitBreaker(slow_call_seconds=args.timeout / 2, open_seconds=1.0),
+            args,
+        )
+    finally:
+        await gateway.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
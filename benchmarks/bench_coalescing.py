@@ -0,0 +1,85 @@
+"""Burst of identical messages through IntentClassifier, with and without coalescing.
+
+Each burst sends the same few messages many times at once, as during an
+incident, to an LLM recognizer behind a fake gateway. Run from the repository
+root::
+
+    PYTHONPATH=src python benchmarks/bench_coalescing.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "tests"))
+
+from fake_gateway import FakeGateway  # noqa: E402
+
+from sage_libs.sage_agentic.intent.base import ChainedIntentRecognizer  # noqa: E402
+from sage_libs.sage_agentic.intent.cache import IntentResultCache  # noqa: E402
+from sage_libs.sage_agentic.intent.classifier import IntentClassifier  # noqa: E402
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer  # noqa: E402
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer  # noqa: E402
+
+MESSAGES = ["is the service down", "Is the service down?", "gateway returns 502", "help"]
+
+
+async def burst(
+    gateway: FakeGateway, coalesce: bool, cached: bool, args: argparse.Namespace
+) -> tuple[float, float, int]:
+    classifier = IntentClassifier(cache=IntentResultCache() if cached else None, coalesce=coalesce)
+    llm = LLMIntentRecognizer(control_plane_url=gateway.url, max_concurrency=args.concurrency)
+    # Point the chain at the fake gateway; IntentClassifier has no URL option.
+    classifier._recognizer = ChainedIntentRecognizer([llm, KeywordIntentRecognizer()])
+    gateway.requests = 0
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        start = time.perf_counter()
+        await classifier.classify(MESSAGES[i % len(MESSAGES)])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    await llm.aclose()
+    await classifier.aclose()
+    return elapsed, statistics.median(latencies), gateway.requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100, help="LLM call limit")
+    parser.add_argument("--latency", type=float, default=0.2, help="gateway latency (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    gateway = FakeGateway(latency=args.latency)
+    await gateway.start()
+    print(f"{args.requests} requests over {len(MESSAGES)} messages, latency={args.latency}s")
+    try:
+        for cached in (False, True):
+            for coalesce in (False, True):
+                elapsed, p50, calls = await burst(gateway, coalesce, cached, args)
+                label = f"cache={'on' if cached else 'off'} coalesce={'on' if coalesce else 'off'}"
+                print(
+                    f"  {label:<28} gateway calls={calls:5d}  "
+                    f"p50={p50 * 1000:7.1f} ms  total={elapsed:6.2f} s"
+                )
+                if coalesce:
+                    # "is the service down" and "Is the service down?" differ after
+                    # normalization, so at most one call per distinct message.
+                    assert calls <= len(MESSAGES), calls
+    finally:
+        await gateway.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
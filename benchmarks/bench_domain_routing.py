@@ -0,0 +1,86 @@
+"""Retrieval fan-out and recall of knowledge-domain routing against searching every domain.
+
+Runs :func:`evaluate_routing` over a small hand-labelled set of knowledge
+questions (the domains that hold each answer) for several router settings,
+and times the routing step. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_domain_routing.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sage_libs.sage_agentic.intent.domains import DomainRouter, evaluate_routing
+from sage_libs.sage_agentic.intent.types import KnowledgeDomain
+
+DOCS = KnowledgeDomain.SAGE_DOCS
+EXAMPLES = KnowledgeDomain.EXAMPLES
+RESEARCH = KnowledgeDomain.RESEARCH_GUIDANCE
+UPLOADS = KnowledgeDomain.USER_UPLOADS
+
+SAMPLES: list[tuple[str, list[KnowledgeDomain]]] = [
+    ("How do I install SAGE on Ubuntu?", [DOCS]),
+    ("SAGE 怎么安装", [DOCS]),
+    ("what is a pipeline in SAGE", [DOCS]),
+    ("Operator 的参数是什么意思", [DOCS]),
+    ("where is the config file for the kernel", [DOCS]),
+    ("API docs for the middleware service", [DOCS]),
+    ("部署到集群需要什么配置", [DOCS]),
+    ("show me an example of a RAG pipeline", [EXAMPLES, DOCS]),
+    ("有没有 map operator 的示例代码", [EXAMPLES]),
+    ("tutorial for writing a custom operator", [EXAMPLES, DOCS]),
+    ("give me a code snippet that joins two streams", [EXAMPLES]),
+    ("如何实现一个流式问答 demo", [EXAMPLES]),
+    ("sample template for a batch job", [EXAMPLES]),
+    ("how should I structure the related work section of my paper", [RESEARCH]),
+    ("论文投稿前要注意什么", [RESEARCH]),
+    ("导师的研究方法论有哪些建议", [RESEARCH]),
+    ("how to design an ablation experiment for a research paper", [RESEARCH]),
+    ("academic writing tips for a first submission", [RESEARCH]),
+    ("审稿意见应该怎么回复", [RESEARCH]),
+    ("summarize the PDF I uploaded yesterday", [UPLOADS]),
+    ("我上传的附件里提到了哪些实验", [UPLOADS, RESEARCH]),
+    ("what does my file say about latency", [UPLOADS]),
+    ("这份文档第三节讲了什么", [UPLOADS]),
+    ("in the attachment I sent, which operators are used", [UPLOADS, DOCS]),
+]
+
+SETTINGS: list[tuple[str, dict[str, object]]] = [
+    ("keyword, top 1", {"max_domains": 1}),
+    ("keyword, top 2", {"max_domains": 2}),
+    ("keyword, threshold 0.1", {"threshold": 0.1, "max_domains": 4}),
+    ("keyword+embedding, top 2", {"embedding_model": "hashed", "max_domains": 2}),
+    ("embedding only, top 2", {"embedding_model": "hashed", "embedding_weight": 1.0}),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    messages = [message for message, _ in SAMPLES]
+    print(
+        f"{'router':<27} {'fan-out':>8} {'(all)':>6} {'recall':>7} {'loss':>6} "
+        f"{'route (us)':>11}  missed"
+    )
+    for name, options in SETTINGS:
+        router = DomainRouter(**options)  # type: ignore[arg-type]
+        evaluation = evaluate_routing(router, SAMPLES)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for message in messages:
+                router.route(message)
+        route_us = (time.perf_counter() - start) / (args.repeat * len(messages)) * 1e6
+        missed = ", ".join(f"{d.value}={n}" for d, n in evaluation.missed.items()) or "-"
+        print(
+            f"{name:<27} {evaluation.routed_fanout:>8.2f} {evaluation.baseline_fanout:>6.1f} "
+            f"{evaluation.routed_recall:>7.3f} {evaluation.recall_loss:>6.3f} "
+            f"{route_us:>11.1f}  {missed}"
+        )
+
+
+if __name__ == "__main__":
+    main()
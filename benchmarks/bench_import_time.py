@@ -0,0 +1,86 @@
+"""Cold-start budget for keyword-only users of the intent package.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime``; the
+cumulative import time of the package is compared with a budget, and the heavy
+optional dependencies must not have been imported.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_import_time.py --budget-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "sage_libs.sage_agentic.intent"
+HEAVY_MODULES = ("openai", "httpx", "numpy", "sage.common")
+
+SCENARIOS = {
+    "import": f"import {PACKAGE}",
+    "keyword classifier": (
+        f"from {PACKAGE} import IntentClassifier\n"
+        "import asyncio\n"
+        "asyncio.run(IntentClassifier(mode='keyword').classify('restart the gateway'))"
+    ),
+}
+
+CHECK_HEAVY = (
+    "\nimport sys\n"
+    f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print('LOADED=' + ','.join(loaded))"
+)
+
+
+def run(code: str) -> tuple[float, list[str]]:
+    """Return the package's cumulative import time (ms) and heavy modules loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + CHECK_HEAVY],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ.copy(),
+    )
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if fields[-1].strip() == PACKAGE:
+            cumulative_us = int(fields[1])
+    loaded = proc.stdout.rsplit("LOADED=", 1)[-1].strip()
+    return cumulative_us / 1000, [m for m in loaded.split(",") if m]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'scenario':<20} {'median (ms)':>12} {'min (ms)':>9}  heavy modules")
+    for name, code in SCENARIOS.items():
+        timings = []
+        loaded: list[str] = []
+        for _ in range(args.repeat):
+            elapsed, loaded = run(code)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        print(f"{name:<20} {median:>12.1f} {min(timings):>9.1f}  {', '.join(loaded) or '-'}")
+        if median > args.budget_ms:
+            failures.append(f"{name}: {median:.1f} ms > {args.budget_ms:.1f} ms budget")
+        if loaded:
+            failures.append(f"{name}: imported {', '.join(loaded)}")
+
+    assert not failures, "\n".join(failures)
+    print(f"within {args.budget_ms:.0f} ms budget, no heavy optional imports")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Per-message latency of the keyword and embedding recognizers as the catalog grows.
+
+Synthetic catalogs keep the four built-in intents as roots and hang two
+levels of sub-intents under them (``system_operation/g3/i7``) until the
+catalog holds the requested number of intents. The embedding recognizer is
+also timed on a flat catalog of the same size, where every message is scored
+against every centroid. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_intent_scaling.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+import time
+from collections.abc import Iterator
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.catalog import IntentTool, swap_catalog
+from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingIntentRecognizer
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+
+_SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+
+
+def words() -> Iterator[str]:
+    """Distinct pronounceable nonsense words, so synthetic intents share no tokens."""
+    for n in itertools.count():
+        yield "".join(_SYLLABLES[(n // len(_SYLLABLES) ** i) % len(_SYLLABLES)] for i in range(3))
+
+
+def synthetic_tool(tool_id: str, vocabulary: Iterator[str]) -> IntentTool:
+    own = [next(vocabulary) for _ in range(4)]
+    return IntentTool(
+        tool_id=tool_id,
+        name=own[0],
+        description=" ".join(own),
+        keywords=[f"{own[0]} {own[1]}", own[2], own[3]],
+    )
+
+
+def hierarchical_catalog(size: int, base: list[IntentTool]) -> list[IntentTool]:
+    vocabulary = words()
+    tools = list(base)
+    per_root = max(0, size - len(base)) / len(base)
+    # Roughly sqrt(per_root) groups of sqrt(per_root) leaves under each root.
+    fanout = max(1, math.ceil(math.sqrt(per_root)))
+    for root, group in itertools.product(base, range(fanout)):
+        if len(tools) >= size:
+            break
+        group_id = f"{root.tool_id}/g{group}"
+        tools.append(synthetic_tool(group_id, vocabulary))
+        for leaf in range(fanout - 1):
+            if len(tools) >= size:
+                break
+            tools.append(synthetic_tool(f"{group_id}/i{leaf}", vocabulary))
+    return tools
+
+
+def flat_catalog(size: int, base: list[IntentTool]) -> list[IntentTool]:
+    vocabulary = words()
+    return list(base) + [
+        synthetic_tool(f"custom_{n}", vocabulary) for n in range(max(0, size - len(base)))
+    ]
+
+
+def messages(tools: list[IntentTool], count: int, rng: random.Random) -> list[str]:
+    """Half built-in-style messages, half aimed at a random synthetic intent."""
+    fixed = ["hi", "restart the gateway", "帮我写一个 pipeline", "what is the weather today"]
+    out = []
+    for i in range(count):
+        if i % 2 or len(tools) <= 4:
+            out.append(fixed[i % len(fixed)])
+        else:
+            tool = rng.choice(tools[4:])
+            out.append(f"please {tool.keywords[0]} and {tool.keywords[1]}")
+    return out
+
+
+def per_message_us(recognizer, texts: list[str], repeat: int) -> float:  # type: ignore[no-untyped-def]
+    contexts = [IntentRecognitionContext(message=text) for text in texts]
+    recognizer.classify_sync(contexts[0])  # build the per-catalog tables outside the timing
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for ctx in contexts:
+            recognizer.classify_sync(ctx)
+        best = min(best, time.perf_counter() - start)
+    return best / len(contexts) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256, 1000])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    base = list(catalog.current_catalog().tools)
+    recognizers = {
+        "tfidf": KeywordIntentRecognizer("tfidf"),
+        "count": KeywordIntentRecognizer("count"),
+        "embedding": EmbeddingIntentRecognizer(),
+    }
+    print(
+        f"{'intents':>8} {'depth':>6} {'tfidf (us)':>11} {'count (us)':>11} "
+        f"{'embedding (us)':>15} {'flat embedding (us)':>20}"
+    )
+    try:
+        for size in args.sizes:
+            rng = random.Random(size)
+            tools = hierarchical_catalog(size, base)
+            texts = messages(tools, args.messages, rng)
+            snapshot = swap_catalog(tools)
+            depth = max(tool.tool_id.count("/") for tool in snapshot.tools)
+            timings = {
+                name: per_message_us(recognizer, texts, args.repeat)
+                for name, recognizer in recognizers.items()
+            }
+            swap_catalog(flat_catalog(size, base))
+            flat = per_message_us(recognizers["embedding"], texts, args.repeat)
+            print(
+                f"{len(snapshot):>8} {depth:>6} {timings['tfidf']:>11.1f} "
+                f"{timings['count']:>11.1f} {timings['embedding']:>15.1f} {flat:>20.1f}"
+            )
+    finally:
+        swap_catalog(base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Microbenchmark: Aho-Corasick keyword matching vs. per-keyword substring scans.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_keyword_matcher.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.keyword_recognizer import (
+    KNOWLEDGE_TRIGGERS,
+    KeywordIntentRecognizer,
+)
+from sage_libs.sage_agentic.intent.types import UserIntent
+
+TRACEBACK = (
+    "Traceback (most recent call last):\n"
+    '  File "/srv/app/handler.py", line 42, in handle\n'
+    "    result = compute(value)\n"
+    "ValueError: unexpected token in 输入数据 at column 17\n"
+)
+
+
+def legacy_classify(message: str) -> tuple[UserIntent, float, list[str]]:
+    """The pre-automaton scoring: one substring scan per keyword."""
+    message_lower = message.lower()
+    matched_triggers = [kw for kw in KNOWLEDGE_TRIGGERS if kw in message_lower]
+    if matched_triggers:
+        return UserIntent.KNOWLEDGE_QUERY, 0.9, matched_triggers
+
+    best_intent = UserIntent.GENERAL_CHAT
+    best_score = 0.0
+    matched_keywords: list[str] = []
+    for tool in catalog.INTENT_TOOLS:
+        matches = [kw for kw in tool.keywords if kw.lower() in message_lower]
+        normalized_score = min(len(matches) * 0.5, 1.0) if tool.keywords else 0.0
+        if normalized_score > best_score:
+            best_score = normalized_score
+            best_intent = UserIntent(tool.tool_id)
+            matched_keywords = matches
+    return best_intent, best_score if best_score > 0 else 0.3, matched_keywords
+
+
+def check_equivalence(recognizer: KeywordIntentRecognizer, samples: int = 2000) -> None:
+    rng = random.Random(0)
+    vocab = [kw for tool in catalog.INTENT_TOOLS for kw in tool.keywords]
+    vocab += list(KNOWLEDGE_TRIGGERS) + ["the", "日志", "xyz", " ", "Sage", "ERROR"]
+    for _ in range(samples):
+        message = "".join(rng.choice(vocab) for _ in range(rng.randint(0, 12)))
+        result = asyncio.run(recognizer.classify(IntentRecognitionContext(message)))
+        got = (result.intent, result.confidence, result.matched_keywords)
+        expected = legacy_classify(message)
+        assert got == expected, (message, got, expected)
+
+
+def bench(fn, message: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(message)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    recognizer = KeywordIntentRecognizer(method="count")
+    check_equivalence(recognizer)
+    print("equivalence check passed")
+
+    print(f"{'chars':>8} {'legacy (us)':>12} {'automaton (us)':>15} {'speedup':>8}")
+    for length in (100, 1_000, 10_000, 100_000):
+        message = (TRACEBACK * (length // len(TRACEBACK) + 1))[:length]
+        repeat = max(5, 200_000 // length)
+        legacy = bench(legacy_classify, message, repeat)
+        fast = bench(recognizer._classify_simple, message, repeat)
+        print(f"{length:>8} {legacy:>12.1f} {fast:>15.1f} {legacy / fast:>7.2f}x")
+
+    tfidf = KeywordIntentRecognizer(method="tfidf")
+    print(f"\n{'message':<40} {'tfidf (us)':>10}")
+    for message in ("hi", "restart the gateway", "帮我写一个 pipeline", TRACEBACK):
+        latency = bench(tfidf._classify_message, message, 20_000)
+        print(f"{message.splitlines()[0][:40]:<40} {latency:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
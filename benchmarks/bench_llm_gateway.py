@@ -0,0 +1,116 @@
+"""Load test: LLMIntentRecognizer against a local fake OpenAI-compatible gateway.
+
+Compares the pooled async client with the sync-client-in-executor fallback at
+high concurrency, and single-token logprob scoring with the free-text label.
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_llm_gateway.py --concurrency 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "tests"))
+
+from fake_gateway import FakeGateway  # noqa: E402
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext  # noqa: E402
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer  # noqa: E402
+
+
+async def run(
+    gateway: FakeGateway,
+    use_async_client: bool,
+    requests: int,
+    concurrency: int,
+    micro_batch: bool = False,
+    scoring: str = "text",
+) -> None:
+    recognizer = LLMIntentRecognizer(
+        control_plane_url=gateway.url,
+        max_concurrency=concurrency,
+        use_async_client=use_async_client,
+        micro_batch=micro_batch,
+        scoring=scoring,
+    )
+    contexts = [IntentRecognitionContext(message=f"hello #{i}") for i in range(requests)]
+    gateway.peak_in_flight = 0
+    gateway.connections = 0
+    gateway.requests = 0
+    gateway.prompt_chars = 0
+    gateway.max_tokens = 0
+    gateway.system_prompts.clear()
+
+    start = time.perf_counter()
+    results = await recognizer.classify_batch(contexts)
+    elapsed = time.perf_counter() - start
+    await recognizer.aclose()
+
+    errors = sum(isinstance(r, Exception) for r in results)
+    mode = "async" if use_async_client else "sync+executor"
+    if micro_batch:
+        mode += "+batch"
+    if scoring != "text":
+        mode += f"+{scoring}"
+    confidences = [r.confidence for r in results if not isinstance(r, Exception)]
+    print(
+        f"{mode:>14}: {requests / elapsed:8.1f} req/s  "
+        f"gateway calls={gateway.requests:5d}  "
+        f"prompt chars/msg={gateway.prompt_chars / requests:6.0f}  "
+        f"max tokens/msg={gateway.max_tokens / requests:5.1f}  "
+        f"confidence={statistics.fmean(confidences) if confidences else 0:.2f}  "
+        f"peak in-flight={gateway.peak_in_flight:4d}  "
+        f"connections={gateway.connections:4d}  errors={errors}"
+    )
+    if recognizer.batch_stats is not None:
+        stats = recognizer.batch_stats
+        print(
+            f"{'':>14}  mean batch={stats['mean_batch_size']:.1f}  "
+            f"mean queue delay={stats['mean_queue_delay_ms']:.1f} ms  "
+            f"max queue delay={stats['max_queue_delay_ms']:.1f} ms  "
+            f"retried={stats['retried']}"
+        )
+    if scoring == "logprobs":
+        # The static system turn must be byte-identical so gateways can cache its prefix.
+        assert len(gateway.system_prompts) == 1, gateway.system_prompts
+        expected = gateway.expected_confidence
+        assert all(abs(c - expected) < 1e-6 for c in confidences), confidences[:5]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="gateway latency (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    gateway = FakeGateway(latency=args.latency)
+    await gateway.start()
+    print(
+        f"{args.requests} classifications, concurrency={args.concurrency}, "
+        f"gateway latency={args.latency * 1000:.0f} ms"
+    )
+    try:
+        for use_async_client, micro_batch, scoring in (
+            (True, False, "text"),
+            (True, True, "text"),
+            (True, False, "logprobs"),
+            (False, False, "text"),
+        ):
+            await run(
+                gateway, use_async_client, args.requests, args.concurrency, micro_batch, scoring
+            )
+    finally:
+        await gateway.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
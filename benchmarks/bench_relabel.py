@@ -0,0 +1,64 @@
+"""Throughput of the bulk relabeling command as worker processes are added.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_relabel.py --lines 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+
+from sage_libs.sage_agentic.intent.relabel import relabel
+
+MESSAGES = [
+    "how do I restart the gateway",
+    "write a sage pipeline that reads from kafka",
+    "hello, how are you",
+    "where are the docs for the middleware operators",
+    "怎么安装 SAGE",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "logs.jsonl.gz")
+        with gzip.open(source, "wt", encoding="utf-8") as f:
+            for i in range(args.lines):
+                message = f"{rng.choice(MESSAGES)} #{i}"
+                f.write(json.dumps({"id": i, "message": message}, ensure_ascii=False) + "\n")
+
+        counts = sorted({1, *(2**k for k in range(1, 8) if 2**k <= args.max_workers)})
+        counts = sorted({*counts, args.max_workers})
+        print(f"{args.lines} lines, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'lines/s':>10} {'speedup':>8}")
+        baseline = None
+        reference = None
+        for workers in counts:
+            output = os.path.join(tmp, f"labels-{workers}.jsonl")
+            stats = relabel(source, output, id_field="id", workers=workers, log=None)
+            baseline = baseline or stats.lines_per_second
+            print(
+                f"{workers:>8} {stats.lines_per_second:>10,.0f} "
+                f"{stats.lines_per_second / baseline:>7.2f}x"
+            )
+            with open(output, "rb") as f:
+                labels = f.read()
+            # Sharding must not change the output.
+            reference = reference or labels
+            assert labels == reference
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Primary-path cost of shadow evaluation, and what the shadow reports.
+
+Classifies a fixed message mix with a keyword classifier, without a shadow
+and with shadows of increasing cost: the embedding recognizer, and a
+simulated slow remote recognizer that overruns a small pending queue. Reports
+primary latency, shadow outcomes (including drops under pressure), agreement
+and latency against the primary, and writes the disagreements to a JSONL file.
+Shadow calls run on the background loop's thread, so on a single core their
+CPU time still shows up in the primary's wall-clock latency; a remote shadow
+costs the primary only the sampling and hand-off.
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_shadow.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sage_libs.sage_agentic.intent import IntentClassifier, ShadowEvaluator
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingIntentRecognizer
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.types import IntentResult
+
+MESSAGES = [
+    "帮我写一个读取 kafka 的 pipeline",
+    "how do I install SAGE",
+    "重启 gateway 服务",
+    "你好",
+    "fix this traceback: KeyError in my operator",
+    "RAG 检索增强生成是什么",
+    "check the cluster status",
+    "thanks, that helped",
+    "论文的 related work 怎么写",
+    "scale up the LLM engine",
+]
+
+
+class SlowRecognizer(IntentRecognizer):
+    """Stands in for a remote model: the keyword answer after ``delay`` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.inner = KeywordIntentRecognizer()
+
+    async def classify(self, context: IntentRecognitionContext) -> IntentResult:
+        await asyncio.sleep(self.delay)
+        return self.inner.classify_sync(context)
+
+
+def run(classifier: IntentClassifier, messages: list[str]) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        classifier.classify_sync(message)
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--sample-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    messages = MESSAGES * args.repeat
+    baseline_us = run(IntentClassifier(), messages)
+    print(
+        f"{'shadow':<22} {'primary us':>11} {'sampled':>8} {'agree':>6} {'disagree':>9} "
+        f"{'dropped':>8} {'timeout':>8} {'agreement':>10} {'shadow-primary p50 ms':>22}"
+    )
+    print(f"{'none':<22} {baseline_us:>11.1f}")
+
+    shadows = [
+        ("keyword", KeywordIntentRecognizer(), {}),
+        ("embedding (hashed)", EmbeddingIntentRecognizer(embedding_model="hashed"), {}),
+        ("remote, 50 ms", SlowRecognizer(0.05), {"max_pending": 16, "concurrency": 4}),
+    ]
+    evaluators: dict[str, ShadowEvaluator] = {}
+    for name, recognizer, options in shadows:
+        shadow = ShadowEvaluator(recognizer, sample_rate=args.sample_rate, seed=0, **options)
+        primary_us = run(IntentClassifier(shadow=shadow), messages)
+        shadow.drain(timeout=60)
+        stats = shadow.stats()
+        outcomes = stats["outcomes"]
+        agreement = stats["agreement_rate"]
+        difference = stats["latency_ms"]["shadow_minus_primary"]["p50"]
+        print(
+            f"{name:<22} {primary_us:>11.1f} {stats['sampled']:>8} {outcomes['agree']:>6} "
+            f"{outcomes['disagree']:>9} {outcomes['dropped']:>8} {outcomes['timeout']:>8} "
+            f"{agreement if agreement is not None else float('nan'):>10.3f} "
+            f"{difference if difference is not None else float('nan'):>22.3f}"
+        )
+        evaluators[name] = shadow
+
+    embedding = evaluators["embedding (hashed)"]
+    print("embedding confusion (primary -> shadow):")
+    for primary, row in sorted(embedding.confusion().items()):
+        cells = ", ".join(f"{label}={count}" for label, count in sorted(row.items()))
+        print(f"  {primary:<18} {cells}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "disagreements.jsonl")
+        count = embedding.export_disagreements(path)
+        print(f"exported {count} disagreements, {os.path.getsize(path)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Shared SQLite result cache: lookup overhead and cross-process reuse.
+
+A SQLite hit or put costs about as much as classifying a message with the
+keyword recognizer, so the table compares both, end to end through
+``IntentClassifier`` too: the cache pays off in front of slow recognizers
+(LLM, or a remote one shared across workers), not in front of keyword-only
+chains. Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_sqlite_cache.py --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.sqlite_cache import SQLiteResultCache
+
+MODE = ("llm", ("keyword",))
+QUERIES = [f"how do I restart gateway {i}" for i in range(500)]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def worker(args: tuple[str, int]) -> tuple[int, int]:
+    """Classify every query, paying for a 'slow' recognizer call only on a miss."""
+    path, seed = args
+    cache = SQLiteResultCache(path)
+    recognizer = KeywordIntentRecognizer()
+    computed = 0
+    queries = list(QUERIES)
+    random.Random(seed).shuffle(queries)
+    for query in queries:
+        key = cache.make_key(query, mode=MODE)
+        if cache.get(key) is None:
+            time.sleep(0.002)  # stands in for an LLM round trip
+            result = asyncio.run(recognizer.classify(IntentRecognitionContext(query)))
+            cache.put(key, result)
+            computed += 1
+    return computed, cache.errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "intent-cache.sqlite3")
+        recognizer = KeywordIntentRecognizer()
+        result = recognizer._classify_message("restart the gateway")
+        sqlite_cache = SQLiteResultCache(path)
+        memory_cache = IntentResultCache()
+        key = sqlite_cache.make_key("restart the gateway", mode=MODE)
+        sqlite_cache.put(key, result)
+        memory_key = memory_cache.make_key("restart the gateway", mode=MODE)
+        memory_cache.put(memory_key, result)
+        missing = sqlite_cache.make_key("never seen", mode=MODE)
+        plain = IntentClassifier()
+        cached = IntentClassifier(cache=sqlite_cache)
+        cached.classify_sync("restart the gateway")
+
+        print(f"{'operation':<36} {'us/op':>8}")
+        rows = {
+            "keyword classify": lambda: recognizer._classify_message("restart the gateway"),
+            "memory cache hit": lambda: memory_cache.get(memory_key),
+            "sqlite make_key": lambda: sqlite_cache.make_key("restart the gateway", mode=MODE),
+            "sqlite hit": lambda: sqlite_cache.get(key),
+            "sqlite miss": lambda: sqlite_cache.get(missing),
+            "sqlite put": lambda: sqlite_cache.put(key, result),
+            "classifier, keyword, no cache": lambda: plain.classify_sync("restart the gateway"),
+            "classifier, keyword, sqlite hit": lambda: cached.classify_sync("restart the gateway"),
+        }
+        costs = {name: timed(fn, args.repeat) for name, fn in rows.items()}
+        for name, cost in costs.items():
+            print(f"{name:<36} {cost:>8.1f}")
+        keyword = costs["keyword classify"]
+        print(
+            f"a sqlite hit costs {costs['sqlite hit'] / keyword:.2f}x and a miss plus put "
+            f"{(costs['sqlite miss'] + costs['sqlite put']) / keyword:.2f}x a keyword classify"
+        )
+        sqlite_cache.clear()
+
+        start = time.perf_counter()
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            outcomes = pool.map(worker, [(path, seed) for seed in range(args.workers)])
+        elapsed = time.perf_counter() - start
+        computed = sum(calls for calls, _ in outcomes)
+        errors = sum(errors for _, errors in outcomes)
+        print(
+            f"\n{args.workers} workers x {len(QUERIES)} queries in {elapsed:.2f}s: "
+            f"{computed} recognizer calls (unshared: {args.workers * len(QUERIES)}), "
+            f"{errors} cache errors"
+        )
+        # Each query is computed about once host-wide, not once per worker.
+        assert computed < 2 * len(QUERIES)
+
+
+if __name__ == "__main__":
+    main()
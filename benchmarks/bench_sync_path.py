@@ -0,0 +1,66 @@
+"""Sync callers: ``asyncio.run(classify(...))`` per message versus ``classify_sync``.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_sync_path.py --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sage_libs.sage_agentic.intent.classifier import IntentClassifier
+
+MESSAGES = [
+    "how do I restart the gateway",
+    "write a sage pipeline that reads from kafka",
+    "hello, how are you",
+    "where are the docs for the middleware operators",
+]
+
+
+def per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(MESSAGES[i % len(MESSAGES)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def threaded(fn, repeat: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda i: fn(MESSAGES[i % len(MESSAGES)]), range(repeat)))
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    classifier = IntentClassifier(mode="keyword")
+    recognizer = classifier._recognizer.recognizers[0]
+    rows = {
+        "asyncio.run(classify)": lambda m: asyncio.run(classifier.classify(m)),
+        "classify_sync": classifier.classify_sync,
+        "keyword match alone": recognizer._classify_message,
+    }
+    for fn in rows.values():
+        fn(MESSAGES[0])
+    print(f"{'path':<24} {'us/msg':>8} {f'msg/s ({args.threads} threads)':>22}")
+    for name, fn in rows.items():
+        print(
+            f"{name:<24} {per_call(fn, args.repeat):>8.1f} "
+            f"{threaded(fn, args.repeat, args.threads):>22.0f}"
+        )
+    assert [classifier.classify_sync(m).intent for m in MESSAGES] == [
+        asyncio.run(classifier.classify(m)).intent for m in MESSAGES
+    ]
+
+
+if __name__ == "__main__":
+    main()
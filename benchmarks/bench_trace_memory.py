@@ -0,0 +1,57 @@
+"""Check that ChainedIntentRecognizer memory stays flat across many calls.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_trace_memory.py --calls 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tracemalloc
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
+
+MESSAGES = ("hi", "how to install sage", "restart the gateway", "帮我写一个 pipeline")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--checkpoints", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    chain = build_recognizer_chain(primary_mode="keyword", fallback_modes=["keyword"])
+    contexts = [IntentRecognitionContext(message=m) for m in MESSAGES]
+
+    # Warm up so one-off allocations don't count as growth.
+    for ctx in contexts * chain.trace_size:
+        await chain.classify(ctx)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    step = max(1, args.calls // args.checkpoints)
+    samples = []
+    for done in range(1, args.calls + 1):
+        await chain.classify(contexts[done % len(contexts)])
+        if done % step == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append(current - baseline)
+            print(
+                f"{done:>10} calls: +{(current - baseline) / 1024:8.1f} KiB  "
+                f"recent_traces={len(chain.recent_traces)}"
+            )
+    tracemalloc.stop()
+
+    growth = samples[-1] - samples[0]
+    print(f"growth between first and last checkpoint: {growth / 1024:.1f} KiB")
+    assert len(chain.recent_traces) == chain.trace_size
+    assert growth < 64 * 1024, "chain memory grew with call count"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
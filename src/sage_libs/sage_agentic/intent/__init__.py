@@ -1,22 +1,46 @@
 """Intent recognition primitives (L3: sage-libs)."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from sage_libs.sage_agentic.intent.background import BackgroundLoop, run_sync
 from sage_libs.sage_agentic.intent.base import (
+    BudgetExceededError,
     ChainedIntentRecognizer,
     IntentRecognitionContext,
     IntentRecognizer,
+    RecognizerUnavailableError,
 )
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
 from sage_libs.sage_agentic.intent.catalog import (
     INTENT_TOOLS,
+    CatalogSnapshot,
     IntentTool,
     IntentToolsLoader,
+    catalog_fingerprint,
+    catalog_version,
+    coarse_intent,
+    current_catalog,
     get_all_intent_keywords,
     get_intent_tool,
+    load_catalog,
+    register_intents,
+    swap_catalog,
+    unregister_intents,
 )
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker, CircuitOpenError
 
 # Direct exports (no lazy loading for core components)
 from sage_libs.sage_agentic.intent.classifier import IntentClassifier
+from sage_libs.sage_agentic.intent.domains import DomainRouter, evaluate_routing
 from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
 from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.metrics import IntentMetrics, MetricsRegistry
+from sage_libs.sage_agentic.intent.registry import RecognizerRegistry, default_registry
+from sage_libs.sage_agentic.intent.shadow import ShadowEvaluator
+from sage_libs.sage_agentic.intent.tfidf import TfidfIntentIndex
 from sage_libs.sage_agentic.intent.types import (
     DOMAIN_DISPLAY_NAMES,
     INTENT_DISPLAY_NAMES,
@@ -27,26 +51,74 @@ from sage_libs.sage_agentic.intent.types import (
     get_intent_display_name,
 )
 
-# Conditional import for LLMIntentRecognizer (requires isagellm)
-try:
+if TYPE_CHECKING:
+    from sage_libs.sage_agentic.intent.distilled import DistilledIntentRecognizer
+    from sage_libs.sage_agentic.intent.embedding_recognizer import (
+        EmbeddingIntentRecognizer,
+        HashedNgramEmbedder,
+    )
     from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+    from sage_libs.sage_agentic.intent.sqlite_cache import SQLiteResultCache
+
+# Optional backends load on first attribute access: the LLM recognizer pulls in
+# openai and sage.common, the embedding and distilled recognizers numpy, the shared
+# cache sqlite3.
+_LAZY_ATTRIBUTES = {
+    "LLMIntentRecognizer": "sage_libs.sage_agentic.intent.llm_recognizer",
+    "EmbeddingIntentRecognizer": "sage_libs.sage_agentic.intent.embedding_recognizer",
+    "HashedNgramEmbedder": "sage_libs.sage_agentic.intent.embedding_recognizer",
+    "SQLiteResultCache": "sage_libs.sage_agentic.intent.sqlite_cache",
+    "DistilledIntentRecognizer": "sage_libs.sage_agentic.intent.distilled",
+}
+# LLMIntentRecognizer resolves to None when isagellm is not installed.
+_OPTIONAL_ATTRIBUTES = {"LLMIntentRecognizer"}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        if name not in _OPTIONAL_ATTRIBUTES:
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-    _llm_recognizer_available = True
-except ImportError:
-    LLMIntentRecognizer = None
-    _llm_recognizer_available = False
 
 __all__ = [
     "ChainedIntentRecognizer",
     "IntentRecognitionContext",
     "IntentRecognizer",
+    "RecognizerUnavailableError",
+    "BudgetExceededError",
+    "BackgroundLoop",
+    "run_sync",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "INTENT_TOOLS",
     "IntentTool",
     "IntentToolsLoader",
+    "IntentResultCache",
+    "SQLiteResultCache",
     "IntentClassifier",
+    "IntentMetrics",
+    "MetricsRegistry",
     "build_recognizer_chain",
+    "RecognizerRegistry",
+    "default_registry",
     "KeywordIntentRecognizer",
+    "TfidfIntentIndex",
+    "EmbeddingIntentRecognizer",
+    "HashedNgramEmbedder",
     "LLMIntentRecognizer",
+    "DistilledIntentRecognizer",
     "DOMAIN_DISPLAY_NAMES",
     "INTENT_DISPLAY_NAMES",
     "IntentResult",
@@ -56,4 +128,16 @@ __all__ = [
     "get_intent_display_name",
     "get_intent_tool",
     "get_all_intent_keywords",
+    "catalog_fingerprint",
+    "catalog_version",
+    "CatalogSnapshot",
+    "current_catalog",
+    "swap_catalog",
+    "load_catalog",
+    "register_intents",
+    "unregister_intents",
+    "coarse_intent",
+    "DomainRouter",
+    "evaluate_routing",
+    "ShadowEvaluator",
 ]
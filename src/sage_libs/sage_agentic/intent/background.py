@@ -0,0 +1,88 @@
+"""Persistent background event loop for calling async recognizers from sync code."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from collections.abc import Coroutine
+from typing import TypeVar
+
+R = TypeVar("R")
+
+
+class BackgroundLoop:
+    """An event loop running forever in a daemon thread, started on first use.
+
+    :meth:`run` submits a coroutine from any thread and blocks for its result,
+    so sync callers reuse one loop (and the connection pools bound to it)
+    instead of paying for ``asyncio.run`` per call. A forked child starts its
+    own thread on first use.
+    """
+
+    def __init__(self, name: str = "intent-background-loop") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._start()
+            return self._loop  # type: ignore[return-value]
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+        thread.start()
+        self._loop, self._thread, self._pid = loop, thread, os.getpid()
+
+    def run(self, coro: Coroutine[object, object, R], timeout: float | None = None) -> R:
+        """Run ``coro`` on the background loop and return its result.
+
+        On ``timeout`` the coroutine is cancelled and ``TimeoutError`` raised.
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from its own loop; await instead")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Background call did not finish within {timeout} s") from None
+
+    def close(self) -> None:
+        """Stop the loop and join its thread; the next :meth:`run` starts a new one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._pid = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_default_loop = BackgroundLoop()
+
+
+def background_loop() -> BackgroundLoop:
+    """The process-wide loop used by ``classify_sync``."""
+    return _default_loop
+
+
+def run_sync(coro: Coroutine[object, object, R], timeout: float | None = None) -> R:
+    """Run ``coro`` on the process-wide background loop and wait for the result."""
+    return _default_loop.run(coro, timeout)
+
+
+__all__ = ["BackgroundLoop", "background_loop", "run_sync"]
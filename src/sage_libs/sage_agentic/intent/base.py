@@ -2,57 +2,661 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Sequence
 from dataclasses import dataclass, field
-from typing import Iterable
+from typing import TYPE_CHECKING, TypeVar
 
+from sage_libs.sage_agentic.intent.background import run_sync
 from sage_libs.sage_agentic.intent.types import IntentResult
 
+if TYPE_CHECKING:
+    from sage_libs.sage_agentic.intent.metrics import IntentMetrics
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 @dataclass
 class IntentRecognitionContext:
     message: str
     history: list[dict[str, str]] | None = None
     extra: dict | None = None
+    # Absolute time.monotonic() by which the caller needs an answer.
+    deadline: float | None = None
+
+    @classmethod
+    def with_budget(
+        cls, message: str, budget: float | None, **kwargs: object
+    ) -> IntentRecognitionContext:
+        """Build a context whose deadline is ``budget`` seconds from now."""
+        deadline = time.monotonic() + budget if budget is not None else None
+        return cls(message=message, deadline=deadline, **kwargs)  # type: ignore[arg-type]
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline (negative once past), or None."""
+        return self.deadline - time.monotonic() if self.deadline is not None else None
+
+
+class RecognizerUnavailableError(RuntimeError):
+    """Raised by a recognizer that declines a call without attempting it.
+
+    The chain falls back past it without logging an error; ``reason`` becomes
+    the trace outcome and the fallback reason.
+    """
+
+    reason = "unavailable"
+
+
+class BudgetExceededError(RecognizerUnavailableError):
+    """The context's deadline left no room for a recognizer.
+
+    ``reason`` is ``"deadline"`` (budget already spent), ``"over_budget"``
+    (expected latency exceeds what is left) or ``"timeout"`` (the time-boxed
+    call was cut off).
+    """
+
+    def __init__(self, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.reason = reason
 
 
 class IntentRecognizer(ABC):
+    # Pure-CPU recognizers set this and override classify_sync() to run inline.
+    inline: bool = False
+    # Recognizers whose results never depend on letter case set this; result
+    # cache keys then fold case.
+    case_insensitive: bool = False
+
+    @property
+    def cache_key(self) -> Hashable:
+        """Everything besides the input that decides this recognizer's results.
+
+        Part of result cache keys, so its ``repr`` must be the same in every
+        process. Recognizers with settings that change results add them here.
+        """
+        return type(self).__qualname__
+
     @abstractmethod
     async def classify(
         self, ctx: IntentRecognitionContext
     ) -> IntentResult:  # pragma: no cover - interface
         ...
 
+    def classify_sync(self, ctx: IntentRecognitionContext) -> IntentResult:
+        """Blocking :meth:`classify`, safe to call from any thread.
+
+        Runs ``classify`` on the shared background event loop (see
+        :func:`run_sync`); inline recognizers override this to skip the loop.
+        Must not be called from a coroutine.
+        """
+        return run_sync(self.classify(ctx))
+
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult | Exception]:
+        """Classify many contexts in input order.
+
+        Failures are returned in place of the result instead of being raised, so one
+        bad item does not abort the batch. Subclasses override this to vectorize or
+        to fan out concurrently.
+        """
+        return await gather_bounded(self.classify, contexts, limit=1)
+
+
+CHAIN_STRATEGIES = ("sequential", "race", "hedge")
+# BudgetExceededError reasons, used as trace outcomes.
+BUDGET_OUTCOMES = ("deadline", "over_budget", "timeout")
+
+
+@dataclass
+class TraceStep:
+    """One recognizer invocation inside a chain call."""
+
+    recognizer: str
+    outcome: str
+    elapsed_ms: float
+
+    def __str__(self) -> str:
+        return f"{self.recognizer}:{self.outcome}"
+
+
+@dataclass
+class ChainTrace:
+    """Trace of a single :class:`ChainedIntentRecognizer` call."""
+
+    strategy: str
+    steps: list[TraceStep] = field(default_factory=list)
+    winner: str | None = None
+    elapsed_ms: float = 0.0
+
+    def record(self, recognizer: str, outcome: str, started: float) -> str:
+        step = TraceStep(recognizer, outcome, (time.perf_counter() - started) * 1000)
+        self.steps.append(step)
+        return str(step)
+
+    def entries(self) -> list[str]:
+        return [str(step) for step in self.steps]
+
 
 @dataclass
 class ChainedIntentRecognizer(IntentRecognizer):
+    """Run recognizers in priority order until one clears ``min_confidence``.
+
+    ``strategy`` controls how recognizers are scheduled:
+
+    - ``"sequential"``: one after another (default).
+    - ``"race"``: all start at once.
+    - ``"hedge"``: the next recognizer starts ``hedge_delay`` seconds after the
+      previous one, or immediately if the previous one finished without a usable
+      result.
+
+    With ``race`` and ``hedge`` a result is still only accepted once every
+    higher-priority recognizer has finished without clearing the threshold, so
+    the chosen result matches ``sequential``; remaining calls are cancelled.
+
+    Each call's trace lives on the returned result. The chain itself only keeps
+    the last ``trace_size`` :class:`ChainTrace` objects in ``recent_traces`` for
+    debugging, so memory stays flat in long-running processes.
+
+    When ``metrics`` is set, every recognizer call records latency, errors,
+    fallbacks, confidence and the chosen intent.
+
+    When the context carries a ``deadline``, a recognizer whose latency EWMA
+    exceeds the remaining budget is skipped (``over_budget``), calls are
+    time-boxed to the budget (``timeout``) and nothing starts once it is spent
+    (``deadline``). The best result so far is returned with those trace
+    entries. If nothing has answered yet, the last recognizer still runs.
+
+    A chain of inline recognizers is itself inline: :meth:`classify_sync` walks
+    it in priority order on the calling thread. Inline calls can't be cut off,
+    so only the ``over_budget`` and ``deadline`` checks apply to them.
+    """
+
     recognizers: list[IntentRecognizer]
     min_confidence: float = 0.0
-    trace: list[str] = field(default_factory=list)
+    strategy: str = "sequential"
+    hedge_delay: float = 0.05
+    batch_concurrency: int = 16
+    trace_size: int = 128
+    recent_traces: deque[ChainTrace] = field(init=False, repr=False)
+    metrics: IntentMetrics | None = None
+    budget_probe_interval: int = 20
+    # Smoothing factor of the per-recognizer latency EWMA.
+    latency_alpha: float = 0.2
+    # Keyed by position in ``recognizers``; recognizers may be shared between
+    # chains (see RecognizerRegistry), so this state stays on the chain.
+    _latency: dict[int, float] = field(init=False, repr=False)
+    _budget_skips: dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.strategy not in CHAIN_STRATEGIES:
+            raise ValueError(
+                f"Unknown chain strategy {self.strategy!r}, expected one of {CHAIN_STRATEGIES}"
+            )
+        self.recent_traces = deque(maxlen=self.trace_size)
+        self._latency = {}
+        self._budget_skips = {}
+
+    @property
+    def inline(self) -> bool:  # type: ignore[override]
+        return all(recognizer.inline for recognizer in self.recognizers)
+
+    @property
+    def case_insensitive(self) -> bool:  # type: ignore[override]
+        return all(recognizer.case_insensitive for recognizer in self.recognizers)
+
+    @property
+    def cache_key(self) -> Hashable:
+        recognizers = tuple(recognizer.cache_key for recognizer in self.recognizers)
+        return recognizers, self.min_confidence, self.strategy
+
+    @property
+    def trace(self) -> list[str]:
+        """Flattened entries of the recent call traces, oldest first."""
+        return [entry for call in self.recent_traces for entry in call.entries()]
+
+    def _step(
+        self,
+        call: ChainTrace,
+        name: str,
+        started: float,
+        result: IntentResult | None = None,
+        reason: str | None = None,
+        outcome: str | None = None,
+    ) -> str:
+        """Record one recognizer outcome; ``result=None`` means it raised.
+
+        ``reason`` marks the chain moving past this recognizer. ``outcome``
+        labels a call the recognizer declined (see
+        :class:`RecognizerUnavailableError`); those record no latency or error.
+        """
+        if outcome is None:
+            outcome = "error" if result is None else f"{result.confidence:.2f}"
+        entry = call.record(name, outcome, started)
+        if self.metrics is not None:
+            seconds = call.steps[-1].elapsed_ms / 1000
+            if result is not None:
+                self.metrics.observe_result(name, seconds, result)
+            elif outcome == "error":
+                self.metrics.observe_error(name, seconds)
+            if reason is not None:
+                self.metrics.observe_fallback(name, reason)
+        return entry
+
+    def _step_failed(self, call: ChainTrace, name: str, started: float, exc: BaseException) -> str:
+        """Record a recognizer that raised or declined the call."""
+        if isinstance(exc, RecognizerUnavailableError):
+            logger.debug("Intent recognizer %s skipped: %s", name, exc)
+            return self._step(call, name, started, reason=exc.reason, outcome=exc.reason)
+        logger.warning("Intent recognizer %s failed: %s", name, exc)
+        return self._step(call, name, started, reason="error")
+
+    def expected_latency(self, position: int) -> float | None:
+        """Latency EWMA in seconds of ``recognizers[position]``, None before any call."""
+        return self._latency.get(position)
+
+    def _observe_latency(self, position: int, seconds: float) -> None:
+        ewma = self._latency.get(position)
+        self._latency[position] = (
+            seconds if ewma is None else ewma + self.latency_alpha * (seconds - ewma)
+        )
+
+    def _time_box(self, position: int, ctx: IntentRecognitionContext) -> float | None:
+        """Seconds ``recognizers[position]`` may run for ``ctx``; raises if it should be skipped."""
+        remaining = ctx.remaining()
+        if remaining is None:
+            return None
+        if remaining <= 0:
+            raise BudgetExceededError("deadline", "Deadline passed")
+        expected = self._latency.get(position)
+        if expected is not None and expected > remaining:
+            # Every budget_probe_interval-th skip runs anyway (time-boxed), so the
+            # estimate can recover once the recognizer is fast again.
+            skips = (self._budget_skips.get(position, 0) + 1) % self.budget_probe_interval
+            self._budget_skips[position] = skips
+            if skips:
+                raise BudgetExceededError(
+                    "over_budget",
+                    f"Expected {expected * 1000:.1f} ms, {remaining * 1000:.1f} ms left",
+                )
+        return remaining
+
+    async def _call(
+        self, position: int, ctx: IntentRecognitionContext, timeout: float | None = None
+    ) -> IntentResult:
+        """Run one recognizer, optionally time-boxed, feeding its latency EWMA."""
+        recognizer = self.recognizers[position]
+        started = time.perf_counter()
+        try:
+            if timeout is None:
+                result = await recognizer.classify(ctx)
+            else:
+                result = await asyncio.wait_for(recognizer.classify(ctx), timeout)
+        except RecognizerUnavailableError:
+            raise
+        except asyncio.TimeoutError as exc:
+            self._observe_latency(position, time.perf_counter() - started)
+            if timeout is None:
+                raise
+            raise BudgetExceededError(
+                "timeout", f"Cut off after {timeout * 1000:.1f} ms budget"
+            ) from exc
+        except Exception:
+            self._observe_latency(position, time.perf_counter() - started)
+            raise
+        self._observe_latency(position, time.perf_counter() - started)
+        return result
+
+    def _call_sync(self, position: int, ctx: IntentRecognitionContext) -> IntentResult:
+        started = time.perf_counter()
+        try:
+            return self.recognizers[position].classify_sync(ctx)
+        finally:
+            self._observe_latency(position, time.perf_counter() - started)
+
+    @staticmethod
+    async def _call_batch(
+        recognizer: IntentRecognizer,
+        contexts: Sequence[IntentRecognitionContext],
+        timeout: float | None = None,
+    ) -> list[IntentResult | Exception]:
+        if not contexts:
+            return []
+        try:
+            if timeout is None:
+                return await recognizer.classify_batch(contexts)
+            return await asyncio.wait_for(recognizer.classify_batch(contexts), timeout)
+        except Exception as exc:  # noqa: BLE001
+            if timeout is not None and isinstance(exc, asyncio.TimeoutError):
+                exc = BudgetExceededError(
+                    "timeout", f"Cut off after {timeout * 1000:.1f} ms budget"
+                )
+            return [exc] * len(contexts)
+
+    def _fallback_reason(self, result: IntentResult | None) -> str | None:
+        if result is None:
+            return "error"
+        return None if result.confidence >= self.min_confidence else "low_confidence"
+
+    def _remember(
+        self,
+        call: ChainTrace,
+        started: float,
+        source: str | None = None,
+        result: IntentResult | None = None,
+        accepted: bool = False,
+    ) -> None:
+        call.winner = source if accepted else None
+        call.elapsed_ms = (time.perf_counter() - started) * 1000
+        self.recent_traces.append(call)
+        if self.metrics is not None and result is not None and source is not None:
+            self.metrics.observe_chosen(source, result)
 
     async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        if self.strategy != "sequential":
+            return await self._classify_concurrent(ctx)
+        started = time.perf_counter()
+        call = ChainTrace(self.strategy)
         last_result: IntentResult | None = None
-        for recognizer in self.recognizers:
+        last_name: str | None = None
+        for position, recognizer in enumerate(self.recognizers):
             name = recognizer.__class__.__name__
+            step_started = time.perf_counter()
+            # With nothing in hand, the last recognizer runs regardless of budget.
+            last_resort = last_result is None and position == len(self.recognizers) - 1
             try:
-                result = await recognizer.classify(ctx)
-                result.trace.append(f"{name}:{result.confidence:.2f}")
-                self.trace.append(f"{name}:{result.confidence:.2f}")
-                last_result = result
-                if result.confidence >= self.min_confidence:
-                    return result
+                timeout = None if last_resort else self._time_box(position, ctx)
+                result = await self._call(position, ctx, timeout)
             except Exception as exc:  # noqa: BLE001
-                logger.warning("Intent recognizer %s failed: %s", name, exc)
-                self.trace.append(f"{name}:error")
+                self._step_failed(call, name, step_started, exc)
                 continue
+            reason = self._fallback_reason(result)
+            self._step(call, name, step_started, result, reason)
+            last_result, last_name = result, name
+            if reason is None:
+                return self._accept(call, started, name, result)
+        return self._settle(call, started, last_name, last_result)
+
+    def classify_sync(self, ctx: IntentRecognitionContext) -> IntentResult:
+        if not self.inline:
+            return run_sync(self.classify(ctx))
+        started = time.perf_counter()
+        call = ChainTrace(self.strategy)
+        last_result: IntentResult | None = None
+        last_name: str | None = None
+        for position, recognizer in enumerate(self.recognizers):
+            name = recognizer.__class__.__name__
+            step_started = time.perf_counter()
+            last_resort = last_result is None and position == len(self.recognizers) - 1
+            try:
+                if not last_resort:
+                    self._time_box(position, ctx)
+                result = self._call_sync(position, ctx)
+            except Exception as exc:  # noqa: BLE001
+                self._step_failed(call, name, step_started, exc)
+                continue
+            reason = self._fallback_reason(result)
+            self._step(call, name, step_started, result, reason)
+            last_result, last_name = result, name
+            if reason is None:
+                return self._accept(call, started, name, result)
+        return self._settle(call, started, last_name, last_result)
+
+    def _accept(
+        self, call: ChainTrace, started: float, name: str, result: IntentResult
+    ) -> IntentResult:
+        result.trace.extend(call.entries())
+        self._remember(call, started, name, result, accepted=True)
+        return result
+
+    def _settle(
+        self,
+        call: ChainTrace,
+        started: float,
+        last_name: str | None,
+        last_result: IntentResult | None,
+    ) -> IntentResult:
+        """End a sequential pass where no result cleared ``min_confidence``."""
         if last_result is not None:
-            last_result.trace.extend(self.trace)
+            last_result.trace.extend(call.entries())
+            self._remember(call, started, last_name, last_result)
             return last_result
+        self._remember(call, started)
+        raise RuntimeError("No intent recognizer available")
+
+    async def _classify_concurrent(self, ctx: IntentRecognitionContext) -> IntentResult:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        call = ChainTrace(self.strategy)
+        count = len(self.recognizers)
+        names = [recognizer.__class__.__name__ for recognizer in self.recognizers]
+        tasks: list[asyncio.Future | None] = [None] * count
+        outcomes: list[IntentResult | Exception | None] = [None] * count
+        launched_at = [started] * count
+        last_launch = loop.time()
+
+        def have_result() -> bool:
+            return any(isinstance(outcome, IntentResult) for outcome in outcomes)
+
+        def launch(index: int) -> None:
+            nonlocal last_launch
+            launched_at[index] = time.perf_counter()
+            last_launch = loop.time()
+            if index < count - 1 or have_result():
+                try:
+                    self._time_box(index, ctx)
+                except BudgetExceededError as exc:
+                    self._step_failed(call, names[index], launched_at[index], exc)
+                    outcomes[index] = exc
+                    return
+            tasks[index] = asyncio.ensure_future(self._call(index, ctx))
+
+        expired = False
+        launched = 0
+        for _ in range(count if self.strategy == "race" else min(count, 1)):
+            launch(launched)
+            launched += 1
+
+        try:
+            while True:
+                # Accept results strictly in priority order.
+                for index in range(count):
+                    outcome = outcomes[index]
+                    if outcome is None:
+                        break
+                    if (
+                        isinstance(outcome, IntentResult)
+                        and outcome.confidence >= self.min_confidence
+                    ):
+                        elapsed_ms = (time.perf_counter() - started) * 1000
+                        # Every step so far, including the higher-priority results
+                        # that came back below the threshold or failed.
+                        outcome.trace.extend(call.entries())
+                        outcome.trace.append(f"{self.strategy}:{names[index]}@{elapsed_ms:.1f}ms")
+                        self._remember(call, started, names[index], outcome, accepted=True)
+                        return outcome
+                else:
+                    break
+
+                # Out of time: settle for the best result so far.
+                remaining = ctx.remaining()
+                if remaining is not None and remaining <= 0 and have_result():
+                    expired = True
+                    break
+
+                pending = {task for task in tasks if task is not None and not task.done()}
+                timeout = None
+                if launched < count:
+                    timeout = max(0.0, last_launch + self.hedge_delay - loop.time())
+                    if not pending:
+                        timeout = 0.0
+                if remaining is not None and remaining > 0:
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                if pending:
+                    await asyncio.wait(
+                        pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                for index, task in enumerate(tasks):
+                    if task is None or not task.done() or outcomes[index] is not None:
+                        continue
+                    exc = task.exception()
+                    if exc is not None:
+                        self._step_failed(call, names[index], launched_at[index], exc)
+                        outcomes[index] = exc if isinstance(exc, Exception) else RuntimeError(exc)
+                        continue
+                    result = task.result()
+                    self._step(
+                        call,
+                        names[index],
+                        launched_at[index],
+                        result,
+                        self._fallback_reason(result),
+                    )
+                    outcomes[index] = result
+
+                if launched < count:
+                    in_flight = any(task is not None and not task.done() for task in tasks)
+                    if not in_flight or loop.time() >= last_launch + self.hedge_delay:
+                        launch(launched)
+                        launched += 1
+        finally:
+            for index, task in enumerate(tasks):
+                if task is not None and not task.done():
+                    task.cancel()
+                    outcome = "deadline" if expired else "cancelled"
+                    call.record(names[index], outcome, launched_at[index])
+                    if expired:
+                        # A lower bound, but enough to stop launching it into the same budget.
+                        self._observe_latency(index, time.perf_counter() - launched_at[index])
+
+        # Nobody cleared the threshold: fall back to the lowest-priority result,
+        # exactly like the sequential strategy.
+        for index in reversed(range(count)):
+            outcome = outcomes[index]
+            if isinstance(outcome, IntentResult):
+                outcome.trace.extend(call.entries())
+                self._remember(call, started, names[index], outcome)
+                return outcome
+        self._remember(call, started)
         raise RuntimeError("No intent recognizer available")
 
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult]:
+        """Batch counterpart of :meth:`classify`.
+
+        Each recognizer sees only the items that earlier recognizers failed on or
+        scored below ``min_confidence``, so per-item results match ``classify``.
+        Step timings in the per-item traces are the wall time of the batch call.
+        Items whose deadline leaves no room for a recognizer skip it, and the
+        batch call is time-boxed to the largest remaining budget among the rest.
+        """
+        if self.strategy != "sequential":
+            outcomes = await gather_bounded(self.classify, contexts, limit=self.batch_concurrency)
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    raise outcome
+            return outcomes  # type: ignore[return-value]
+
+        started = time.perf_counter()
+        calls = [ChainTrace(self.strategy) for _ in contexts]
+        results: list[IntentResult | None] = [None] * len(contexts)
+        last_results: list[IntentResult | None] = [None] * len(contexts)
+        last_names: list[str | None] = [None] * len(contexts)
+        pending = list(range(len(contexts)))
+        for position, recognizer in enumerate(self.recognizers):
+            if not pending:
+                break
+            name = recognizer.__class__.__name__
+            step_started = time.perf_counter()
+            is_last = position == len(self.recognizers) - 1
+            outcomes_by_index: dict[int, IntentResult | Exception] = {}
+            unbounded: list[int] = []
+            bounded: list[int] = []
+            budgets: list[float] = []
+            for index in pending:
+                try:
+                    box = (
+                        None
+                        if is_last and last_results[index] is None
+                        else self._time_box(position, contexts[index])
+                    )
+                except BudgetExceededError as exc:
+                    outcomes_by_index[index] = exc
+                    continue
+                if box is None:
+                    unbounded.append(index)
+                else:
+                    bounded.append(index)
+                    budgets.append(box)
+            # Items with a deadline are time-boxed together, apart from the rest.
+            unbounded_outcomes, bounded_outcomes = await asyncio.gather(
+                self._call_batch(recognizer, [contexts[i] for i in unbounded]),
+                self._call_batch(
+                    recognizer, [contexts[i] for i in bounded], max(budgets, default=None)
+                ),
+            )
+            outcomes_by_index.update(zip(unbounded, unbounded_outcomes))
+            outcomes_by_index.update(zip(bounded, bounded_outcomes))
+            remaining: list[int] = []
+            for index in pending:
+                outcome = outcomes_by_index[index]
+                if isinstance(outcome, Exception):
+                    self._step_failed(calls[index], name, step_started, outcome)
+                    remaining.append(index)
+                    continue
+                reason = self._fallback_reason(outcome)
+                self._step(calls[index], name, step_started, outcome, reason)
+                last_results[index] = outcome
+                last_names[index] = name
+                if reason is None:
+                    outcome.trace.extend(calls[index].entries())
+                    self._remember(calls[index], started, name, outcome, accepted=True)
+                    results[index] = outcome
+                else:
+                    remaining.append(index)
+            pending = remaining
+
+        for index in pending:
+            last_result = last_results[index]
+            if last_result is None:
+                raise RuntimeError("No intent recognizer available")
+            last_result.trace.extend(calls[index].entries())
+            self._remember(calls[index], started, last_names[index], last_result)
+            results[index] = last_result
+        return results  # type: ignore[return-value]
+
+
+async def gather_bounded(
+    fn: Callable[[T], Awaitable[R]], items: Sequence[T], limit: int
+) -> list[R | Exception]:
+    """Await ``fn(item)`` for every item with at most ``limit`` calls in flight.
+
+    Results are returned in input order; an item whose call raised gets the
+    exception in its slot.
+    """
+    results: list[R | Exception] = [None] * len(items)  # type: ignore[list-item]
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        for index, item in pending:
+            try:
+                results[index] = await fn(item)
+            except Exception as exc:  # noqa: BLE001
+                results[index] = exc
+
+    workers = min(max(limit, 1), len(items))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
+
 
 def ensure_list(value: Iterable[IntentRecognizer] | IntentRecognizer) -> list[IntentRecognizer]:
     if isinstance(value, IntentRecognizer):
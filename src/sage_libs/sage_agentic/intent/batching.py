@@ -0,0 +1,120 @@
+"""Micro-batching of concurrent requests into a single handler call."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatchStats:
+    """Running totals for batches dispatched by a :class:`MicroBatcher`."""
+
+    def __init__(self) -> None:
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.total_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self.retried = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    @property
+    def mean_queue_delay(self) -> float:
+        return self.total_queue_delay / self.items if self.items else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.mean_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "mean_queue_delay_ms": self.mean_queue_delay * 1000,
+            "max_queue_delay_ms": self.max_queue_delay * 1000,
+            "retried": self.retried,
+        }
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect concurrent submissions and hand them to ``handler`` together.
+
+    A batch is dispatched when ``max_batch_size`` items are queued or ``window``
+    seconds after the first item arrived, whichever comes first. ``handler``
+    returns one result (or exception) per item, in order; each submitter's
+    future is resolved independently, and a cancelled submitter does not
+    affect the rest of its batch. Pass ``stats`` to share totals between batchers.
+
+    A batcher binds to the event loop of its first submission; use one per loop.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Sequence[T]], Awaitable[Sequence[R | Exception]]],
+        max_batch_size: int = 16,
+        window: float = 0.01,
+        stats: MicroBatchStats | None = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self._handler = handler
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.stats = stats if stats is not None else MicroBatchStats()
+        self._pending: list[tuple[T, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((item, future, loop.time()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[T, asyncio.Future, float]]) -> None:
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+        now = asyncio.get_running_loop().time()
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(batch))
+        for _, _, enqueued in batch:
+            delay = now - enqueued
+            self.stats.total_queue_delay += delay
+            self.stats.max_queue_delay = max(self.stats.max_queue_delay, delay)
+
+        try:
+            results = await self._handler([item for item, _, _ in batch])
+        except Exception as exc:  # noqa: BLE001
+            results = [exc] * len(batch)
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+__all__ = ["MicroBatchStats", "MicroBatcher"]
@@ -0,0 +1,160 @@
+"""In-process LRU/TTL cache for intent results."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import replace
+from typing import Protocol
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.types import IntentResult
+
+
+def normalize_message(message: str, fold_case: bool = False) -> str:
+    """Normalize a message for cache keys.
+
+    Leading and trailing whitespace is dropped. Case is folded only with
+    ``fold_case``, for recognizers that lowercase the message themselves; an
+    LLM or embedding model can answer ``"STOP"`` differently from ``"stop"``.
+    """
+    message = message.strip()
+    return message.lower() if fold_case else message
+
+
+def copy_result(result: IntentResult) -> IntentResult:
+    """Copy an IntentResult so list mutations on the copy don't leak back."""
+    return replace(
+        result,
+        knowledge_domains=(
+            list(result.knowledge_domains) if result.knowledge_domains is not None else None
+        ),
+        matched_keywords=list(result.matched_keywords),
+        trace=list(result.trace),
+        scores=dict(result.scores) if result.scores is not None else None,
+        domain_scores=dict(result.domain_scores) if result.domain_scores is not None else None,
+    )
+
+
+class ResultCache(Protocol):
+    """What ``IntentClassifier`` needs from a result cache.
+
+    ``mode`` in :meth:`make_key` is the classifier's configuration (each
+    recognizer's ``cache_key``, threshold, strategy, routing) plus the call's
+    ``context``; two classifiers get the same key only if they'd return the
+    same result.
+    """
+
+    def make_key(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None = None,
+        mode: Hashable = None,
+    ) -> Hashable: ...
+
+    def get(self, key: Hashable) -> IntentResult | None: ...
+
+    def put(self, key: Hashable, result: IntentResult) -> None: ...
+
+
+class IntentResultCache:
+    """Bounded LRU cache with a per-entry TTL.
+
+    The whole cache is dropped when ``catalog.catalog_version()`` changes, so
+    results computed against an older catalog are never served. Reads and
+    writes copy results, so callers may freely mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float | None = 300.0,
+        history_turns: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Built-in recognizers ignore history; raise this for history-aware chains.
+        self.history_turns = history_turns
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, IntentResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._catalog_version = catalog.catalog_version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def make_key(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None = None,
+        mode: Hashable = None,
+    ) -> Hashable:
+        turns: tuple = ()
+        if self.history_turns and history:
+            turns = tuple(
+                (turn.get("role", ""), turn.get("content", ""))
+                for turn in history[-self.history_turns :]
+            )
+        return (catalog.catalog_version(), mode, normalize_message(message), turns)
+
+    def _check_catalog(self) -> None:
+        version = catalog.catalog_version()
+        if version != self._catalog_version:
+            self._entries.clear()
+            self._catalog_version = version
+            self.invalidations += 1
+
+    def get(self, key: Hashable) -> IntentResult | None:
+        with self._lock:
+            self._check_catalog()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at < self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_result(result)
+
+    def put(self, key: Hashable, result: IntentResult) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        stored = copy_result(result)
+        with self._lock:
+            self._check_catalog()
+            self._entries[key] = (expires_at, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def __len__(self) -> int:  # pragma: no cover - trivial
+        return len(self._entries)
+
+
+__all__ = ["IntentResultCache", "ResultCache", "copy_result", "normalize_message"]
@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from types import MappingProxyType
+from typing import Any, TypeVar
 
 from sage_libs.sage_agentic.intent.types import KnowledgeDomain, UserIntent
 
+D = TypeVar("D")
+
 
 @dataclass
 class IntentTool:
@@ -18,6 +28,58 @@ class IntentTool:
     category: str = "intent"
 
 
+class _VersionedToolList(list):
+    """List of intent tools that bumps the catalog version on every mutation."""
+
+
+def _bumps_version(method):  # type: ignore[no-untyped-def]
+    def wrapper(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            bump_catalog_version()
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_VersionedToolList, _name, _bumps_version(getattr(list, _name)))
+del _name
+
+
+_catalog_version = 0
+
+
+def bump_catalog_version() -> int:
+    """Mark the catalog as changed.
+
+    Mutating ``INTENT_TOOLS`` bumps the version automatically; call this after
+    editing an ``IntentTool`` in place.
+    """
+    global _catalog_version
+    _catalog_version += 1
+    return _catalog_version
+
+
+def catalog_version() -> int:
+    """Return a counter that changes whenever the intent catalog changes."""
+    return _catalog_version
+
+
 INTENT_TOOLS: list[IntentTool] = [
     IntentTool(
         tool_id=UserIntent.KNOWLEDGE_QUERY.value,
@@ -336,13 +398,234 @@ INTENT_TOOLS: list[IntentTool] = [
         ],
     ),
 ]
+# Track mutations so caches can tell when the catalog changed.
+INTENT_TOOLS = _VersionedToolList(INTENT_TOOLS)
+
+
+class CatalogSnapshot:
+    """Immutable, indexed view of one version of the intent catalog.
+
+    Tools are copied on construction, so later edits to ``INTENT_TOOLS`` never
+    show through. Lookups by intent, tool id and lowercased keyword are dict
+    lookups, and knowledge domains are parsed into enums once. Recognizers
+    read one snapshot per call, so a concurrent :func:`swap_catalog` can't
+    hand them a half-updated catalog. Tables derived from the catalog (keyword
+    automaton, TF-IDF index) hang off the snapshot through :meth:`derived` and
+    are therefore built exactly once per version.
+    """
+
+    def __init__(self, tools: Iterable[IntentTool], version: int = 0) -> None:
+        self.tools: tuple[IntentTool, ...] = tuple(copy.deepcopy(list(tools)))
+        self.version = version
+        by_id: dict[str, IntentTool] = {}
+        positions: dict[str, int] = {}
+        domains: dict[str, tuple[KnowledgeDomain, ...]] = {}
+        keywords: dict[str, list[str]] = {}
+        for position, tool in enumerate(self.tools):
+            # The first tool wins on duplicate ids, as with the old linear scan.
+            if tool.tool_id not in by_id:
+                by_id[tool.tool_id] = tool
+                positions[tool.tool_id] = position
+            # Raises ValueError on an unknown domain, at load time rather than per result.
+            domains[tool.tool_id] = tuple(KnowledgeDomain(d) for d in tool.knowledge_domains)
+            for keyword in tool.keywords:
+                ids = keywords.setdefault(keyword.lower(), [])
+                if tool.tool_id not in ids:
+                    ids.append(tool.tool_id)
+        # Hierarchy from "/"-separated ids: "a/b/c" hangs under the longest
+        # prefix that is itself in the catalog ("a/b", else "a"), or is a root.
+        parents: list[int | None] = []
+        children: list[list[int]] = [[] for _ in self.tools]
+        for position, tool in enumerate(self.tools):
+            parent = None
+            prefix = tool.tool_id
+            while "/" in prefix and parent is None:
+                prefix = prefix.rsplit("/", 1)[0]
+                parent = positions.get(prefix)
+            parents.append(parent)
+            if parent is not None:
+                children[parent].append(position)
+        self.parents: tuple[int | None, ...] = tuple(parents)
+        self.children: tuple[tuple[int, ...], ...] = tuple(tuple(c) for c in children)
+        self.roots: tuple[int, ...] = tuple(p for p, parent in enumerate(parents) if parent is None)
+        self.hierarchical = len(self.roots) < len(self.tools)
+        self.coarse: tuple[UserIntent, ...] = tuple(
+            coarse_intent(tool.tool_id) for tool in self.tools
+        )
+        # A sub-intent without domains of its own searches its nearest ancestor's.
+        for tool_id, position in positions.items():
+            ancestor = position
+            while not domains[tool_id] and parents[ancestor] is not None:
+                ancestor = parents[ancestor]  # type: ignore[assignment]
+                domains[tool_id] = domains[self.tools[ancestor].tool_id]
+        self._by_id = MappingProxyType(by_id)
+        self._positions = MappingProxyType(positions)
+        self._domains = MappingProxyType(domains)
+        self._keywords = MappingProxyType({k: tuple(v) for k, v in keywords.items()})
+        self.lowercase_keywords: tuple[tuple[str, ...], ...] = tuple(
+            tuple(keyword.lower() for keyword in tool.keywords) for tool in self.tools
+        )
+        payload = json.dumps([asdict(tool) for tool in self.tools], sort_keys=True)
+        self.fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        self._derived: dict[Hashable, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any] | list, version: int = 0) -> CatalogSnapshot:
+        """Build from ``{"tools": [...]}`` or a bare list of ``IntentTool`` fields."""
+        entries = data["tools"] if isinstance(data, Mapping) else data
+        return cls((IntentTool(**entry) for entry in entries), version)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> CatalogSnapshot:
+        """Read a catalog from a ``.json`` or ``.yaml``/``.yml`` file (YAML needs PyYAML)."""
+        path = os.fspath(path)
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError as exc:
+                    raise ImportError("Loading a YAML intent catalog requires PyYAML") from exc
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        return cls.from_dict(data)
+
+    def tool(self, intent: UserIntent | str) -> IntentTool | None:
+        return self._by_id.get(intent.value if isinstance(intent, UserIntent) else intent)
+
+    def position(self, intent: UserIntent | str) -> int | None:
+        """Index of the intent's tool in :attr:`tools`."""
+        return self._positions.get(intent.value if isinstance(intent, UserIntent) else intent)
+
+    def knowledge_domains(self, intent: UserIntent | str) -> tuple[KnowledgeDomain, ...]:
+        return self._domains.get(intent.value if isinstance(intent, UserIntent) else intent, ())
+
+    def parent_id(self, intent_id: str) -> str | None:
+        """Id of the intent's parent in the hierarchy, or ``None`` for a root."""
+        position = self._positions.get(intent_id)
+        parent = self.parents[position] if position is not None else None
+        return self.tools[parent].tool_id if parent is not None else None
+
+    def children_ids(self, intent_id: str | None = None) -> tuple[str, ...]:
+        """Ids of the intent's direct sub-intents; the roots for ``None``."""
+        if intent_id is None:
+            return tuple(self.tools[p].tool_id for p in self.roots)
+        position = self._positions.get(intent_id)
+        if position is None:
+            return ()
+        return tuple(self.tools[p].tool_id for p in self.children[position])
+
+    def tool_ids_for_keyword(self, keyword: str) -> tuple[str, ...]:
+        """Tool ids listing ``keyword`` (case-insensitive), in catalog order."""
+        return self._keywords.get(keyword.lower(), ())
+
+    def derived(self, key: Hashable, build: Callable[[CatalogSnapshot], D]) -> D:
+        """Return ``build(self)``, computed once per snapshot and ``key``."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = build(self)
+            return self._derived[key]
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    def __repr__(self) -> str:
+        return (
+            f"CatalogSnapshot(version={self.version}, fingerprint={self.fingerprint!r}, "
+            f"tools={[tool.tool_id for tool in self.tools]})"
+        )
+
+
+def coarse_intent(intent_id: str) -> UserIntent:
+    """Top-level :class:`UserIntent` of a catalog id: its first ``/`` segment.
+
+    Ids whose first segment is not a ``UserIntent`` value map to ``GENERAL_CHAT``.
+    """
+    root = intent_id.split("/", 1)[0]
+    return UserIntent._value2member_map_.get(root, UserIntent.GENERAL_CHAT)  # type: ignore[return-value]
+
+
+_snapshot: CatalogSnapshot | None = None
+# Reentrant so register_intents() can read-modify-swap under the same lock.
+_snapshot_lock = threading.RLock()
+
+
+def current_catalog() -> CatalogSnapshot:
+    """Snapshot of the current catalog, rebuilt once after ``INTENT_TOOLS`` changes."""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == _catalog_version:
+        return snapshot
+    return _refresh_snapshot()
+
+
+def _refresh_snapshot() -> CatalogSnapshot:
+    global _snapshot
+    with _snapshot_lock:
+        version = _catalog_version
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = CatalogSnapshot(INTENT_TOOLS, version)
+        return _snapshot
+
+
+def swap_catalog(catalog: CatalogSnapshot | Iterable[IntentTool]) -> CatalogSnapshot:
+    """Atomically make ``catalog`` the current catalog and return its installed snapshot.
+
+    ``INTENT_TOOLS`` is updated to match, and the catalog version moves on, so
+    version-keyed caches drop their entries. Classifications already running
+    finish on the snapshot they started with.
+    """
+    global _snapshot
+    source = catalog.tools if isinstance(catalog, CatalogSnapshot) else list(catalog)
+    with _snapshot_lock:
+        INTENT_TOOLS[:] = copy.deepcopy(list(source))  # bumps the version once
+        _snapshot = CatalogSnapshot(source, _catalog_version)
+        return _snapshot
+
+
+def register_intents(*tools: IntentTool) -> CatalogSnapshot:
+    """Add intents to the current catalog, replacing any with the same id.
+
+    Sub-intents use ``/``-separated ids under an existing intent, e.g.
+    ``IntentTool("system_operation/restart_gateway", ...)``; results carry the
+    id as ``label`` and its top-level intent as ``intent``. See :func:`swap_catalog`.
+    """
+    replacements = {tool.tool_id: tool for tool in tools}
+    with _snapshot_lock:
+        merged = [replacements.pop(tool.tool_id, tool) for tool in current_catalog().tools]
+        merged.extend(replacements.values())
+        return swap_catalog(merged)
+
+
+def unregister_intents(*intent_ids: str) -> CatalogSnapshot:
+    """Remove intents (not their sub-intents) from the current catalog."""
+    removed = set(intent_ids)
+    with _snapshot_lock:
+        return swap_catalog(
+            [tool for tool in current_catalog().tools if tool.tool_id not in removed]
+        )
+
+
+def load_catalog(path: str | os.PathLike[str]) -> CatalogSnapshot:
+    """Load a JSON/YAML catalog file and swap it in; see :func:`swap_catalog`."""
+    return swap_catalog(CatalogSnapshot.load(path))
+
+
+def catalog_fingerprint() -> str:
+    """Digest of the catalog contents, stable across processes and restarts.
+
+    ``catalog_version()`` is a per-process counter; use this to version data
+    shared between processes. Computed once per catalog version.
+    """
+    return current_catalog().fingerprint
 
 
 def get_intent_tool(intent: UserIntent) -> IntentTool | None:
-    for tool in INTENT_TOOLS:
-        if tool.tool_id == intent.value:
-            return tool
-    return None
+    return current_catalog().tool(intent)
 
 
 def get_all_intent_keywords() -> dict[str, list[str]]:
@@ -0,0 +1,211 @@
+"""Circuit breaker for recognizers that call remote services."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sage_libs.sage_agentic.intent.base import RecognizerUnavailableError
+
+R = TypeVar("R")
+
+CIRCUIT_STATES = ("closed", "open", "half_open")
+
+
+class CircuitOpenError(RecognizerUnavailableError):
+    """Raised instead of calling a service whose circuit is open."""
+
+    reason = "circuit_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding window of recent calls.
+
+    While closed, the last ``window_size`` outcomes are kept; once at least
+    ``min_calls`` are recorded and the share of failures reaches
+    ``failure_rate`` or the share of calls slower than ``slow_call_seconds``
+    reaches ``slow_call_rate``, the circuit opens. An open circuit rejects
+    calls with :class:`CircuitOpenError` without waiting. After
+    ``open_seconds`` it goes half-open and lets up to ``half_open_probes``
+    calls through as probes: a fast success closes it, anything else reopens
+    it for another ``open_seconds``.
+
+    Listeners registered with :meth:`add_listener` are called with
+    ``(old_state, new_state)`` on every transition, on the thread that caused
+    it. The breaker itself has no timer: the open -> half-open step happens on
+    the next :meth:`acquire`, and a caller (``LLMIntentRecognizer`` does) can
+    listen for ``"open"`` to send a probe of its own after ``open_seconds``.
+    Only ``fn()`` is timed, so time spent waiting for a slot or an executor
+    thread never counts as a slow call (see :meth:`call_sync`).
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        slow_call_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 5.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window_size < 1 or min_calls < 1:
+            raise ValueError("window_size and min_calls must be >= 1")
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min(min_calls, window_size)
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        # (failed, slow) per recent call while closed.
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.transitions = dict.fromkeys(CIRCUIT_STATES, 0)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and self._clock() - self._opened_at >= self.open_seconds:
+                return "half_open"
+            return self._state
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _transition(self, state: str) -> tuple[str, str] | None:
+        """Switch state under the lock; returns the change to announce."""
+        old = self._state
+        if old == state:
+            return None
+        self._state = state
+        self.transitions[state] += 1
+        if state == "open":
+            self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._probes = 0
+        return old, state
+
+    def _announce(self, change: tuple[str, str] | None) -> None:
+        if change is not None:
+            for listener in self._listeners:
+                listener(*change)
+
+    def acquire(self) -> bool:
+        """Admit a call or raise :class:`CircuitOpenError`; returns whether it is a probe."""
+        change = None
+        probe = False
+        rejection = None
+        with self._lock:
+            if self._state == "open":
+                if self._clock() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError("Circuit open, skipping call")
+                change = self._transition("half_open")
+            if self._state == "half_open":
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    rejection = CircuitOpenError("Circuit half-open, probe in flight")
+                else:
+                    self._probes += 1
+                    probe = True
+        self._announce(change)
+        if rejection is not None:
+            raise rejection
+        return probe
+
+    def record(self, seconds: float, failed: bool, probe: bool = False) -> None:
+        """Record a finished call admitted by :meth:`acquire`."""
+        slow = seconds >= self.slow_call_seconds
+        with self._lock:
+            if probe:
+                if self._state != "half_open":
+                    return
+                change = self._transition("open" if failed or slow else "closed")
+            elif self._state != "closed":
+                # A call admitted before the circuit opened; the probe decides.
+                return
+            else:
+                self._outcomes.append((failed, slow))
+                change = None
+                total = len(self._outcomes)
+                if total >= self.min_calls:
+                    failures = sum(1 for f, _ in self._outcomes if f)
+                    slow_calls = sum(1 for _, s in self._outcomes if s)
+                    if (
+                        failures / total >= self.failure_rate
+                        or slow_calls / total >= self.slow_call_rate
+                    ):
+                        change = self._transition("open")
+        self._announce(change)
+
+    def release(self, probe: bool) -> None:
+        """Give back a probe slot for a call that ended without an outcome."""
+        if probe:
+            with self._lock:
+                if self._state == "half_open" and self._probes > 0:
+                    self._probes -= 1
+
+    async def call(self, fn: Callable[[], Awaitable[R]], probe: bool | None = None) -> R:
+        """Await ``fn()`` through the breaker, recording its outcome and latency.
+
+        Pass ``probe`` from an earlier :meth:`acquire` to admit a call before it
+        waits for a concurrency slot, so only ``fn()`` itself is timed.
+        """
+        if probe is None:
+            probe = self.acquire()
+        started = self._clock()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.release(probe)
+            raise
+        except Exception:
+            self.record(self._clock() - started, failed=True, probe=probe)
+            raise
+        self.record(self._clock() - started, failed=False, probe=probe)
+        return result
+
+    def call_sync(self, fn: Callable[[], R], probe: bool | None = None) -> R:
+        """Blocking :meth:`call`: run ``fn()`` on this thread and record it.
+
+        For work handed to an executor, call this inside the worker thread so
+        time spent queued for a thread isn't counted against the service.
+        """
+        if probe is None:
+            probe = self.acquire()
+        started = self._clock()
+        try:
+            result = fn()
+        except Exception:
+            self.record(self._clock() - started, failed=True, probe=probe)
+            raise
+        except BaseException:
+            self.release(probe)
+            raise
+        self.record(self._clock() - started, failed=False, probe=probe)
+        return result
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "state": self.state,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+
+__all__ = ["CIRCUIT_STATES", "CircuitBreaker", "CircuitOpenError"]
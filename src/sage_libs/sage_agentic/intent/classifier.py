@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Hashable, Iterable, Sequence
+from typing import TypeVar
+
+from sage_libs.sage_agentic.intent.background import run_sync
 from sage_libs.sage_agentic.intent.base import (
     ChainedIntentRecognizer,
     IntentRecognitionContext,
     IntentRecognizer,
 )
+from sage_libs.sage_agentic.intent.cache import ResultCache, copy_result, normalize_message
 from sage_libs.sage_agentic.intent.catalog import (
     INTENT_TOOLS,
     IntentTool,
@@ -14,8 +22,13 @@ from sage_libs.sage_agentic.intent.catalog import (
     get_all_intent_keywords,
     get_intent_tool,
 )
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker
+from sage_libs.sage_agentic.intent.domains import DomainRouter
 from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
 from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.metrics import IntentMetrics
+from sage_libs.sage_agentic.intent.registry import RecognizerRegistry, default_registry
+from sage_libs.sage_agentic.intent.shadow import ShadowEvaluator
 
 # LLMIntentRecognizer is optional - imported via factory when needed
 from sage_libs.sage_agentic.intent.types import (
@@ -28,6 +41,19 @@ from sage_libs.sage_agentic.intent.types import (
     get_intent_display_name,
 )
 
+StreamItem = TypeVar("StreamItem", str, IntentRecognitionContext)
+
+
+async def _iterate(
+    source: AsyncIterable[StreamItem] | Iterable[StreamItem],
+) -> AsyncIterator[StreamItem]:
+    if isinstance(source, AsyncIterable):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
 
 class IntentClassifier:
     """Default classifier backed by a recognizer chain."""
@@ -37,24 +63,341 @@ class IntentClassifier:
         mode: str = "keyword",
         embedding_model: str | None = None,
         fallback_modes: list[str] | None = None,
+        cache: ResultCache | None = None,
+        min_confidence: float = 0.0,
+        strategy: str = "sequential",
+        hedge_delay: float = 0.05,
+        metrics: IntentMetrics | None = None,
+        registry: RecognizerRegistry | None = None,
+        coalesce: bool = True,
+        domain_router: DomainRouter | None = None,
+        distilled_model: str | None = None,
+        shadow: ShadowEvaluator | None = None,
     ) -> None:
+        """Build the recognizer chain for ``mode`` and ``fallback_modes``.
+
+        Recognizers come from ``registry`` (the process-wide
+        :func:`default_registry` when omitted), so classifiers with the same
+        configuration share one compiled copy. Call :meth:`aclose` to release
+        them.
+
+        With ``coalesce``, concurrent :meth:`classify` calls for the same
+        normalized message share one recognizer call (see :meth:`classify`).
+
+        With ``domain_router``, ``KNOWLEDGE_QUERY`` results carry only the
+        knowledge domains the router picks for the message, plus their scores.
+
+        With ``shadow``, a sample of the classified messages is also sent to
+        its recognizer in the background and compared with the result returned
+        here, which it never delays or changes (see :class:`ShadowEvaluator`).
+        """
         self.mode = mode
         self.embedding_model = embedding_model
+        self.distilled_model = distilled_model
+        self.fallback_modes = tuple(fallback_modes or ("keyword",))
+        self.cache = cache
+        self.metrics = metrics
+        self.coalesce = coalesce
+        self.domain_router = domain_router
+        self.shadow = shadow
+        # Identical classifications still running, by cache (or message) key.
+        self._in_flight: dict[Hashable, asyncio.Task[IntentResult]] = {}
+        self.coalesced = 0
+        self._registry = registry or default_registry()
         self._recognizer = build_recognizer_chain(
             primary_mode=mode,
-            fallback_modes=fallback_modes or ("keyword",),
-            min_confidence=0.0,
+            fallback_modes=self.fallback_modes,
+            min_confidence=min_confidence,
+            strategy=strategy,
+            hedge_delay=hedge_delay,
+            embedding_model=embedding_model,
+            metrics=metrics,
+            registry=self._registry,
+            distilled_model=distilled_model,
+        )
+        # Circuit state changes of LLM recognizers are counted in the metrics.
+        self._watched: list[CircuitBreaker] = []
+        if metrics is not None:
+            for recognizer in self._recognizer.recognizers:
+                breaker = getattr(recognizer, "circuit_breaker", None)
+                if breaker is not None:
+                    metrics.watch_circuit(type(recognizer).__name__, breaker)
+                    self._watched.append(breaker)
+        # Every setting that changes a result: each recognizer's own (embedder,
+        # distilled model digest, ...), the chain's threshold and strategy, routing.
+        self._cache_config: tuple = (self._recognizer.cache_key,)
+        if domain_router is not None:
+            self._cache_config += (domain_router.key,)
+        self._fold_case = self._recognizer.case_insensitive and (
+            domain_router is None or domain_router.case_insensitive
         )
         self._initialized = True
 
+    async def aclose(self) -> None:
+        """Release the shared recognizers; the last holder closes their clients."""
+        if not self._initialized:
+            return
+        self._initialized = False
+        for breaker in self._watched:
+            self.metrics.unwatch_circuit(breaker)  # type: ignore[union-attr]
+        for recognizer in self._recognizer.recognizers:
+            await self._registry.release(recognizer)
+
     async def classify(
         self,
         message: str,
         history: list[dict[str, str]] | None = None,
         context: str | None = None,
+        budget: float | None = None,
+    ) -> IntentResult:
+        """Classify one message.
+
+        ``budget`` is the time in seconds the caller can wait: recognizers
+        expected to overrun it are skipped or cut off and the best result so far
+        is returned (see ``ChainedIntentRecognizer``).
+
+        While a call for the same key (the cache key, or the normalized
+        message, history and context without a cache) is running, unbudgeted
+        calls await it instead of starting their own and each get a copy of its
+        result. Cancelling a waiter leaves the shared call running for the
+        others. Calls with a ``budget`` always run on their own deadline.
+        """
+        started = time.perf_counter()
+        result = await self._classify(message, history, context, budget)
+        self._offer_shadow(message, history, context, result, time.perf_counter() - started)
+        return result
+
+    async def _classify(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None,
+        context: str | None,
+        budget: float | None,
+    ) -> IntentResult:
+        ctx = IntentRecognitionContext.with_budget(
+            message, budget, history=history, extra={"context": context}
+        )
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(message, history, context)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if not self.coalesce or budget is not None:
+            return await self._compute(key, ctx)
+
+        if key is None:
+            key = self._flight_key(message, history, context)
+        loop = asyncio.get_running_loop()
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.get_loop() is loop:
+            self.coalesced += 1
+            if self.metrics is not None:
+                self.metrics.observe_coalesced()
+        else:
+            flight = loop.create_task(self._compute(key, ctx))
+            self._in_flight[key] = flight
+            flight.add_done_callback(lambda task: self._land(key, task))
+        return copy_result(await asyncio.shield(flight))
+
+    def classify_sync(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None = None,
+        context: str | None = None,
+        budget: float | None = None,
+    ) -> IntentResult:
+        """Blocking :meth:`classify` for sync callers, safe from many threads.
+
+        An inline chain (keyword or embedding recognizers only) runs on the
+        calling thread with no event loop. Otherwise the call runs on the
+        shared background loop, so LLM clients and in-flight coalescing are
+        shared by every calling thread. Must not be called from a coroutine.
+        """
+        if not self._recognizer.inline:
+            return run_sync(self.classify(message, history, context, budget))
+        started = time.perf_counter()
+        result = self._classify_inline(message, history, context, budget)
+        self._offer_shadow(message, history, context, result, time.perf_counter() - started)
+        return result
+
+    def _classify_inline(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None,
+        context: str | None,
+        budget: float | None,
     ) -> IntentResult:
-        ctx = IntentRecognitionContext(message=message, history=history, extra={"context": context})
-        return await self._recognizer.classify(ctx)
+        ctx = IntentRecognitionContext.with_budget(
+            message, budget, history=history, extra={"context": context}
+        )
+        if self.cache is None:
+            return self._route(self._recognizer.classify_sync(ctx), message)
+        key = self._cache_key(message, history, context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._route(self._recognizer.classify_sync(ctx), message)
+        self.cache.put(key, result)
+        return result
+
+    def _offer_shadow(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None,
+        context: str | None,
+        result: IntentResult,
+        seconds: float,
+    ) -> None:
+        if self.shadow is not None:
+            ctx = IntentRecognitionContext(message, history, extra={"context": context})
+            self.shadow.offer(ctx, result, seconds)
+
+    def _route(self, result: IntentResult, message: str) -> IntentResult:
+        if self.domain_router is None:
+            return result
+        return self.domain_router.apply(result, message)
+
+    async def _compute(self, key: Hashable, ctx: IntentRecognitionContext) -> IntentResult:
+        result = self._route(await self._recognizer.classify(ctx), ctx.message)
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+
+    def _land(self, key: Hashable, flight: asyncio.Task[IntentResult]) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        # Every waiter may have been cancelled; retrieve the error so it isn't logged
+        # as never retrieved.
+        if not flight.cancelled():
+            flight.exception()
+
+    def _flight_key(
+        self, message: str, history: list[dict[str, str]] | None, context: str | None
+    ) -> Hashable:
+        turns = tuple((turn.get("role", ""), turn.get("content", "")) for turn in history or ())
+        return normalize_message(message, self._fold_case), turns, context
+
+    async def classify_batch(
+        self,
+        messages: Sequence[str],
+        histories: Sequence[list[dict[str, str]] | None] | None = None,
+    ) -> list[IntentResult]:
+        """Classify many messages; results come back in input order.
+
+        Keyword mode scores the whole batch at once, LLM mode fans out with the
+        recognizer's bounded concurrency. Each result equals ``classify(message,
+        history)`` for the same input.
+        """
+        if histories is not None and len(histories) != len(messages):
+            raise ValueError(f"Got {len(histories)} histories for {len(messages)} messages")
+        started = time.perf_counter()
+        results = await self._classify_batch(messages, histories)
+        if self.shadow is not None and results:
+            # Compared with each message's share of the batch time.
+            seconds = (time.perf_counter() - started) / len(results)
+            for index, result in enumerate(results):
+                history = histories[index] if histories is not None else None
+                self._offer_shadow(messages[index], history, None, result, seconds)
+        return results
+
+    async def _classify_batch(
+        self,
+        messages: Sequence[str],
+        histories: Sequence[list[dict[str, str]] | None] | None,
+    ) -> list[IntentResult]:
+        contexts = [
+            IntentRecognitionContext(
+                message=message,
+                history=histories[i] if histories is not None else None,
+                extra={"context": None},
+            )
+            for i, message in enumerate(messages)
+        ]
+        if self.cache is None:
+            computed = await self._recognizer.classify_batch(contexts)
+            return [self._route(result, ctx.message) for result, ctx in zip(computed, contexts)]
+
+        results: list[IntentResult | None] = []
+        keys = []
+        misses: list[int] = []
+        for index, ctx in enumerate(contexts):
+            key = self._cache_key(ctx.message, ctx.history, None)
+            cached = self.cache.get(key)
+            keys.append(key)
+            results.append(cached)
+            if cached is None:
+                misses.append(index)
+        if misses:
+            computed = await self._recognizer.classify_batch([contexts[i] for i in misses])
+            for index, result in zip(misses, computed):
+                result = self._route(result, contexts[index].message)
+                self.cache.put(keys[index], result)
+                results[index] = result
+        return results  # type: ignore[return-value]
+
+    async def classify_stream(
+        self,
+        source: AsyncIterable[StreamItem] | Iterable[StreamItem],
+        concurrency: int = 8,
+        ordered: bool = True,
+        buffer_size: int | None = None,
+    ) -> AsyncIterator[tuple[StreamItem, IntentResult]]:
+        """Classify messages or contexts from ``source`` and yield ``(input, result)``.
+
+        At most ``concurrency`` classifications run at once, and at most
+        ``buffer_size`` items (running plus finished but not yet consumed;
+        defaults to ``2 * concurrency``) are held. The source is only read when
+        there is room, so a slow recognizer or consumer applies backpressure.
+        With ``ordered=False`` results are yielded as they complete. A failed
+        classification ends the stream with its exception.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+        window = max(buffer_size or 2 * concurrency, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item: StreamItem) -> tuple[StreamItem, IntentResult]:
+            async with semaphore:
+                if isinstance(item, IntentRecognitionContext):
+                    extra = item.extra or {}
+                    result = await self.classify(
+                        item.message, item.history, extra.get("context"), item.remaining()
+                    )
+                else:
+                    result = await self.classify(item)
+            return item, result
+
+        items = _iterate(source).__aiter__()
+        pending: deque[asyncio.Task] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        item = await items.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.append(asyncio.ensure_future(run(item)))
+                if not pending:
+                    return
+                if ordered:
+                    yield await pending.popleft()
+                    continue
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in [task for task in pending if task in done]:
+                    pending.remove(task)
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _cache_key(  # type: ignore[no-untyped-def]
+        self, message: str, history: list[dict[str, str]] | None, context: str | None
+    ):
+        message = normalize_message(message, self._fold_case)
+        return self.cache.make_key(message, history, mode=(self._cache_config, context))
 
     @property
     def is_initialized(self) -> bool:
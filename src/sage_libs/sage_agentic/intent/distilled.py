@@ -0,0 +1,486 @@
+"""Distilled intent recognizer: hashed n-gram logistic regression trained on logged labels.
+
+Train offline from JSONL ``(message, intent)`` pairs, e.g. logged
+``LLMIntentRecognizer`` results or ``sage-intent-relabel`` output::
+
+    sage-intent-distill labels.jsonl.gz model.npz --min-confidence 0.8
+
+then put the model in front of the LLM, which only sees the messages the
+model is unsure about::
+
+    build_recognizer_chain("distilled", ["llm", "keyword"], min_confidence=0.9,
+                           distilled_model="model.npz")
+
+The model is a single ``.npz`` file; scoring is pure NumPy and needs no GPU.
+
+How much LLM traffic it saves depends on how much of the traffic the teacher
+labels inconsistently, because those messages never score confidently. In
+``benchmarks/bench_distilled.py`` at ``min_confidence=0.9``, 21% of messages
+still reach the LLM when 30% of the traffic is ambiguous (about 5x fewer LLM
+calls). With 10% ambiguous, 6% reach it (about 17x fewer).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import zlib
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.embedding_recognizer import HashedNgramEmbedder
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+DISTILLED_MODEL_ENV = "SAGE_INTENT_DISTILLED_MODEL"
+_FORMAT_VERSION = 1
+_COVERAGE_THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95)
+
+
+class HashedFeatures:
+    """Sparse, L2-normalized ``(index, value)`` rows over hashed n-gram features.
+
+    Features are the :class:`HashedNgramEmbedder` ones (word unigrams and
+    character n-grams, which cover CJK and mixed-script text) hashed into
+    ``dim`` buckets, weighted by sublinear term frequency.
+    """
+
+    def __init__(self, dim: int = 2**17, ngram_range: tuple[int, int] = (2, 4)) -> None:
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self._tokenizer = HashedNgramEmbedder(dim, ngram_range)
+
+    def row(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        counts: dict[int, int] = {}
+        for feature in self._tokenizer.features(text):
+            bucket = zlib.crc32(feature.encode("utf-8")) % self.dim
+            counts[bucket] = counts.get(bucket, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        norm = float(np.sqrt(values @ values))
+        return indices, values / norm if norm else values
+
+    def rows(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR-style ``(indices, values, offsets)`` for ``texts``."""
+        encoded = [self.row(text) for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(indices) for indices, _ in encoded])
+        if not encoded:
+            return np.zeros(0, np.int64), np.zeros(0, np.float32), offsets
+        indices = np.concatenate([indices for indices, _ in encoded])
+        values = np.concatenate([values for _, values in encoded]).astype(np.float32)
+        return indices, values, offsets
+
+
+def _sparse_logits(
+    weights: np.ndarray, indices: np.ndarray, values: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """``X @ weights`` for CSR rows ``X``; empty rows score zero."""
+    logits = np.zeros((len(offsets) - 1, weights.shape[1]), dtype=np.float32)
+    lengths = np.diff(offsets)
+    nonempty = lengths > 0
+    if nonempty.any():
+        contributions = weights[indices] * values[:, None]
+        logits[nonempty] = np.add.reduceat(contributions, offsets[:-1][nonempty], axis=0)
+    return logits
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    probabilities = np.exp(shifted)
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+class DistilledModel:
+    """Multinomial logistic regression over :class:`HashedFeatures`.
+
+    ``labels`` are catalog ids (``"sage_coding"``, or sub-intents such as
+    ``"system_operation/restart_gateway"``). Probabilities are divided by the
+    calibration ``temperature`` fitted on held-out data before the softmax.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        labels: Sequence[str],
+        temperature: float = 1.0,
+        features: HashedFeatures | None = None,
+    ) -> None:
+        self.features = features or HashedFeatures(weights.shape[0])
+        if weights.shape != (self.features.dim, len(labels)) or bias.shape != (len(labels),):
+            raise ValueError(
+                f"Weights {weights.shape} / bias {bias.shape} don't match "
+                f"{self.features.dim} features x {len(labels)} labels"
+            )
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels: tuple[str, ...] = tuple(labels)
+        self.temperature = temperature
+        self.coarse: tuple[UserIntent, ...] = tuple(
+            catalog.coarse_intent(label) for label in self.labels
+        )
+
+    @cached_property
+    def digest(self) -> str:
+        """Content hash of the weights, labels and settings, e.g. for cache keys."""
+        config = [self.features.dim, list(self.features.ngram_range), self.temperature]
+        h = hashlib.blake2b(digest_size=16)
+        h.update(json.dumps([config, list(self.labels)]).encode("utf-8"))
+        h.update(self.weights.tobytes())
+        h.update(self.bias.tobytes())
+        return h.hexdigest()
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Calibrated ``(len(texts), len(labels))`` probabilities."""
+        logits = _sparse_logits(self.weights, *self.features.rows(texts)) + self.bias
+        return _softmax(logits / self.temperature)
+
+    def predict_one(self, text: str) -> np.ndarray:
+        indices, values = self.features.row(text)
+        logits = (values @ self.weights[indices] + self.bias) / self.temperature
+        probabilities = np.exp(logits - logits.max())
+        return probabilities / probabilities.sum()
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write one compressed ``.npz``; weights are stored as float16."""
+        config = {
+            "format": _FORMAT_VERSION,
+            "dim": self.features.dim,
+            "ngram_range": list(self.features.ngram_range),
+            "temperature": self.temperature,
+        }
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                weights=self.weights.astype(np.float16),
+                bias=self.bias,
+                labels=np.asarray(self.labels, dtype=str),
+                config=np.asarray(json.dumps(config)),
+            )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> DistilledModel:
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            if config.get("format") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported distilled model format {config.get('format')!r}")
+            return cls(
+                data["weights"],
+                data["bias"],
+                [str(label) for label in data["labels"]],
+                temperature=config["temperature"],
+                features=HashedFeatures(config["dim"], tuple(config["ngram_range"])),
+            )
+
+
+@dataclass
+class TrainingReport:
+    samples: int = 0
+    validation_samples: int = 0
+    labels: list[str] = field(default_factory=list)
+    train_accuracy: float = 0.0
+    validation_accuracy: float = 0.0
+    temperature: float = 1.0
+    # Expected calibration error on the validation split, 10 equal-width bins.
+    calibration_error: float = 0.0
+    # Per confidence threshold: share of validation messages at or above it and
+    # their accuracy, i.e. the traffic a chain with that min_confidence keeps
+    # away from the next recognizer, and how often it is right.
+    coverage: dict[float, tuple[float, float]] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "samples": self.samples,
+            "validation_samples": self.validation_samples,
+            "labels": self.labels,
+            "train_accuracy": self.train_accuracy,
+            "validation_accuracy": self.validation_accuracy,
+            "temperature": self.temperature,
+            "calibration_error": self.calibration_error,
+            "coverage": {
+                str(t): {"share": share, "accuracy": accuracy}
+                for t, (share, accuracy) in self.coverage.items()
+            },
+        }
+
+
+def _fit_temperature(logits: np.ndarray, targets: np.ndarray) -> float:
+    """Temperature minimizing validation negative log-likelihood."""
+
+    def nll(temperature: float) -> float:
+        scaled = logits / temperature
+        scaled = scaled - scaled.max(axis=1, keepdims=True)
+        log_norm = np.log(np.exp(scaled).sum(axis=1))
+        return float((log_norm - scaled[np.arange(len(targets)), targets]).mean())
+
+    grid = np.geomspace(0.05, 20.0, 49)
+    best = int(np.argmin([nll(t) for t in grid]))
+    fine = np.geomspace(grid[max(best - 1, 0)], grid[min(best + 1, len(grid) - 1)], 41)
+    return float(fine[int(np.argmin([nll(t) for t in fine]))])
+
+
+def _calibration_error(confidence: np.ndarray, correct: np.ndarray, bins: int = 10) -> float:
+    edges = np.minimum((confidence * bins).astype(int), bins - 1)
+    error = 0.0
+    for b in range(bins):
+        mask = edges == b
+        if mask.any():
+            error += mask.mean() * abs(confidence[mask].mean() - correct[mask].mean())
+    return float(error)
+
+
+def train(
+    messages: Sequence[str],
+    labels: Sequence[str],
+    dim: int = 2**17,
+    epochs: int = 8,
+    learning_rate: float = 0.5,
+    l2: float = 1e-6,
+    batch_size: int = 256,
+    validation_fraction: float = 0.1,
+    seed: int = 0,
+) -> tuple[DistilledModel, TrainingReport]:
+    """Fit a model with minibatch AdaGrad, then calibrate it on a held-out split.
+
+    ``validation_fraction`` of the data (at least one sample, when there are
+    ten or more) is kept out of training to fit the temperature and to
+    compute the report.
+    """
+    if len(messages) != len(labels):
+        raise ValueError(f"Got {len(labels)} labels for {len(messages)} messages")
+    if not messages:
+        raise ValueError("No training samples")
+    vocabulary = sorted(set(labels))
+    label_ids = {label: i for i, label in enumerate(vocabulary)}
+    targets = np.asarray([label_ids[label] for label in labels], dtype=np.int64)
+    features = HashedFeatures(dim)
+    indices, values, offsets = features.rows(messages)
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(messages))
+    n_validation = int(len(messages) * validation_fraction) if len(messages) >= 10 else 0
+    if validation_fraction > 0 and len(messages) >= 10:
+        n_validation = max(n_validation, 1)
+    validation, training = order[:n_validation], order[n_validation:]
+
+    def subset(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lengths = offsets[rows + 1] - offsets[rows]
+        sub_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        sub_offsets[1:] = np.cumsum(lengths)
+        positions = np.concatenate(
+            [np.arange(offsets[r], offsets[r + 1]) for r in rows] or [np.zeros(0, np.int64)]
+        )
+        return indices[positions], values[positions], sub_offsets
+
+    n_labels = len(vocabulary)
+    weights = np.zeros((dim, n_labels), dtype=np.float32)
+    bias = np.zeros(n_labels, dtype=np.float32)
+    weight_squares = np.zeros_like(weights)
+    bias_squares = np.zeros_like(bias)
+    eps = 1e-8
+    for _ in range(epochs):
+        rng.shuffle(training)
+        for start in range(0, len(training), batch_size):
+            batch = training[start : start + batch_size]
+            batch_indices, batch_values, batch_offsets = subset(batch)
+            logits = _sparse_logits(weights, batch_indices, batch_values, batch_offsets) + bias
+            gradient = _softmax(logits)
+            gradient[np.arange(len(batch)), targets[batch]] -= 1.0
+            gradient /= len(batch)
+
+            # Per-feature gradients, summed over the batch rows that contain them.
+            rows = np.repeat(np.arange(len(batch)), np.diff(batch_offsets))
+            per_entry = gradient[rows] * batch_values[:, None]
+            by_feature = np.argsort(batch_indices, kind="stable")
+            sorted_indices = batch_indices[by_feature]
+            if len(sorted_indices):
+                boundaries = np.flatnonzero(
+                    np.concatenate(([True], sorted_indices[1:] != sorted_indices[:-1]))
+                )
+                touched = sorted_indices[boundaries]
+                feature_gradient = np.add.reduceat(per_entry[by_feature], boundaries, axis=0)
+                feature_gradient += l2 * weights[touched]
+                weight_squares[touched] += feature_gradient**2
+                weights[touched] -= (
+                    learning_rate * feature_gradient / (np.sqrt(weight_squares[touched]) + eps)
+                )
+            bias_gradient = gradient.sum(axis=0)
+            bias_squares += bias_gradient**2
+            bias -= learning_rate * bias_gradient / (np.sqrt(bias_squares) + eps)
+
+    model = DistilledModel(weights, bias, vocabulary, features=features)
+    report = TrainingReport(
+        samples=len(training), validation_samples=len(validation), labels=vocabulary
+    )
+    train_logits = _sparse_logits(weights, *subset(training)) + bias
+    report.train_accuracy = float((train_logits.argmax(axis=1) == targets[training]).mean())
+    if len(validation):
+        logits = _sparse_logits(weights, *subset(validation)) + bias
+        model.temperature = report.temperature = _fit_temperature(logits, targets[validation])
+        probabilities = _softmax(logits / model.temperature)
+        predicted = probabilities.argmax(axis=1)
+        confidence = probabilities.max(axis=1)
+        correct = (predicted == targets[validation]).astype(np.float64)
+        report.validation_accuracy = float(correct.mean())
+        report.calibration_error = _calibration_error(confidence, correct)
+        for threshold in _COVERAGE_THRESHOLDS:
+            kept = confidence >= threshold
+            accuracy = float(correct[kept].mean()) if kept.any() else 0.0
+            report.coverage[threshold] = (float(kept.mean()), accuracy)
+    return model, report
+
+
+def read_training_pairs(
+    path: str,
+    message_field: str = "message",
+    label_field: str | None = None,
+    min_confidence: float | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(message, label)`` pairs from a JSONL (optionally gzip) file.
+
+    Without ``label_field`` a record's ``label`` is used, else its ``intent``.
+    Records with an ``error``, without a string message or label, or (with
+    ``min_confidence``) with a lower ``confidence`` are skipped.
+    """
+    from sage_libs.sage_agentic.intent.relabel import open_input
+
+    with open_input(path) as source:
+        for line in source:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or "error" in record:
+                continue
+            message = record.get(message_field)
+            label = (
+                record.get(label_field)
+                if label_field is not None
+                else record.get("label") or record.get("intent")
+            )
+            if not isinstance(message, str) or not isinstance(label, str):
+                continue
+            confidence = record.get("confidence")
+            if min_confidence is not None and (
+                not isinstance(confidence, (int, float)) or confidence < min_confidence
+            ):
+                continue
+            yield message, label
+
+
+class DistilledIntentRecognizer(IntentRecognizer):
+    """Score messages with a :class:`DistilledModel`; a message costs microseconds.
+
+    ``model`` is a model or a path to one; without it the path comes from
+    ``$SAGE_INTENT_DISTILLED_MODEL``. Confidences are calibrated, so a chain's
+    ``min_confidence`` sets how much traffic falls through to slower
+    recognizers. ``scores`` holds the probability per top-level intent.
+    """
+
+    inline = True
+
+    def __init__(self, model: DistilledModel | str | os.PathLike[str] | None = None) -> None:
+        if model is None:
+            model = os.environ.get(DISTILLED_MODEL_ENV)
+            if not model:
+                raise ValueError(f"No distilled model given and ${DISTILLED_MODEL_ENV} is not set")
+        self.model = model if isinstance(model, DistilledModel) else DistilledModel.load(model)
+
+    @property
+    def cache_key(self) -> tuple[str, str]:
+        return type(self).__qualname__, self.model.digest
+
+    def _result(self, probabilities: np.ndarray) -> IntentResult:
+        model = self.model
+        best = int(probabilities.argmax())
+        label = model.labels[best]
+        scores: dict[UserIntent, float] = {}
+        for coarse, probability in zip(model.coarse, probabilities.tolist()):
+            scores[coarse] = scores.get(coarse, 0.0) + probability
+        intent = model.coarse[best]
+        knowledge_domains = None
+        if intent == UserIntent.KNOWLEDGE_QUERY:
+            knowledge_domains = list(catalog.current_catalog().knowledge_domains(label)) or None
+        return IntentResult(
+            intent=intent,
+            confidence=min(float(probabilities[best]), 1.0),
+            knowledge_domains=knowledge_domains,
+            scores=scores,
+            label=label,
+        )
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        return self._result(self.model.predict_one(ctx.message))
+
+    def classify_sync(self, ctx: IntentRecognitionContext) -> IntentResult:
+        return self._result(self.model.predict_one(ctx.message))
+
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult | Exception]:
+        if not contexts:
+            return []
+        probabilities = self.model.predict_proba([ctx.message for ctx in contexts])
+        return [self._result(row) for row in probabilities]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sage-intent-distill",
+        description="Train a distilled intent model from logged (message, intent) JSONL.",
+    )
+    parser.add_argument("input", help="JSONL training pairs, optionally gzip-compressed")
+    parser.add_argument("output", help="model file to write (.npz)")
+    parser.add_argument("--field", default="message", help="message field (default: message)")
+    parser.add_argument("--label-field", help="label field (default: label, else intent)")
+    parser.add_argument("--min-confidence", type=float, help="skip less confident labels")
+    parser.add_argument("--dim", type=int, default=2**17, help="hashed feature buckets")
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=1e-6)
+    parser.add_argument("--validation-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        pairs = list(
+            read_training_pairs(args.input, args.field, args.label_field, args.min_confidence)
+        )
+        model, report = train(
+            [message for message, _ in pairs],
+            [label for _, label in pairs],
+            dim=args.dim,
+            epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            l2=args.l2,
+            validation_fraction=args.validation_fraction,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    model.save(args.output)
+    json.dump(report.as_dict(), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+__all__ = [
+    "DISTILLED_MODEL_ENV",
+    "DistilledIntentRecognizer",
+    "DistilledModel",
+    "HashedFeatures",
+    "TrainingReport",
+    "read_training_pairs",
+    "train",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""Second-stage knowledge-domain routing for ``KNOWLEDGE_QUERY`` results.
+
+Recognizers attach every domain the catalog lists for an intent, so retrieval
+fans out to every index. :class:`DomainRouter` scores the candidate domains
+for the message and keeps a ranked, thresholded subset, which
+``IntentResult.get_search_sources`` then hands to retrieval::
+
+    classifier = IntentClassifier(domain_router=DomainRouter())
+
+:func:`evaluate_routing` measures the recall given up against the full
+fan-out on messages labelled with the domains that held their answer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.matcher import KeywordAutomaton
+from sage_libs.sage_agentic.intent.types import IntentResult, KnowledgeDomain, UserIntent
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingBackend
+
+DOMAIN_KEYWORDS: dict[KnowledgeDomain, tuple[str, ...]] = {
+    KnowledgeDomain.SAGE_DOCS: (
+        "文档",
+        "documentation",
+        "docs",
+        "api",
+        "接口",
+        "参数",
+        "parameter",
+        "配置",
+        "config",
+        "安装",
+        "install",
+        "部署",
+        "deploy",
+        "setup",
+        "是什么",
+        "what is",
+        "怎么使用",
+        "how to use",
+        "operator",
+        "pipeline",
+        "kernel",
+        "middleware",
+    ),
+    KnowledgeDomain.EXAMPLES: (
+        "示例",
+        "例子",
+        "example",
+        "sample",
+        "demo",
+        "教程",
+        "tutorial",
+        "代码",
+        "code",
+        "snippet",
+        "实现",
+        "implement",
+        "如何实现",
+        "how do i",
+        "模板",
+        "template",
+    ),
+    KnowledgeDomain.RESEARCH_GUIDANCE: (
+        "论文",
+        "paper",
+        "研究",
+        "research",
+        "方法论",
+        "methodology",
+        "写作",
+        "writing",
+        "投稿",
+        "submission",
+        "审稿",
+        "review",
+        "实验",
+        "experiment",
+        "导师",
+        "advisor",
+        "学术",
+        "academic",
+    ),
+    KnowledgeDomain.USER_UPLOADS: (
+        "上传",
+        "upload",
+        "我的文件",
+        "my file",
+        "附件",
+        "attachment",
+        "pdf",
+        "我发的",
+        "i sent",
+        "this document",
+        "这份",
+        "这个文件",
+    ),
+}
+
+DOMAIN_DESCRIPTIONS: dict[KnowledgeDomain, str] = {
+    KnowledgeDomain.SAGE_DOCS: "SAGE 框架文档 API 配置 安装 framework documentation API reference",
+    KnowledgeDomain.EXAMPLES: "代码示例 教程 example code tutorials and sample implementations",
+    KnowledgeDomain.RESEARCH_GUIDANCE: "研究方法 论文写作 research methodology and paper writing",
+    KnowledgeDomain.USER_UPLOADS: "用户上传的资料 user uploaded files PDF documents attachments",
+}
+
+
+class DomainRouter:
+    """Rank a knowledge question's candidate domains and keep the likely ones.
+
+    Each domain is scored by its share of keyword hits in the message and,
+    with ``embedding_model``, by a softmax over cosine similarity to a domain
+    centroid; the two are mixed by ``embedding_weight``. Domains scoring at
+    least ``threshold`` are kept, best first, up to ``max_domains`` (the top
+    domain is always kept). A message neither scorer has a signal for (no
+    keyword hit, no embedding features) keeps every candidate.
+    """
+
+    def __init__(
+        self,
+        keywords: Mapping[KnowledgeDomain, Iterable[str]] | None = None,
+        embedding_model: str | EmbeddingBackend | None = None,
+        embedding_weight: float = 0.5,
+        threshold: float = 0.25,
+        max_domains: int = 2,
+        temperature: float = 0.1,
+    ) -> None:
+        if max_domains < 1:
+            raise ValueError(f"max_domains must be >= 1, got {max_domains}")
+        if not 0 <= embedding_weight <= 1:
+            raise ValueError(f"embedding_weight must be between 0 and 1, got {embedding_weight}")
+        keywords = keywords if keywords is not None else DOMAIN_KEYWORDS
+        self.domains: tuple[KnowledgeDomain, ...] = tuple(KnowledgeDomain)
+        self.keywords = {domain: tuple(keywords.get(domain, ())) for domain in self.domains}
+        self.threshold = threshold
+        self.max_domains = max_domains
+        self.embedding_weight = embedding_weight if embedding_model is not None else 0.0
+        self._temperature = temperature
+        self._matcher = KeywordAutomaton([self.keywords[domain] for domain in self.domains])
+        self._embedder: EmbeddingBackend | None = None
+        self._centroids: np.ndarray | None = None
+        if embedding_model is not None:
+            self._build_centroids(embedding_model)
+        digest = hashlib.sha256(
+            json.dumps([list(self.keywords[d]) for d in self.domains]).encode("utf-8")
+        ).hexdigest()[:12]
+        embedder = self._embedder
+        embedder_key = None
+        if embedder is not None:
+            embedder_key = getattr(
+                embedder, "cache_key", f"{type(embedder).__module__}.{type(embedder).__qualname__}"
+            )
+        # Keyword routing matches lowercased text; an embedder may not.
+        self.case_insensitive = embedder is None
+        # Identifies the routing configuration, e.g. inside result cache keys.
+        self.key = (
+            "domains",
+            digest,
+            threshold,
+            max_domains,
+            embedder_key,
+            self.embedding_weight,
+            temperature if embedder is not None else None,
+        )
+
+    def _build_centroids(self, embedding_model: str | EmbeddingBackend) -> None:
+        import numpy as np
+
+        from sage_libs.sage_agentic.intent.embedding_recognizer import (
+            build_embedder,
+            normalize_rows,
+        )
+
+        self._embedder = build_embedder(embedding_model)
+        centroids = []
+        for domain in self.domains:
+            description = self._embedder.embed([DOMAIN_DESCRIPTIONS.get(domain, domain.value)])[0]
+            if self.keywords[domain]:
+                keywords = self._embedder.embed(list(self.keywords[domain])).mean(axis=0)
+                centroids.append(0.5 * description + 0.5 * keywords)
+            else:
+                centroids.append(description)
+        self._centroids = normalize_rows(np.asarray(centroids, dtype=np.float32))
+
+    def scores(
+        self, message: str, candidates: Sequence[KnowledgeDomain] | None = None
+    ) -> dict[KnowledgeDomain, float]:
+        """Normalized score per candidate domain; empty when the message has no signal."""
+        candidates = tuple(candidates) if candidates else self.domains
+        columns = [self.domains.index(domain) for domain in candidates]
+        matches = self._matcher.match(message.lower())
+        hits = [len(matches.get(column, ())) for column in columns]
+        total = sum(hits)
+        keyword_scores = [h / total for h in hits] if total else None
+
+        embedding_scores = None
+        if self._embedder is not None and self._centroids is not None:
+            import numpy as np
+
+            vector = self._embedder.embed([message])[0]
+            if vector.any():
+                logits = self._centroids[columns] @ vector / self._temperature
+                probabilities = np.exp(logits - logits.max())
+                embedding_scores = (probabilities / probabilities.sum()).tolist()
+
+        if keyword_scores is None and embedding_scores is None:
+            return {}
+        if keyword_scores is None:
+            combined = embedding_scores
+        elif embedding_scores is None:
+            combined = keyword_scores
+        else:
+            weight = self.embedding_weight
+            combined = [
+                weight * e + (1 - weight) * k for e, k in zip(embedding_scores, keyword_scores)
+            ]
+        return {domain: float(score) for domain, score in zip(candidates, combined)}  # type: ignore[arg-type]
+
+    def route(
+        self, message: str, candidates: Sequence[KnowledgeDomain] | None = None
+    ) -> tuple[list[KnowledgeDomain], dict[KnowledgeDomain, float]]:
+        """Domains to search, best first, and the scores they were picked by."""
+        candidates = list(candidates) if candidates else list(self.domains)
+        scores = self.scores(message, candidates)
+        if not scores:
+            return candidates, scores
+        # sorted() is stable, so equal scores keep the candidates' order.
+        ranked = sorted(scores, key=lambda domain: -scores[domain])
+        kept = [domain for domain in ranked if scores[domain] >= self.threshold]
+        return (kept or ranked[:1])[: self.max_domains], scores
+
+    def apply(self, result: IntentResult, message: str) -> IntentResult:
+        """Narrow a ``KNOWLEDGE_QUERY`` result's domains; other results pass through.
+
+        Candidates are the domains the catalog lists for the result's label,
+        else those already on the result, else every domain.
+        """
+        if result.intent != UserIntent.KNOWLEDGE_QUERY:
+            return result
+        candidates = (
+            list(catalog.current_catalog().knowledge_domains(result.label or result.intent))
+            or result.knowledge_domains
+            or list(self.domains)
+        )
+        domains, scores = self.route(message, candidates)
+        return replace(result, knowledge_domains=domains, domain_scores=scores or None)
+
+
+@dataclass
+class RoutingEvaluation:
+    """Routed retrieval against the full fan-out, over labelled messages."""
+
+    samples: int = 0
+    baseline_fanout: float = 0.0
+    routed_fanout: float = 0.0
+    baseline_recall: float = 0.0
+    routed_recall: float = 0.0
+    # Relevant domains the router dropped but the full fan-out would have searched.
+    missed: dict[KnowledgeDomain, int] = field(default_factory=dict)
+
+    @property
+    def recall_loss(self) -> float:
+        return self.baseline_recall - self.routed_recall
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "samples": self.samples,
+            "baseline_fanout": self.baseline_fanout,
+            "routed_fanout": self.routed_fanout,
+            "baseline_recall": self.baseline_recall,
+            "routed_recall": self.routed_recall,
+            "recall_loss": self.recall_loss,
+            "missed": {domain.value: count for domain, count in self.missed.items()},
+        }
+
+
+def evaluate_routing(
+    router: DomainRouter,
+    samples: Iterable[tuple[str, Iterable[KnowledgeDomain]]],
+    candidates: Sequence[KnowledgeDomain] | None = None,
+) -> RoutingEvaluation:
+    """Compare routed domains with searching every candidate.
+
+    Each sample is a knowledge question and the domains holding its answer.
+    Recall is the share of those domains that get searched, averaged per
+    message; fan-out is the mean number of domains searched. ``candidates``
+    defaults to the catalog's domains for ``KNOWLEDGE_QUERY``.
+    """
+    if candidates is None:
+        candidates = catalog.current_catalog().knowledge_domains(UserIntent.KNOWLEDGE_QUERY)
+    candidates = list(candidates) or list(KnowledgeDomain)
+    evaluation = RoutingEvaluation()
+    for message, relevant in samples:
+        relevant = set(relevant)
+        if not relevant:
+            continue
+        routed, _ = router.route(message, candidates)
+        evaluation.samples += 1
+        evaluation.baseline_fanout += len(candidates)
+        evaluation.routed_fanout += len(routed)
+        evaluation.baseline_recall += len(relevant.intersection(candidates)) / len(relevant)
+        evaluation.routed_recall += len(relevant.intersection(routed)) / len(relevant)
+        for domain in relevant.intersection(candidates).difference(routed):
+            evaluation.missed[domain] = evaluation.missed.get(domain, 0) + 1
+    if evaluation.samples:
+        for name in ("baseline_fanout", "routed_fanout", "baseline_recall", "routed_recall"):
+            setattr(evaluation, name, getattr(evaluation, name) / evaluation.samples)
+    return evaluation
+
+
+def _read_samples(path: str) -> Iterable[tuple[str, list[KnowledgeDomain]]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield item["message"], [KnowledgeDomain(d) for d in item["domains"]]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sage-intent-domain-eval",
+        description="Measure the retrieval recall lost by knowledge-domain routing.",
+    )
+    parser.add_argument(
+        "samples", help='JSONL of {"message": ..., "domains": [...]} with the relevant domains'
+    )
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--max-domains", type=int, default=2)
+    parser.add_argument("--embedding", help="embedding backend to mix in, e.g. 'hashed'")
+    parser.add_argument("--embedding-weight", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    try:
+        router = DomainRouter(
+            embedding_model=args.embedding,
+            embedding_weight=args.embedding_weight,
+            threshold=args.threshold,
+            max_domains=args.max_domains,
+        )
+        evaluation = evaluate_routing(router, _read_samples(args.samples))
+    except (ValueError, KeyError) as exc:
+        parser.error(str(exc))
+    json.dump(evaluation.as_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+__all__ = [
+    "DOMAIN_DESCRIPTIONS",
+    "DOMAIN_KEYWORDS",
+    "DomainRouter",
+    "RoutingEvaluation",
+    "evaluate_routing",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
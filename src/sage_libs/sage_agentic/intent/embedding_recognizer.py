@@ -0,0 +1,262 @@
+"""Embedding-based intent recognizer backed by a precomputed centroid matrix."""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from collections.abc import Callable, Sequence
+from typing import NamedTuple, Protocol
+
+import numpy as np
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+_WORD = re.compile(r"\w+")
+
+
+class EmbeddingBackend(Protocol):
+    """Anything that turns texts into an ``(n, dim)`` array of vectors.
+
+    A backend may define ``cache_key``, a process-independent description of
+    its model and settings; otherwise result caches only see its class name.
+    """
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:  # pragma: no cover - interface
+        ...
+
+
+class HashedNgramEmbedder:
+    """Deterministic, dependency-free embedder using signed feature hashing.
+
+    Features are lowercased word unigrams plus character n-grams, so Latin and
+    CJK text both produce overlapping features. Rows are L2-normalized.
+    """
+
+    def __init__(self, dim: int = 1024, ngram_range: tuple[int, int] = (2, 4)) -> None:
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    @property
+    def cache_key(self) -> tuple[str, int, tuple[int, int]]:
+        return type(self).__qualname__, self.dim, tuple(self.ngram_range)
+
+    def features(self, text: str) -> list[str]:
+        text = " ".join(text.lower().split())
+        if not text:
+            return []
+        features = [f"w:{word}" for word in _WORD.findall(text)]
+        padded = f" {text} "
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            features.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: list[int] = []
+        cols: list[int] = []
+        signs: list[float] = []
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                cols.append(digest % self.dim)
+                signs.append(1.0 if digest & 0x80000000 else -1.0)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, cols), signs)
+        return normalize_rows(matrix)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+EMBEDDING_BACKENDS: dict[str, Callable[[], EmbeddingBackend]] = {
+    "hashed": HashedNgramEmbedder,
+}
+
+
+def build_embedder(model: str | EmbeddingBackend | None = None) -> EmbeddingBackend:
+    """Resolve an embedding backend by name, or pass an instance through."""
+    if model is None:
+        return HashedNgramEmbedder()
+    if not isinstance(model, str):
+        return model
+    factory = EMBEDDING_BACKENDS.get(model)
+    if factory is None:
+        raise ValueError(
+            f"Unknown embedding backend {model!r}, expected one of {sorted(EMBEDDING_BACKENDS)}"
+        )
+    return factory()
+
+
+class _CentroidState(NamedTuple):
+    snapshot: catalog.CatalogSnapshot
+    # Per catalog position: the intent's own centroid, and one blending in its
+    # sub-intents (equal to the own centroid for leaves).
+    centroids: np.ndarray
+    subtree_centroids: np.ndarray
+    roots: np.ndarray
+    root_centroids: np.ndarray
+
+
+class EmbeddingIntentRecognizer(IntentRecognizer):
+    """Score messages by cosine similarity to one centroid per ``IntentTool``.
+
+    Centroids blend the tool description with the mean of its keyword vectors
+    and are computed once per catalog version. A message costs one embedding
+    plus one matrix-vector product against the top-level intents; a batch
+    costs one matrix-matrix product.
+
+    In a hierarchical catalog (``system_operation/restart_gateway``) the
+    top-level pick descends greedily into the sub-intent whose centroid beats
+    the current intent's own, so only the children along one path are scored.
+    Confidence is the product of the softmax probabilities along that path.
+    """
+
+    inline = True
+
+    def __init__(
+        self,
+        embedding_model: str | EmbeddingBackend | None = None,
+        temperature: float = 0.1,
+    ) -> None:
+        self._embedder = build_embedder(embedding_model)
+        self._temperature = temperature
+        self._lock = threading.Lock()
+        self._state = self._build_state(catalog.current_catalog())
+
+    @property
+    def cache_key(self) -> tuple:
+        embedder = self._embedder
+        embedder_key = getattr(embedder, "cache_key", None)
+        if embedder_key is None:
+            embedder_key = f"{type(embedder).__module__}.{type(embedder).__qualname__}"
+        return type(self).__qualname__, embedder_key, self._temperature
+
+    def _current(self) -> _CentroidState:
+        """Centroids for the current catalog, recomputed once after a catalog swap."""
+        snapshot = catalog.current_catalog()
+        state = self._state
+        if state.snapshot is not snapshot:
+            with self._lock:
+                if self._state.snapshot is not snapshot:
+                    self._state = self._build_state(snapshot)
+                state = self._state
+        return state
+
+    def _build_state(self, snapshot: catalog.CatalogSnapshot) -> _CentroidState:
+        centroids = self._build_centroids(snapshot.tools)
+        subtree = centroids
+        if snapshot.hierarchical:
+            subtree = centroids.copy()
+            done: set[int] = set()
+
+            def blend(position: int) -> np.ndarray:
+                if position not in done:
+                    children = snapshot.children[position]
+                    if children:
+                        below = np.mean([blend(child) for child in children], axis=0)
+                        subtree[position] = 0.5 * centroids[position] + 0.5 * below
+                        subtree[position] /= np.linalg.norm(subtree[position]) or 1.0
+                    done.add(position)
+                return subtree[position]
+
+            for root in snapshot.roots:
+                blend(root)
+        roots = np.asarray(snapshot.roots, dtype=np.int64)
+        return _CentroidState(snapshot, centroids, subtree, roots, subtree[roots])
+
+    def _build_centroids(self, tools: Sequence[catalog.IntentTool]) -> np.ndarray:
+        centroids = []
+        for tool in tools:
+            description = self._embedder.embed([tool.description])[0]
+            if tool.keywords:
+                keywords = self._embedder.embed(tool.keywords).mean(axis=0)
+                centroids.append(0.5 * description + 0.5 * keywords)
+            else:
+                centroids.append(description)
+        return normalize_rows(np.asarray(centroids, dtype=np.float32))
+
+    @staticmethod
+    def _build_result(
+        snapshot: catalog.CatalogSnapshot, label: str, confidence: float
+    ) -> IntentResult:
+        intent = catalog.coarse_intent(label)
+        knowledge_domains = None
+        if intent == UserIntent.KNOWLEDGE_QUERY:
+            knowledge_domains = list(snapshot.knowledge_domains(label)) or None
+        return IntentResult(
+            intent=intent, confidence=confidence, knowledge_domains=knowledge_domains, label=label
+        )
+
+    def _softmax(self, similarities: np.ndarray) -> np.ndarray:
+        logits = similarities / self._temperature
+        logits -= logits.max(axis=-1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+    def _descend(
+        self, state: _CentroidState, vector: np.ndarray, position: int, confidence: float
+    ) -> tuple[int, float]:
+        children = state.snapshot.children[position]
+        while children:
+            # Stay (own centroid) or move into one child (its subtree centroid).
+            similarities = np.concatenate(
+                (
+                    state.centroids[position : position + 1] @ vector,
+                    state.subtree_centroids[list(children)] @ vector,
+                )
+            )
+            probabilities = self._softmax(similarities)
+            choice = int(probabilities.argmax())
+            if choice == 0:
+                break
+            confidence *= float(probabilities[choice])
+            position = children[choice - 1]
+            children = state.snapshot.children[position]
+        return position, confidence
+
+    def _results(self, vectors: np.ndarray) -> list[IntentResult]:
+        state = self._current()
+        # Softmax over top-level intents turns similarities into a confidence distribution.
+        probabilities = self._softmax(vectors @ state.root_centroids.T)
+        best = probabilities.argmax(axis=1)
+
+        results = []
+        for row, column in enumerate(best):
+            if not vectors[row].any():
+                results.append(IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.3))
+                continue
+            position = int(state.roots[column])
+            confidence = float(probabilities[row, column])
+            if state.snapshot.hierarchical:
+                position, confidence = self._descend(state, vectors[row], position, confidence)
+            label = state.snapshot.tools[position].tool_id
+            results.append(self._build_result(state.snapshot, label, min(confidence, 1.0)))
+        return results
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        return self._results(self._embedder.embed([ctx.message]))[0]
+
+    def classify_sync(self, ctx: IntentRecognitionContext) -> IntentResult:
+        return self._results(self._embedder.embed([ctx.message]))[0]
+
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult | Exception]:
+        if not contexts:
+            return []
+        return self._results(self._embedder.embed([ctx.message for ctx in contexts]))
+
+
+__all__ = [
+    "EMBEDDING_BACKENDS",
+    "EmbeddingBackend",
+    "EmbeddingIntentRecognizer",
+    "HashedNgramEmbedder",
+    "build_embedder",
+]
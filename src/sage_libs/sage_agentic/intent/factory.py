@@ -2,46 +2,114 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any
 
 from sage_libs.sage_agentic.intent.base import ChainedIntentRecognizer, IntentRecognizer
 from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
 
-# Conditional import for LLMIntentRecognizer (requires isagellm)
-try:
+if TYPE_CHECKING:
+    from sage_libs.sage_agentic.intent.distilled import DistilledIntentRecognizer
+    from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingIntentRecognizer
     from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+    from sage_libs.sage_agentic.intent.metrics import IntentMetrics
+    from sage_libs.sage_agentic.intent.registry import RecognizerRegistry
 
-    RECOGNIZER_BUILDERS = {
-        "llm": LLMIntentRecognizer,
-        "keyword": KeywordIntentRecognizer,
-    }
-except ImportError:
-    # LLM recognizer not available (isagellm not installed)
-    RECOGNIZER_BUILDERS = {
-        "keyword": KeywordIntentRecognizer,
-    }
+
+# Optional backends are imported on first use, so keyword-only users never load
+# openai (LLM) or numpy (embedding). A missing dependency raises ImportError here.
+def _build_llm(**kwargs: Any) -> LLMIntentRecognizer:
+    from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+
+    return LLMIntentRecognizer(**kwargs)
+
+
+def _build_embedding(**kwargs: Any) -> EmbeddingIntentRecognizer:
+    from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingIntentRecognizer
+
+    return EmbeddingIntentRecognizer(**kwargs)
+
+
+def _build_distilled(**kwargs: Any) -> DistilledIntentRecognizer:
+    from sage_libs.sage_agentic.intent.distilled import DistilledIntentRecognizer
+
+    return DistilledIntentRecognizer(**kwargs)
+
+
+RECOGNIZER_BUILDERS: dict[str, Callable[..., IntentRecognizer]] = {
+    "llm": _build_llm,
+    "keyword": KeywordIntentRecognizer,
+    "embedding": _build_embedding,
+    "distilled": _build_distilled,
+}
+
+
+# Modes whose recognizers hold event-loop-bound state (HTTP clients, semaphores,
+# batcher futures). The registry shares them only within one running loop.
+LOOP_BOUND_MODES: frozenset[str] = frozenset({"llm"})
+
+
+def recognizer_kwargs(
+    mode: str, embedding_model: str | None = None, distilled_model: str | None = None
+) -> dict[str, Any]:
+    """Constructor arguments ``build_recognizer_chain`` passes to a mode's builder."""
+    if mode == "embedding":
+        return {"embedding_model": embedding_model}
+    if mode == "distilled":
+        return {"model": distilled_model}
+    return {}
 
 
 def build_recognizer_chain(
     primary_mode: str = "llm",
     fallback_modes: Sequence[str] | None = None,
     min_confidence: float = 0.0,
+    strategy: str = "sequential",
+    hedge_delay: float = 0.05,
+    embedding_model: str | None = None,
+    metrics: IntentMetrics | None = None,
+    registry: RecognizerRegistry | None = None,
+    distilled_model: str | None = None,
 ) -> ChainedIntentRecognizer:
+    """Build a chain trying ``primary_mode`` then each fallback mode.
+
+    An unknown mode raises ``ValueError`` and a backend that fails to build
+    raises its error; no mode is silently left out. With ``registry``,
+    recognizers are acquired from it (shared and reference-counted) instead of
+    constructed.
+
+    ``distilled_model`` is the model file for the ``"distilled"`` mode
+    (default: ``$SAGE_INTENT_DISTILLED_MODEL``). Put it first with a high
+    ``min_confidence`` so only the messages it is unsure about reach the LLM.
+    """
     modes = [primary_mode]
     if fallback_modes:
         modes.extend(fallback_modes)
 
+    unknown = [mode for mode in modes if mode not in RECOGNIZER_BUILDERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown recognizer mode(s) {unknown}, expected one of {sorted(RECOGNIZER_BUILDERS)}"
+        )
+
     recognizers: list[IntentRecognizer] = []
-    for mode in modes:
-        builder = RECOGNIZER_BUILDERS.get(mode)
-        if builder is None:
-            continue
-        try:
-            recognizers.append(builder())
-        except Exception:
-            continue
-
-    if not recognizers:
-        recognizers.append(KeywordIntentRecognizer())
-
-    return ChainedIntentRecognizer(recognizers=recognizers, min_confidence=min_confidence)
+    try:
+        for mode in modes:
+            kwargs = recognizer_kwargs(mode, embedding_model, distilled_model)
+            if registry is not None:
+                recognizers.append(registry.acquire(mode, **kwargs))
+            else:
+                recognizers.append(RECOGNIZER_BUILDERS[mode](**kwargs))
+    except BaseException:
+        if registry is not None:
+            for recognizer in recognizers:
+                registry.discard(recognizer)
+        raise
+
+    return ChainedIntentRecognizer(
+        recognizers=recognizers,
+        min_confidence=min_confidence,
+        strategy=strategy,
+        hedge_delay=hedge_delay,
+        metrics=metrics,
+    )
@@ -2,149 +2,292 @@
 
 from __future__ import annotations
 
-import logging
-from typing import Iterable
+from collections.abc import Callable, Iterable, Sequence
 
 from sage_libs.sage_agentic.intent import catalog
 from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
-from sage_libs.sage_agentic.intent.types import IntentResult, KnowledgeDomain, UserIntent
+from sage_libs.sage_agentic.intent.matcher import KeywordAutomaton
+from sage_libs.sage_agentic.intent.tfidf import catalog_index
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
 
-logger = logging.getLogger(__name__)
+# Heuristic boost: installation/docs/tutorial queries should map to knowledge query.
+KNOWLEDGE_TRIGGERS: tuple[str, ...] = (
+    "安装",
+    "install",
+    "文档",
+    "docs",
+    "documentation",
+    "教程",
+    "guide",
+    "使用",
+    "setup",
+    "配置",
+    "config",
+)
+
+
+KEYWORD_METHODS: tuple[str, ...] = ("count", "tfidf")
+
+
+def _count_score(hits: float) -> float:
+    return min(hits * 0.5, 1.0)
+
+
+class _KeywordTables:
+    """Matching tables for one catalog snapshot; built once per catalog version."""
+
+    __slots__ = ("snapshot", "tools", "trigger_group", "matcher", "vectorizable")
+
+    def __init__(self, snapshot: catalog.CatalogSnapshot) -> None:
+        self.snapshot = snapshot
+        self.tools = snapshot.tools
+        # One automaton for every catalog keyword plus the knowledge triggers
+        # (last group), so a message is scanned exactly once.
+        self.trigger_group = len(self.tools)
+        self.matcher = KeywordAutomaton(
+            [tool.keywords for tool in self.tools] + [KNOWLEDGE_TRIGGERS]
+        )
+        # A flat catalog can be scored as one dense message x intent matrix.
+        self.vectorizable = not snapshot.hierarchical
+
+    def resolve(
+        self,
+        scores: dict[int, float],
+        additive: bool,
+        rank: Callable[[float], float] = float,
+    ) -> int | None:
+        """Pick an intent from per-intent scores, coarse to fine.
+
+        Only intents with a score (and their ancestors) are visited. Each node's
+        subtree score is the sum (``additive``) or max of its own and its
+        descendants' scores. The best root by ``rank(subtree score)`` wins, and
+        the walk descends into the best child while that child ranks at least as
+        high as the current node's own score. Ties go to the earlier catalog entry.
+        """
+        parents = self.snapshot.parents
+        subtree: dict[int, float] = {}
+        for node, value in scores.items():
+            position: int | None = node
+            while position is not None:
+                previous = subtree.get(position, 0.0)
+                subtree[position] = previous + value if additive else max(previous, value)
+                position = parents[position]
+        levels: dict[int | None, list[int]] = {}
+        for position in subtree:
+            levels.setdefault(parents[position], []).append(position)
+
+        def best(candidates: list[int]) -> int:
+            return min(candidates, key=lambda position: (-rank(subtree[position]), position))
+
+        roots = levels.get(None)
+        if not roots:
+            return None
+        node = best(roots)
+        if rank(subtree[node]) <= 0:
+            return None
+        while node in levels:
+            child = best(levels[node])
+            if rank(subtree[child]) <= 0 or rank(subtree[child]) < rank(scores.get(node, 0.0)):
+                break
+            node = child
+        return node
 
 
 class KeywordIntentRecognizer(IntentRecognizer):
-    def __init__(self) -> None:
-        self._selector = None
-        self._initialize_selector()
+    """Catalog keyword recognizer.
+
+    ``method="tfidf"`` (the default) ranks the intents the message names a
+    keyword of with the built-in inverted-index TF-IDF scorer, so a keyword
+    shared by several intents ("pipeline", "RAG", "config") counts for less than
+    a distinctive one. ``method="count"`` ranks them by the number of hits.
+
+    Both report the count-scale confidence of the chosen intent, 0.5 per
+    keyword hit capped at 1.0, which is the scale ``min_confidence`` thresholds
+    and ``is_high_confidence`` are set against. Install/docs triggers give
+    knowledge query at 0.9 and a message without hits is general chat at 0.3.
+
+    Only intents the message actually hits are scored (keyword matches from the
+    automaton, token postings from the index), so cost doesn't grow with the
+    catalog size. Hierarchical catalogs (``system_operation/restart_gateway``)
+    are resolved coarse to fine; results carry the catalog id as ``label``.
+
+    Tables come from the current :class:`~catalog.CatalogSnapshot` on every
+    call, so a recognizer follows :func:`catalog.swap_catalog` without being
+    rebuilt, and one call never mixes two catalog versions.
+    """
+
+    inline = True
+    case_insensitive = True
+
+    def __init__(self, method: str = "tfidf") -> None:
+        if method not in KEYWORD_METHODS:
+            raise ValueError(
+                f"Unknown keyword method {method!r}, expected one of {KEYWORD_METHODS}"
+            )
+        self.method = method
+        # Compile the current catalog's tables now rather than on the first message.
+        tables = self._tables()
+        if method == "tfidf":
+            catalog_index(tables.snapshot)
+
+    @property
+    def cache_key(self) -> tuple[str, str]:
+        return type(self).__qualname__, self.method
 
     @staticmethod
-    def _build_result(intent: UserIntent, confidence: float, matched_keywords: Iterable[str] = ()):  # type: ignore[type-arg]
+    def _tables() -> _KeywordTables:
+        return catalog.current_catalog().derived(_KeywordTables, _KeywordTables)
+
+    @staticmethod
+    def _build_result(
+        tables: _KeywordTables,
+        label: str,
+        confidence: float,
+        matched_keywords: Iterable[str] = (),
+    ) -> IntentResult:
         """Construct an IntentResult with knowledge domain enrichment when applicable."""
+        intent = catalog.coarse_intent(label)
         knowledge_domains = None
         if intent == UserIntent.KNOWLEDGE_QUERY:
-            tool = catalog.get_intent_tool(intent)
-            if tool and tool.knowledge_domains:
-                knowledge_domains = [KnowledgeDomain(d) for d in tool.knowledge_domains]
+            knowledge_domains = list(tables.snapshot.knowledge_domains(label)) or None
 
         return IntentResult(
             intent=intent,
             confidence=confidence,
             knowledge_domains=knowledge_domains,
             matched_keywords=list(matched_keywords),
+            label=label,
         )
 
-    def _initialize_selector(self) -> None:
-        try:
-            from sage_libs.sage_agentic.agents.action.tool_selection import (
-                KeywordSelector,
-                SelectorResources,
-            )
-            from sage_libs.sage_agentic.agents.action.tool_selection.schemas import (
-                KeywordSelectorConfig,
-            )
-
-            tools_loader = catalog.IntentToolsLoader(catalog.INTENT_TOOLS)
-            resources = SelectorResources(tools_loader=tools_loader, embedding_client=None)
-            config = KeywordSelectorConfig(
-                name="intent_keyword",
-                top_k=1,
-                min_score=0.0,
-                method="tfidf",
-                lowercase=True,
-                remove_stopwords=False,
-                ngram_range=(1, 2),
-            )
-            self._selector = KeywordSelector.from_config(config, resources)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Keyword selector unavailable, falling back to simple match: %s", exc)
-            self._selector = None
+    def _build_match(
+        self,
+        tables: _KeywordTables,
+        position: int,
+        confidence: float,
+        matches: dict[int, list[int]],
+    ) -> IntentResult:
+        tool = tables.tools[position]
+        return self._build_result(
+            tables, tool.tool_id, confidence, [tool.keywords[i] for i in matches.get(position, ())]
+        )
 
     async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
-        # Heuristic boost: installation/docs/tutorial queries should map to knowledge query.
-        message_lower = ctx.message.lower()
-        knowledge_triggers = (
-            "安装",
-            "install",
-            "文档",
-            "docs",
-            "documentation",
-            "教程",
-            "guide",
-            "使用",
-            "setup",
-            "配置",
-            "config",
-        )
-        matched_triggers = [kw for kw in knowledge_triggers if kw in message_lower]
-        # If the query mentions SAGE plus any install/docs trigger, force knowledge query.
-        mentions_sage = "sage" in message_lower
-        if (
-            matched_triggers
-            or mentions_sage
-            and any(kw in ctx.message for kw in knowledge_triggers)
-        ):
-            trigger_list = matched_triggers or [
-                kw for kw in knowledge_triggers if kw in ctx.message
-            ]
-            return self._build_result(UserIntent.KNOWLEDGE_QUERY, 0.9, trigger_list)
-
-        if self._selector is None:
-            return self._classify_simple(ctx.message)
-
-        from sage_libs.sage_agentic.agents.action.tool_selection.schemas import ToolSelectionQuery
-
-        query = ToolSelectionQuery(
-            sample_id="intent_classification",
-            instruction=ctx.message,
-            context={"history": ctx.history} if ctx.history else {},
-            candidate_tools=[tool.tool_id for tool in catalog.INTENT_TOOLS],
-        )
-        predictions = self._selector.select(query, top_k=1)
-        if not predictions:
-            return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.3)
+        return self._classify_message(ctx.message)
 
-        top = predictions[0]
-        try:
-            intent = UserIntent(top.tool_id)
-        except ValueError:
-            return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.3)
+    def classify_sync(self, ctx: IntentRecognitionContext) -> IntentResult:
+        return self._classify_message(ctx.message)
 
-        matched_keywords = top.metadata.get("matched_keywords", []) if top.metadata else []
+    def _classify_message(self, message: str, tables: _KeywordTables | None = None) -> IntentResult:
+        tables = tables or self._tables()
+        matches = tables.matcher.match(message.lower())
+        # Any install/docs trigger forces knowledge query. Triggers are lowercase, so
+        # a trigger found in the raw message is always found in the lowercased one too.
+        trigger_indices = matches.get(tables.trigger_group)
+        if trigger_indices:
+            trigger_list = [KNOWLEDGE_TRIGGERS[i] for i in trigger_indices]
+            return self._build_result(tables, UserIntent.KNOWLEDGE_QUERY.value, 0.9, trigger_list)
 
-        return IntentResult(
-            intent=intent,
-            confidence=top.score,
-            knowledge_domains=self._build_result(
-                intent, top.score, matched_keywords
-            ).knowledge_domains,
-            matched_keywords=matched_keywords,
-            raw_prediction=top,
-        )
+        if self.method != "tfidf":
+            return self._classify_simple(message, matches, tables)
+        return self._classify_tfidf(message, matches, tables)
 
-    def _classify_simple(self, message: str) -> IntentResult:
-        message_lower = message.lower()
-        best_intent = UserIntent.GENERAL_CHAT
-        best_score = 0.0
-        matched_keywords: list[str] = []
-
-        for tool in catalog.INTENT_TOOLS:
-            score = 0.0
-            matches = []
-            for keyword in tool.keywords:
-                if keyword.lower() in message_lower:
-                    score += 1.0
-                    matches.append(keyword)
-            normalized_score = min(score * 0.5, 1.0) if tool.keywords else 0.0
-            if normalized_score > best_score:
-                best_score = normalized_score
-                try:
-                    best_intent = UserIntent(tool.tool_id)
-                except ValueError:
-                    continue
-                matched_keywords = matches
+    def _classify_tfidf(
+        self, message: str, matches: dict[int, list[int]], tables: _KeywordTables
+    ) -> IntentResult:
+        # TF-IDF only decides between intents with a keyword hit: a shared token
+        # alone ("是" in "是的") is not evidence for an intent.
+        scores = {
+            position: score
+            for position, score in catalog_index(tables.snapshot).scores(message).items()
+            if position in matches
+        }
+        position = tables.resolve(scores, additive=False) if scores else None
+        if position is None:
+            # Keywords inside longer words share no token with the message.
+            return self._classify_simple(message, matches, tables)
+        hits = float(len(matches.get(position, ())))
+        return self._build_match(tables, position, _count_score(hits), matches)
 
-        return self._build_result(
-            intent=best_intent,
-            confidence=best_score if best_score > 0 else 0.3,
-            matched_keywords=matched_keywords,
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult | Exception]:
+        tables = self._tables()
+        if self.method == "tfidf":
+            return [self._classify_message(ctx.message, tables) for ctx in contexts]
+        return self._classify_simple_batch([ctx.message for ctx in contexts], tables)
+
+    def _classify_simple_batch(
+        self, messages: Sequence[str], tables: _KeywordTables | None = None
+    ) -> list[IntentResult]:
+        """Score a batch as one message x intent count matrix.
+
+        Produces exactly what ``classify`` would for each message with
+        ``method="count"``.
+        """
+        import numpy as np
+
+        tables = tables or self._tables()
+        n_groups = len(tables.tools)
+        results: list[IntentResult | None] = [None] * len(messages)
+        all_matches: list[dict[int, list[int]]] = []
+        rows: list[int] = []
+        cols: list[int] = []
+        for row, message in enumerate(messages):
+            matches = tables.matcher.match(message.lower())
+            all_matches.append(matches)
+            trigger_indices = matches.get(tables.trigger_group)
+            if trigger_indices:
+                results[row] = self._build_result(
+                    tables,
+                    UserIntent.KNOWLEDGE_QUERY.value,
+                    0.9,
+                    [KNOWLEDGE_TRIGGERS[i] for i in trigger_indices],
+                )
+                continue
+            for group, indices in matches.items():
+                if group < n_groups:
+                    rows.extend([row] * len(indices))
+                    cols.extend([group] * len(indices))
+
+        # Sparse (row, intent) keyword hits -> dense counts in a single bincount.
+        flat = np.asarray(rows, dtype=np.int64) * n_groups + np.asarray(cols, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(messages) * n_groups).reshape(
+            len(messages), n_groups
         )
+        scores = np.minimum(counts * 0.5, 1.0)
+        # argmax returns the first maximum, matching the strict ">" tie-break.
+        best_groups = scores.argmax(axis=1) if n_groups else np.zeros(len(messages), int)
+
+        for row, message in enumerate(messages):
+            if results[row] is not None:
+                continue
+            if not tables.vectorizable:
+                results[row] = self._classify_simple(message, all_matches[row], tables)
+                continue
+            group = int(best_groups[row]) if n_groups else 0
+            best_score = float(scores[row, group]) if n_groups else 0.0
+            if best_score > 0:
+                results[row] = self._build_match(tables, group, best_score, all_matches[row])
+            else:
+                results[row] = self._build_result(tables, UserIntent.GENERAL_CHAT.value, 0.3)
+        return results  # type: ignore[return-value]
+
+    def _classify_simple(
+        self,
+        message: str,
+        matches: dict[int, list[int]] | None = None,
+        tables: _KeywordTables | None = None,
+    ) -> IntentResult:
+        tables = tables or self._tables()
+        if matches is None:
+            matches = tables.matcher.match(message.lower())
+        # Only intents with at least one keyword hit are scored.
+        hits = {
+            group: float(len(indices))
+            for group, indices in matches.items()
+            if group < tables.trigger_group
+        }
+        position = tables.resolve(hits, additive=True, rank=_count_score)
+        if position is None:
+            return self._build_result(tables, UserIntent.GENERAL_CHAT.value, 0.3)
+        return self._build_match(tables, position, _count_score(hits[position]), matches)
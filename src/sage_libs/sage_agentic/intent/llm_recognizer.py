@@ -3,89 +3,547 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import Optional
-
-import openai
+import math
+import re
+import threading
+from collections.abc import Sequence
+from typing import Any
 
 from sage.common.config.ports import SagePorts
-from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+
+from sage_libs.sage_agentic.intent.base import (
+    IntentRecognitionContext,
+    IntentRecognizer,
+    gather_bounded,
+)
+from sage_libs.sage_agentic.intent.batching import MicroBatcher, MicroBatchStats
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker, CircuitOpenError
 from sage_libs.sage_agentic.intent.types import IntentResult, KnowledgeDomain, UserIntent
 
 logger = logging.getLogger(__name__)
 
+_INTENT_DEFINITIONS = (
+    "Available intents:\n"
+    "- knowledge_query: Questions requiring knowledge base search (SAGE docs, research papers, examples)\n"
+    "- sage_coding: SAGE framework programming tasks (pipeline generation, debugging, API usage)\n"
+    "- system_operation: System management (start/stop services, check status)\n"
+    "- general_chat: General conversation or unrelated topics\n\n"
+)
+
+# "3: sage_coding", "[3] sage_coding", "3) sage_coding", ...
+_NUMBERED_LABEL = re.compile(r"^\s*\[?(\d+)\]?\s*[:.)\-]?\s*(.+?)\s*$")
+_INTENTS_BY_NAME: dict[str, UserIntent] = {intent.value: intent for intent in UserIntent}
+
+LLM_SCORING_MODES: tuple[str, ...] = ("text", "logprobs")
+
+# One-letter labels encode as a single token in common tokenizers.
+_LOGPROB_LABELS: dict[str, UserIntent] = {
+    "K": UserIntent.KNOWLEDGE_QUERY,
+    "C": UserIntent.SAGE_CODING,
+    "S": UserIntent.SYSTEM_OPERATION,
+    "G": UserIntent.GENERAL_CHAT,
+}
+
+# Built once and sent unchanged as the system turn, so gateways with prefix
+# caching reuse it across calls; only the user turn varies.
+_LOGPROB_SYSTEM_PROMPT = (
+    "You are an intent classifier for the SAGE AI framework.\n"
+    "Classify the user's message into one of the following intents.\n\n"
+    "Available intents:\n"
+    "- K: knowledge_query: Questions requiring knowledge base search (SAGE docs, research papers, examples)\n"
+    "- C: sage_coding: SAGE framework programming tasks (pipeline generation, debugging, API usage)\n"
+    "- S: system_operation: System management (start/stop services, check status)\n"
+    "- G: general_chat: General conversation or unrelated topics\n\n"
+    "Answer with the single letter of the intent (K, C, S or G) and nothing else."
+)
+
+
+class _LoopClients:
+    """Gateway client, concurrency limit and micro-batcher bound to one event loop."""
+
+    __slots__ = ("loop", "async_client", "semaphore", "batcher", "probe")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        async_client: Any,
+        semaphore: asyncio.Semaphore,
+        batcher: MicroBatcher[str, IntentResult] | None,
+    ) -> None:
+        self.loop = loop
+        self.async_client = async_client
+        self.semaphore = semaphore
+        self.batcher = batcher
+        # Pending background circuit probe (timer, then task), see _on_circuit_change.
+        self.probe: asyncio.TimerHandle | asyncio.Task | None = None
+
+    def cancel_probe(self) -> None:
+        if self.probe is not None:
+            self.probe.cancel()
+            self.probe = None
+
 
 class LLMIntentRecognizer(IntentRecognizer):
-    def __init__(self, control_plane_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        control_plane_url: str | None = None,
+        max_concurrency: int = 16,
+        use_async_client: bool = True,
+        pool_size: int | None = None,
+        timeout: float = 30.0,
+        micro_batch: bool = False,
+        max_batch_size: int = 16,
+        batch_window_ms: float = 10.0,
+        log_raw_output: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        scoring: str = "text",
+        top_logprobs: int = 10,
+        return_scores: bool = False,
+        max_loops: int = 4,
+        background_probe: bool = True,
+    ) -> None:
+        if scoring not in LLM_SCORING_MODES:
+            raise ValueError(f"Unknown scoring {scoring!r}, expected one of {LLM_SCORING_MODES}")
+        if scoring == "logprobs" and micro_batch:
+            raise ValueError("micro_batch needs scoring='text'; logprob scoring is per message")
         self._client = None
+        self._use_async_client = use_async_client
+        # The async client, semaphore and batcher bind to the loop that uses them,
+        # so each event loop gets its own (``max_concurrency`` is per loop). At
+        # most ``max_loops`` are kept, the oldest dropped first.
+        self._loops: dict[asyncio.AbstractEventLoop, _LoopClients] = {}
+        self._max_loops = max(max_loops, 1)
+        self._loops_lock = threading.Lock()
+        self._max_concurrency = max_concurrency
+        self._pool_size = pool_size or max_concurrency
+        self._timeout = timeout
+        # Diagnostic logging of raw LLM replies; off so the hot path formats nothing.
+        self._log_raw_output = log_raw_output
+        # "logprobs": one label token, confidence from its normalized top logprobs.
+        self.scoring = scoring
+        self._top_logprobs = top_logprobs
+        self._return_scores = return_scores
+        # Fails calls fast while the gateway is unhealthy; see CircuitBreaker.
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # While the circuit is open, probe the gateway once it may go half-open,
+        # so recovery doesn't wait for (and cost) the next real request.
+        self._background_probe = background_probe
+        self.circuit_breaker.add_listener(self._on_circuit_change)
         self._control_plane_url = (
             control_plane_url or f"http://localhost:{SagePorts.GATEWAY_DEFAULT}/v1"
         )
-        self._initialize_client()
+        # Opt-in: concurrent classify() calls share one numbered multi-message prompt.
+        self._micro_batch = micro_batch
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window_ms / 1000
+        # Shared by the per-loop batchers.
+        self._batch_stats = MicroBatchStats()
 
-    def _initialize_client(self) -> None:
-        try:
-            # Use OpenAI-compatible client to access Gateway
-            self._client = openai.OpenAI(
-                base_url=self._control_plane_url,
-                api_key="dummy",  # Gateway doesn't require real API key
-                timeout=30.0,  # 30 second timeout to prevent hanging
-                max_retries=0  # Disable retries for faster failure
+    @property
+    def cache_key(self) -> tuple:
+        return (
+            type(self).__qualname__,
+            self._control_plane_url,
+            self.scoring,
+            self._top_logprobs,
+            self._return_scores,
+            self._micro_batch,
+        )
+
+    @property
+    def batch_stats(self) -> dict[str, float] | None:
+        """Achieved batch sizes and queueing latency, when micro-batching is on."""
+        return self._batch_stats.as_dict() if self._micro_batch else None
+
+    def warmup(self) -> None:
+        """Import openai and build the sync gateway client now rather than on first use.
+
+        The async client is per event loop and is built on the first call there.
+        """
+        import openai  # noqa: F401
+
+        if not self._use_async_client:
+            self._sync_client()
+
+    def _sync_client(self) -> Any:
+        """The thread-safe sync client, shared by every loop; importing openai is the slow part."""
+        if self._client is None:
+            with self._loops_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _clients(self) -> _LoopClients:
+        """Clients for the running event loop, built on first use there."""
+        loop = asyncio.get_running_loop()
+        clients = self._loops.get(loop)
+        if clients is not None:
+            return clients
+        if not self._use_async_client:
+            self._sync_client()
+        with self._loops_lock:
+            clients = self._loops.get(loop)
+            if clients is not None:
+                return clients
+            for other in [other for other in self._loops if other.is_closed()]:
+                self._retire(self._loops.pop(other))
+            while len(self._loops) >= self._max_loops:
+                self._retire(self._loops.pop(next(iter(self._loops))))
+            batcher = None
+            if self._micro_batch:
+                batcher = MicroBatcher(
+                    self._classify_many,
+                    max_batch_size=self._max_batch_size,
+                    window=self._batch_window,
+                    stats=self._batch_stats,
+                )
+            clients = self._loops[loop] = _LoopClients(
+                loop,
+                self._build_async_client() if self._use_async_client else None,
+                asyncio.Semaphore(self._max_concurrency),
+                batcher,
             )
-            logger.info(f"LLM Intent client initialized with Gateway: {self._control_plane_url}")
+        return clients
+
+    @staticmethod
+    def _retire(clients: _LoopClients) -> None:
+        """Close a dropped loop's client on that loop, if it is still running.
+
+        A closed loop can run nothing, so its pooled connections are left to
+        the garbage collector.
+        """
+        if clients.loop.is_closed() or not clients.loop.is_running():
+            return
+        clients.loop.call_soon_threadsafe(clients.cancel_probe)
+        if clients.async_client is not None:
+            asyncio.run_coroutine_threadsafe(clients.async_client.close(), clients.loop)
+
+    def _on_circuit_change(self, old: str, new: str) -> None:
+        """Schedule a background probe when the circuit opens.
+
+        Runs on whichever thread recorded the call. The probe goes out on the
+        most recently used running loop after ``open_seconds``; a failed probe
+        reopens the circuit, which schedules the next one.
+        """
+        if new != "open" or not self._background_probe:
+            return
+        with self._loops_lock:
+            live = [clients for clients in self._loops.values() if clients.loop.is_running()]
+        if not live:
+            return
+        clients = live[-1]
+        try:
+            clients.loop.call_soon_threadsafe(self._schedule_probe, clients)
+        except RuntimeError:  # the loop closed in between
+            pass
+
+    def _schedule_probe(self, clients: _LoopClients) -> None:
+        clients.cancel_probe()
+
+        def start() -> None:
+            clients.probe = clients.loop.create_task(self._probe(clients))
+
+        clients.probe = clients.loop.call_later(self.circuit_breaker.open_seconds, start)
+
+    async def _probe(self, clients: _LoopClients) -> None:
+        try:
+            probe = self.circuit_breaker.acquire()
+        except CircuitOpenError:
+            return  # a request is already probing, or the circuit reopened
+        request = {
+            "model": "",
+            "messages": [{"role": "user", "content": "ping"}],
+            "max_tokens": 1,
+            "temperature": 0.01,
+        }
+        try:
+            await self._send(clients, request, probe)
         except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to initialize LLM client for intent: %s", exc)
+            logger.debug("LLM gateway probe failed: %s", exc)
+        finally:
+            if clients.probe is asyncio.current_task():
+                clients.probe = None
+
+    def _build_async_client(self) -> Any:
+        import openai
+
+        # openai's default HTTP client with a keep-alive pool sized to the
+        # concurrency limit, so calls reuse connections. Limits comes from the
+        # HTTP library openai is built on.
+        limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=self._pool_size,
+            max_keepalive_connections=self._pool_size,
+        )
+        client = openai.AsyncOpenAI(
+            base_url=self._control_plane_url,
+            api_key="dummy",  # Gateway doesn't require real API key
+            timeout=self._timeout,
+            max_retries=0,  # Disable retries for faster failure
+            http_client=openai.DefaultAsyncHttpxClient(limits=limits, timeout=self._timeout),
+        )
+        logger.info(
+            "LLM Intent async client initialized with Gateway: %s (pool=%d)",
+            self._control_plane_url,
+            self._pool_size,
+        )
+        return client
+
+    def _build_client(self) -> Any:
+        import openai
+
+        # Use OpenAI-compatible client to access Gateway
+        client = openai.OpenAI(
+            base_url=self._control_plane_url,
+            api_key="dummy",  # Gateway doesn't require real API key
+            timeout=self._timeout,  # Timeout to prevent hanging
+            max_retries=0,  # Disable retries for faster failure
+        )
+        logger.info(f"LLM Intent client initialized with Gateway: {self._control_plane_url}")
+        return client
+
+    async def aclose(self) -> None:
+        """Close pooled connections held by the gateway clients."""
+        with self._loops_lock:
+            loops = list(self._loops.values())
+            self._loops.clear()
+        running = asyncio.get_running_loop()
+        for clients in loops:
+            if clients.loop is not running:
+                self._retire(clients)
+                continue
+            clients.cancel_probe()
+            if clients.async_client is not None:
+                await clients.async_client.close()
+        if self._client is not None:
+            self._client.close()
             self._client = None
 
+    async def classify_batch(
+        self, contexts: Sequence[IntentRecognitionContext]
+    ) -> list[IntentResult | Exception]:
+        return await gather_bounded(self.classify, contexts, limit=self._max_concurrency)
+
+    async def _complete(self, prompt: str, max_tokens: int = 50) -> str:
+        choice = await self._request(
+            {
+                "model": "",  # Gateway routes automatically
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": 0.01,  # Min positive value (Gateway requires > 0)
+            }
+        )
+        return choice.message.content
+
+    async def _request(self, request: dict) -> Any:
+        """Send one chat completion request and return its first choice."""
+        # Admission happens before queueing for a slot, so an open circuit fails
+        # immediately; only the gateway call itself is timed.
+        clients = self._clients()
+        probe = self.circuit_breaker.acquire()
+        admitted = False
+        try:
+            async with clients.semaphore:
+                admitted = True
+                return await self._send(clients, request, probe)
+        except asyncio.CancelledError:
+            if not admitted:
+                self.circuit_breaker.release(probe)
+            raise
+
+    async def _send(self, clients: _LoopClients, request: dict, probe: bool) -> Any:
+        if clients.async_client is not None:
+
+            async def _call_llm_async() -> Any:
+                response = await clients.async_client.chat.completions.create(**request)
+                return response.choices[0]
+
+            return await self.circuit_breaker.call(_call_llm_async, probe)
+
+        # Sync fallback: each in-flight call holds one executor thread. The breaker
+        # times the call inside that thread, so waiting for a free thread under
+        # load never counts as a slow gateway.
+        loop = asyncio.get_running_loop()
+        started = False
+
+        def _call_llm():
+            nonlocal started
+            started = True
+            response = self._client.chat.completions.create(**request)
+            return response.choices[0]
+
+        try:
+            return await loop.run_in_executor(
+                None, self.circuit_breaker.call_sync, _call_llm, probe
+            )
+        except asyncio.CancelledError:
+            # Cancelled while still queued: the call never ran, so nothing was recorded.
+            if not started:
+                self.circuit_breaker.release(probe)
+            raise
+
+    @staticmethod
+    def _match_intent(content: str) -> UserIntent | None:
+        normalized = content.replace(" ", "_")
+        for intent in UserIntent:
+            if intent.value in content or intent.value in normalized:
+                return intent
+        return None
+
+    @staticmethod
+    def _build_result(
+        intent: UserIntent,
+        confidence: float = 0.9,
+        scores: dict[UserIntent, float] | None = None,
+    ) -> IntentResult:
+        knowledge_domains = None
+        if intent == UserIntent.KNOWLEDGE_QUERY:
+            knowledge_domains = [KnowledgeDomain.SAGE_DOCS, KnowledgeDomain.EXAMPLES]
+        return IntentResult(
+            intent=intent,
+            confidence=confidence,
+            knowledge_domains=knowledge_domains,
+            matched_keywords=[],
+            scores=scores,
+        )
+
+    @staticmethod
+    def _label_scores(choice: Any) -> dict[UserIntent, float] | None:
+        """Normalize the top logprobs of the first token over the intent labels.
+
+        Variants of a label (``" K"``, ``"k"``) add up. Returns None when the
+        gateway sent no logprobs or none of the top tokens is a label.
+        """
+        logprobs = getattr(choice, "logprobs", None)
+        content = getattr(logprobs, "content", None)
+        if not content:
+            return None
+        mass = dict.fromkeys(_LOGPROB_LABELS.values(), 0.0)
+        for candidate in content[0].top_logprobs or ():
+            intent = _LOGPROB_LABELS.get(candidate.token.strip().upper())
+            if intent is not None:
+                mass[intent] += math.exp(candidate.logprob)
+        total = sum(mass.values())
+        if total <= 0:
+            return None
+        return {intent: p / total for intent, p in mass.items()}
+
     async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
-        if self._client is None:
-            raise RuntimeError("LLM client not available")
+        batcher = self._clients().batcher
+        if batcher is not None:
+            return await batcher.submit(ctx.message)
+        if self.scoring == "logprobs":
+            return await self._score_one(ctx.message)
+        return await self._classify_one(ctx.message)
+
+    async def _score_one(self, message: str) -> IntentResult:
+        """Classify with one label token and read confidence off its logprobs."""
+        choice = await self._request(
+            {
+                "model": "",  # Gateway routes automatically
+                "messages": [
+                    {"role": "system", "content": _LOGPROB_SYSTEM_PROMPT},
+                    {"role": "user", "content": message},
+                ],
+                "max_tokens": 1,
+                "temperature": 0.01,  # Min positive value (Gateway requires > 0)
+                "logprobs": True,
+                "top_logprobs": self._top_logprobs,
+            }
+        )
+        if self._log_raw_output:
+            logger.info("[LLM Intent] Raw LLM output: %r", choice.message.content)
 
+        scores = self._label_scores(choice)
+        if scores is not None:
+            intent = max(scores, key=scores.__getitem__)
+            return self._build_result(
+                intent, scores[intent], scores if self._return_scores else None
+            )
+
+        # No usable logprobs (e.g. the gateway ignores the option): use the token itself.
+        content = (choice.message.content or "").strip()
+        intent = _LOGPROB_LABELS.get(content.upper()) or self._match_intent(content.lower())
+        if intent is not None:
+            return self._build_result(intent)
+        logger.warning(
+            "LLM output '%s' did not match intents, falling back to low confidence", content
+        )
+        return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.3)
+
+    async def _classify_one(self, message: str) -> IntentResult:
         prompt = (
             "You are an intent classifier for the SAGE AI framework.\n"
             "Classify the user's message into one of the following intents.\n\n"
-            "Available intents:\n"
-            "- knowledge_query: Questions requiring knowledge base search (SAGE docs, research papers, examples)\n"
-            "- sage_coding: SAGE framework programming tasks (pipeline generation, debugging, API usage)\n"
-            "- system_operation: System management (start/stop services, check status)\n"
-            "- general_chat: General conversation or unrelated topics\n\n"
-            f"User message: \"{ctx.message}\"\n\n"
+            + _INTENT_DEFINITIONS
+            + f"User message: \"{message}\"\n\n"
             "Return ONLY the intent name in lowercase (e.g., knowledge_query). Do not return numbers or explanations."
         )
 
-        # Use OpenAI chat completions API
-        loop = asyncio.get_running_loop()
-        def _call_llm():
-            response = self._client.chat.completions.create(
-                model="",  # Gateway routes automatically
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=50,
-                temperature=0.01  # Min positive value (Gateway requires > 0)
-            )
-            return response.choices[0].message.content
-
-        response = await loop.run_in_executor(None, _call_llm)
+        response = await self._complete(prompt)
 
         content = response.strip().lower()
-        normalized = content.replace(" ", "_")
-        
-        # **Diagnostic logging**
-        logger.info(f"[LLM Intent] Raw LLM output: '{response}'")
-        logger.info(f"[LLM Intent] Normalized: '{normalized}'")
 
-        for intent in UserIntent:
-            if intent.value in content or intent.value in normalized:
-                knowledge_domains = None
-                if intent == UserIntent.KNOWLEDGE_QUERY:
-                    knowledge_domains = [KnowledgeDomain.SAGE_DOCS, KnowledgeDomain.EXAMPLES]
-                return IntentResult(
-                    intent=intent,
-                    confidence=0.9,
-                    knowledge_domains=knowledge_domains,
-                    matched_keywords=[],
-                )
+        if self._log_raw_output:
+            logger.info("[LLM Intent] Raw LLM output: %r", response)
+            logger.info("[LLM Intent] Normalized: %r", content.replace(" ", "_"))
+
+        intent = self._match_intent(content)
+        if intent is not None:
+            return self._build_result(intent)
 
         logger.warning(
             "LLM output '%s' did not match intents, falling back to low confidence", content
         )
         return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.3)
+
+    async def _classify_many(self, messages: Sequence[str]) -> list[IntentResult | Exception]:
+        """Classify a micro-batch with one numbered prompt.
+
+        Each message is a JSON string on its own line, so newlines or
+        ``N: <label>`` text inside a message can't add lines for other callers.
+        An answer counts only if its line is a listed number and a whole intent
+        name; items with no answer, or with more than one, are retried one by one.
+        """
+        if len(messages) == 1:
+            return await gather_bounded(self._classify_one, messages, limit=1)
+
+        numbered = "".join(
+            f"{i}. {json.dumps(message, ensure_ascii=False)}\n"
+            for i, message in enumerate(messages, start=1)
+        )
+        prompt = (
+            "You are an intent classifier for the SAGE AI framework.\n"
+            "Classify each numbered user message into one of the following intents.\n\n"
+            + _INTENT_DEFINITIONS
+            + "User messages (JSON strings):\n"
+            + f"{numbered}\n"
+            "Return exactly one line per message in the form '<number>: <intent>', "
+            "using the intent name in lowercase. Do not add explanations."
+        )
+        response = await self._complete(prompt, max_tokens=8 * len(messages) + 16)
+
+        answers: list[set[UserIntent]] = [set() for _ in messages]
+        for line in response.strip().lower().splitlines():
+            match = _NUMBERED_LABEL.match(line)
+            if match is None:
+                continue
+            index = int(match.group(1)) - 1
+            intent = _INTENTS_BY_NAME.get(match.group(2).strip("'\"`.").replace(" ", "_"))
+            if 0 <= index < len(messages) and intent is not None:
+                answers[index].add(intent)
+        results: list[IntentResult | Exception | None] = [
+            self._build_result(next(iter(labels))) if len(labels) == 1 else None
+            for labels in answers
+        ]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            self._batch_stats.retried += len(missing)
+            retried = await gather_bounded(
+                self._classify_one, [messages[i] for i in missing], limit=len(missing)
+            )
+            for index, result in zip(missing, retried):
+                results[index] = result
+        return results  # type: ignore[return-value]
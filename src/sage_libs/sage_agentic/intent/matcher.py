@@ -0,0 +1,136 @@
+"""Aho-Corasick keyword matcher for intent catalogs."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """A single keyword occurrence found by :class:`KeywordAutomaton`."""
+
+    group: int
+    index: int
+    keyword: str
+    start: int
+
+
+class KeywordAutomaton:
+    """Case-insensitive multi-pattern matcher compiled once from keyword groups.
+
+    Each group is a sequence of keywords (typically one group per ``IntentTool``).
+    Matching is a single linear pass over the lowercased message; every keyword
+    is reported with its group, its index inside the group and its position.
+    Substring semantics are identical to ``keyword.lower() in message.lower()``.
+    """
+
+    def __init__(self, groups: Sequence[Sequence[str]]) -> None:
+        self._groups = [list(keywords) for keywords in groups]
+        patterns: dict[str, int] = {}
+        # pattern id -> [(group, index), ...] and pattern id -> pattern length
+        self._targets: list[list[tuple[int, int]]] = []
+        self._lengths: list[int] = []
+        for group, keywords in enumerate(self._groups):
+            for index, keyword in enumerate(keywords):
+                pattern = keyword.lower()
+                pid = patterns.get(pattern)
+                if pid is None:
+                    pid = patterns[pattern] = len(self._targets)
+                    self._targets.append([])
+                    self._lengths.append(len(pattern))
+                self._targets[pid].append((group, index))
+
+        # The empty string is a substring of every message.
+        self._always = tuple(pid for pattern, pid in patterns.items() if not pattern)
+        self._delta, self._output = self._compile(
+            [pattern for pattern in patterns if pattern], patterns
+        )
+
+    @staticmethod
+    def _compile(
+        patterns: list[str], ids: dict[str, int]
+    ) -> tuple[list[dict[str, int]], list[tuple[int, ...]]]:
+        goto: list[dict[str, int]] = [{}]
+        output: list[tuple[int, ...]] = [()]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    output.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            output[state] = output[state] + (ids[pattern],)
+
+        # Breadth-first failure links, then fold them into a deterministic
+        # transition table so the scan never walks failure chains.
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                output[nxt] = output[nxt] + output[fail[nxt]]
+                queue.append(nxt)
+        return delta, output
+
+    @property
+    def groups(self) -> list[list[str]]:
+        return self._groups
+
+    def _scan(self, text: str) -> dict[int, int]:
+        """Return ``{pattern id: end offset of first occurrence}``."""
+        delta = self._delta
+        output = self._output
+        first: dict[int, int] = {}
+        state = 0
+        for pos, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if output[state] and state not in first:
+                first[state] = pos
+        found = {pid: -1 for pid in self._always}
+        for state, pos in first.items():
+            for pid in output[state]:
+                found.setdefault(pid, pos)
+        return found
+
+    def match(self, text: str) -> dict[int, list[int]]:
+        """Return matched keyword indices per group, in keyword-list order.
+
+        ``text`` must already be lowercased.
+        """
+        matched: dict[int, list[int]] = {}
+        for pid in self._scan(text):
+            for group, index in self._targets[pid]:
+                matched.setdefault(group, []).append(index)
+        for indices in matched.values():
+            indices.sort()
+        return matched
+
+    def iter_matches(self, text: str) -> Iterator[KeywordHit]:
+        """Yield every keyword occurrence in ``text`` (already lowercased)."""
+        for pid in self._always:
+            for group, index in self._targets[pid]:
+                yield KeywordHit(group, index, self._groups[group][index], 0)
+        delta = self._delta
+        output = self._output
+        state = 0
+        for pos, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for pid in output[state]:
+                start = pos - self._lengths[pid] + 1
+                for group, index in self._targets[pid]:
+                    yield KeywordHit(group, index, self._groups[group][index], start)
+
+    def __len__(self) -> int:  # pragma: no cover - trivial
+        return len(self._targets)
+
+
+__all__ = ["KeywordAutomaton", "KeywordHit"]
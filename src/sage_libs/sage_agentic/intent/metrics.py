@@ -0,0 +1,294 @@
+"""Zero-dependency in-memory metrics with Prometheus text exposition."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from sage_libs.sage_agentic.intent.types import IntentResult
+
+if TYPE_CHECKING:
+    from sage_libs.sage_agentic.intent.circuit import CircuitBreaker
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+CONFIDENCE_BUCKETS: tuple[float, ...] = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def expose(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def sum(self, *labelvalues: str) -> float:
+        series = self._series.get(labelvalues)
+        return series[1] if series else 0.0
+
+    def expose(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames, labelvalues, f'le="{_format_value(bound)}"'
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Get-or-create registry of counters and histograms."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind:
+                    raise ValueError(
+                        f"Metric {metric.name!r} already registered as {existing.kind}"
+                    )
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class IntentMetrics:
+    """Per-recognizer instrumentation recorded by ``ChainedIntentRecognizer``."""
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.latency = self.registry.histogram(
+            "intent_recognizer_latency_seconds",
+            "Latency of a single recognizer call.",
+            ("recognizer",),
+        )
+        self.errors = self.registry.counter(
+            "intent_recognizer_errors_total",
+            "Recognizer calls that raised.",
+            ("recognizer",),
+        )
+        self.fallbacks = self.registry.counter(
+            "intent_recognizer_fallbacks_total",
+            "Times the chain moved past a recognizer.",
+            ("recognizer", "reason"),
+        )
+        self.confidence = self.registry.histogram(
+            "intent_recognizer_confidence",
+            "Confidence of recognizer results.",
+            ("recognizer",),
+            CONFIDENCE_BUCKETS,
+        )
+        self.chosen = self.registry.counter(
+            "intent_chosen_total",
+            "Intents returned by the chain, by the recognizer that produced them.",
+            ("recognizer", "intent"),
+        )
+        self.circuit_transitions = self.registry.counter(
+            "intent_circuit_transitions_total",
+            "Circuit breaker state changes, by the state entered.",
+            ("recognizer", "state"),
+        )
+        self.coalesced = self.registry.counter(
+            "intent_coalesced_total",
+            "Classifications that awaited an identical in-flight call instead of their own.",
+        )
+        self.shadow = self.registry.counter(
+            "intent_shadow_total",
+            "Shadow evaluations by outcome (agree, disagree, dropped, failed, timeout).",
+            ("outcome",),
+        )
+        self.shadow_latency = self.registry.histogram(
+            "intent_shadow_latency_seconds",
+            "Latency of shadow recognizer calls.",
+        )
+        # Watched breakers: their listener and how many watchers asked for it.
+        self._watched: dict[CircuitBreaker, tuple[Callable[[str, str], None], int]] = {}
+        self._watch_lock = threading.Lock()
+
+    def observe_result(self, recognizer: str, seconds: float, result: IntentResult) -> None:
+        self.latency.observe(seconds, recognizer)
+        self.confidence.observe(result.confidence, recognizer)
+
+    def observe_error(self, recognizer: str, seconds: float) -> None:
+        self.latency.observe(seconds, recognizer)
+        self.errors.inc(recognizer)
+
+    def observe_fallback(self, recognizer: str, reason: str) -> None:
+        self.fallbacks.inc(recognizer, reason)
+
+    def observe_chosen(self, recognizer: str, result: IntentResult) -> None:
+        self.chosen.inc(recognizer, result.intent.value)
+
+    def observe_circuit_transition(self, recognizer: str, old: str, new: str) -> None:
+        self.circuit_transitions.inc(recognizer, new)
+
+    def observe_coalesced(self) -> None:
+        self.coalesced.inc()
+
+    def observe_shadow(self, outcome: str, seconds: float | None = None) -> None:
+        self.shadow.inc(outcome)
+        if seconds is not None:
+            self.shadow_latency.observe(seconds)
+
+    def watch_circuit(self, recognizer: str, breaker: CircuitBreaker) -> None:
+        """Count ``breaker``'s state changes under ``recognizer``.
+
+        Watching a breaker again (e.g. from classifiers sharing a recognizer)
+        doesn't count its changes twice; each call is undone by
+        :meth:`unwatch_circuit`.
+        """
+        with self._watch_lock:
+            listener, watchers = self._watched.get(breaker, (None, 0))
+            if listener is None:
+
+                def listener(old: str, new: str) -> None:
+                    self.observe_circuit_transition(recognizer, old, new)
+
+                breaker.add_listener(listener)
+            self._watched[breaker] = (listener, watchers + 1)
+
+    def unwatch_circuit(self, breaker: CircuitBreaker) -> None:
+        with self._watch_lock:
+            entry = self._watched.get(breaker)
+            if entry is None:
+                return
+            listener, watchers = entry
+            if watchers > 1:
+                self._watched[breaker] = (listener, watchers - 1)
+                return
+            del self._watched[breaker]
+        breaker.remove_listener(listener)
+
+    def to_prometheus(self) -> str:
+        return self.registry.to_prometheus()
+
+
+__all__ = [
+    "CONFIDENCE_BUCKETS",
+    "Counter",
+    "Histogram",
+    "IntentMetrics",
+    "LATENCY_BUCKETS",
+    "MetricsRegistry",
+]
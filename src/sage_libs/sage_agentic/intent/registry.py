@@ -0,0 +1,156 @@
+"""Process-wide registry of shared, compiled recognizers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from sage_libs.sage_agentic.intent.base import IntentRecognizer
+from sage_libs.sage_agentic.intent.factory import (
+    LOOP_BOUND_MODES,
+    RECOGNIZER_BUILDERS,
+    recognizer_kwargs,
+)
+
+
+class _Entry:
+    __slots__ = ("recognizer", "refs")
+
+    def __init__(self, recognizer: IntentRecognizer) -> None:
+        self.recognizer = recognizer
+        self.refs = 0
+
+
+class RecognizerRegistry:
+    """Hand out one shared recognizer per ``(mode, config)``.
+
+    Recognizers only read shared state (keyword automaton, TF-IDF index,
+    embedding centroids), so any number of classifiers can share one. Every
+    :meth:`acquire` must be paired with a :meth:`release`; the last release
+    drops the entry and closes the recognizer's clients (``aclose``). Catalog
+    changes don't need a new recognizer: each one picks up the current
+    :class:`~catalog.CatalogSnapshot` per call.
+
+    Modes in :data:`~factory.LOOP_BOUND_MODES` (the LLM recognizer) hold HTTP
+    clients, semaphores and batcher futures bound to an event loop, so they are
+    keyed by the loop running at :meth:`acquire` as well: classifiers built in
+    the same loop share one, classifiers built in different loops don't.
+    Acquired outside a loop they share one instance, which keeps its clients
+    per loop internally. Per-chain state such as latency estimates lives on
+    :class:`~base.ChainedIntentRecognizer`, never on a shared recognizer.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, _Entry] = {}
+        self._keys: dict[int, Hashable] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    @staticmethod
+    def make_key(mode: str, config: dict[str, Any]) -> Hashable:
+        key = (mode, tuple(sorted(config.items())))
+        if mode not in LOOP_BOUND_MODES:
+            return key
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        return (*key, loop)
+
+    def acquire(self, mode: str, **config: Any) -> IntentRecognizer:
+        """Return the shared recognizer for ``mode`` and ``config``, building it once."""
+        builder = RECOGNIZER_BUILDERS.get(mode)
+        if builder is None:
+            raise ValueError(f"Unknown recognizer mode {mode!r}")
+        key = self.make_key(mode, config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(builder(**config))
+                self._keys[id(entry.recognizer)] = key
+                self.builds += 1
+            entry.refs += 1
+            return entry.recognizer
+
+    async def release(self, recognizer: IntentRecognizer) -> None:
+        """Drop one reference; the last one closes the recognizer's clients."""
+        if self._drop(recognizer):
+            await _close(recognizer)
+
+    def discard(self, recognizer: IntentRecognizer) -> None:
+        """Drop one reference without closing anything, for a recognizer never used."""
+        self._drop(recognizer)
+
+    def _drop(self, recognizer: IntentRecognizer) -> bool:
+        """Drop one reference; returns whether it was the last."""
+        with self._lock:
+            key = self._keys.get(id(recognizer))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry.recognizer is not recognizer:
+                return False
+            entry.refs -= 1
+            if entry.refs > 0:
+                return False
+            del self._entries[key]
+            del self._keys[id(recognizer)]
+            return True
+
+    def warmup(
+        self,
+        modes: Iterable[str],
+        embedding_model: str | None = None,
+        distilled_model: str | None = None,
+    ) -> list[IntentRecognizer]:
+        """Build recognizers ahead of the first request.
+
+        The registry keeps one reference to each, so they stay compiled until
+        :meth:`aclose`. Recognizers with a ``warmup()`` method (the LLM client)
+        are asked to prepare their clients too; loop-bound ones are warmed for
+        the loop running now, so call this where the classifiers are built.
+        """
+        warmed = []
+        for mode in modes:
+            recognizer = self.acquire(
+                mode, **recognizer_kwargs(mode, embedding_model, distilled_model)
+            )
+            warm = getattr(recognizer, "warmup", None)
+            if warm is not None:
+                warm()
+            warmed.append(recognizer)
+        return warmed
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "references": sum(entry.refs for entry in self._entries.values()),
+                "builds": self.builds,
+            }
+
+    async def aclose(self) -> None:
+        """Close and forget every recognizer, whatever its reference count."""
+        with self._lock:
+            recognizers = [entry.recognizer for entry in self._entries.values()]
+            self._entries.clear()
+            self._keys.clear()
+        for recognizer in recognizers:
+            await _close(recognizer)
+
+
+async def _close(recognizer: IntentRecognizer) -> None:
+    close = getattr(recognizer, "aclose", None)
+    if close is not None:
+        await close()
+
+
+_default_registry = RecognizerRegistry()
+
+
+def default_registry() -> RecognizerRegistry:
+    """The registry shared by every ``IntentClassifier`` in the process."""
+    return _default_registry
+
+
+__all__ = ["RecognizerRegistry", "default_registry"]
@@ -0,0 +1,304 @@
+"""Offline bulk relabeling of JSONL chat logs with the keyword recognizer.
+
+Streams JSONL (plain or gzip) input, classifies each line's message in a
+process pool and appends one JSON result per input line, in input order::
+
+    sage-intent-relabel logs.jsonl.gz labels.jsonl.gz --field message --workers 8
+
+Progress is checkpointed next to the output (``<output>.ckpt``); rerunning the
+same command after an interruption resumes where the last checkpoint left off.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import IO
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.catalog import catalog_fingerprint
+from sage_libs.sage_agentic.intent.keyword_recognizer import (
+    KEYWORD_METHODS,
+    KeywordIntentRecognizer,
+)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Per-process state set up once by _init_worker.
+_worker: tuple[KeywordIntentRecognizer, str, str | None, str] | None = None
+
+
+@dataclass
+class RelabelStats:
+    lines: int = 0
+    errors: int = 0
+    resumed_from: int = 0
+    seconds: float = 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+
+def open_input(path: str) -> IO[bytes]:
+    """Open ``path`` for binary line reading, decompressing gzip by content."""
+    raw = open(path, "rb")
+    if raw.peek(2)[:2] == _GZIP_MAGIC:  # type: ignore[attr-defined]
+        return gzip.GzipFile(fileobj=raw)  # type: ignore[return-value]
+    return raw
+
+
+def _init_worker(method: str, field: str, id_field: str | None) -> None:
+    global _worker
+    _worker = (KeywordIntentRecognizer(method=method), field, id_field, catalog_fingerprint())
+
+
+def relabel_chunk(lines: Sequence[bytes], first_line: int) -> tuple[bytes, int]:
+    """Classify raw JSONL lines; returns the output lines and the error count.
+
+    Blank lines are skipped. Lines that are not JSON objects with a string
+    message field produce an ``error`` record carrying their line number.
+    """
+    assert _worker is not None, "relabel_chunk called outside an initialized worker"
+    recognizer, field, id_field, fingerprint = _worker
+    out: list[str] = []
+    errors = 0
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        record: dict[str, object] = {"line": number}
+        try:
+            item = json.loads(line)
+            message = item[field]
+            if not isinstance(message, str):
+                raise TypeError(f"{field!r} is {type(message).__name__}, not str")
+            if id_field is not None:
+                record["id"] = item.get(id_field)
+            result = recognizer.classify_sync(IntentRecognitionContext(message=message))
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            errors += 1
+            record["error"] = f"{type(exc).__name__}: {exc}"
+        else:
+            record["intent"] = result.intent.value
+            record["label"] = result.label
+            record["confidence"] = result.confidence
+            record["matched_keywords"] = result.matched_keywords
+            record["catalog_version"] = fingerprint
+        out.append(json.dumps(record, ensure_ascii=False))
+    return ("\n".join(out) + "\n").encode("utf-8") if out else b"", errors
+
+
+def _chunks(lines: Iterator[bytes], size: int, first_line: int) -> Iterator[tuple[list, int]]:
+    chunk: list[bytes] = []
+    start = first_line
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk, start
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield chunk, start
+
+
+class _Checkpoint:
+    """Lines done and output bytes durably written, stored as JSON next to the output."""
+
+    def __init__(self, output: str, identity: dict[str, object]) -> None:
+        self.path = output + ".ckpt"
+        self.identity = identity
+
+    def load(self) -> tuple[int, int] | None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get("identity") != self.identity:
+            raise ValueError(
+                f"Checkpoint {self.path} was written for {state.get('identity')}; "
+                "rerun with --restart to start over"
+            )
+        return state["lines"], state["output_bytes"]
+
+    def save(self, lines: int, output_bytes: int) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"identity": self.identity, "lines": lines, "output_bytes": output_bytes}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def relabel(
+    input_path: str,
+    output_path: str,
+    field: str = "message",
+    id_field: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 2000,
+    checkpoint_every: int = 200_000,
+    method: str = "tfidf",
+    restart: bool = False,
+    progress_interval: float = 10.0,
+    log: IO[str] | None = sys.stderr,
+) -> RelabelStats:
+    """Relabel ``input_path`` into ``output_path``; see the module docstring.
+
+    Output ending in ``.gz`` is written as one gzip member per checkpoint, so a
+    resumed run can truncate to the last checkpoint and keep appending. Line
+    numbers in the output are 1-based physical input lines.
+    """
+    if method not in KEYWORD_METHODS:
+        raise ValueError(f"Unknown keyword method {method!r}, expected one of {KEYWORD_METHODS}")
+    workers = workers or os.cpu_count() or 1
+    compress = output_path.endswith(".gz")
+    checkpoint = _Checkpoint(
+        output_path,
+        {
+            "input": os.path.abspath(input_path),
+            "field": field,
+            "id_field": id_field,
+            "method": method,
+            "catalog": catalog_fingerprint(),
+        },
+    )
+    if restart:
+        checkpoint.remove()
+    state = checkpoint.load()
+    done, written = state if state is not None else (0, 0)
+    if state is not None and (
+        not os.path.exists(output_path) or os.path.getsize(output_path) < written
+    ):
+        raise ValueError(
+            f"{output_path} is shorter than its checkpoint; rerun with --restart to start over"
+        )
+    stats = RelabelStats(resumed_from=done)
+
+    pending_out: list[bytes] = []
+    pending_lines = 0
+    started = last_report = time.perf_counter()
+
+    def report(final: bool = False) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if log is None or (not final and now - last_report < progress_interval):
+            return
+        last_report = now
+        rate = stats.lines / (now - started) if now > started else 0.0
+        log.write(
+            f"{'done' if final else 'progress'}: {done} lines "
+            f"({stats.errors} errors), {rate:,.0f} lines/s"
+            + (f", resumed from line {stats.resumed_from}" if stats.resumed_from else "")
+            + "\n"
+        )
+        log.flush()
+
+    with open_input(input_path) as source, open(output_path, "r+b" if state else "wb") as sink:
+        sink.truncate(written)
+        sink.seek(written)
+
+        def flush() -> None:
+            nonlocal pending_lines, written
+            if not pending_lines:
+                return
+            data = b"".join(pending_out)
+            sink.write(gzip.compress(data) if compress else data)
+            sink.flush()
+            os.fsync(sink.fileno())
+            written = sink.tell()
+            pending_out.clear()
+            pending_lines = 0
+            checkpoint.save(done, written)
+
+        def collect(data: bytes, errors: int, count: int) -> None:
+            nonlocal done, pending_lines
+            pending_out.append(data)
+            pending_lines += count
+            done += count
+            stats.lines += count
+            stats.errors += errors
+            if pending_lines >= checkpoint_every:
+                flush()
+            report()
+
+        lines = iter(source)
+        for _ in range(done):
+            if next(lines, None) is None:
+                break
+        chunks = _chunks(lines, chunk_size, done + 1)
+
+        if workers == 1:
+            _init_worker(method, field, id_field)
+            for chunk, first in chunks:
+                collect(*relabel_chunk(chunk, first), len(chunk))
+        else:
+            context = multiprocessing.get_context()
+            with context.Pool(workers, _init_worker, (method, field, id_field)) as pool:
+                # Bounded window of in-flight chunks: reading never runs far ahead of
+                # the workers and results are written in input order.
+                in_flight: deque = deque()
+                for chunk, first in chunks:
+                    in_flight.append((len(chunk), pool.apply_async(relabel_chunk, (chunk, first))))
+                    if len(in_flight) >= 4 * workers:
+                        count, result = in_flight.popleft()
+                        collect(*result.get(), count)
+                while in_flight:
+                    count, result = in_flight.popleft()
+                    collect(*result.get(), count)
+        flush()
+    checkpoint.remove()
+    stats.seconds = time.perf_counter() - started
+    report(final=True)
+    return stats
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sage-intent-relabel",
+        description="Relabel JSONL chat logs with the keyword intent recognizer.",
+    )
+    parser.add_argument("input", help="JSONL input, optionally gzip-compressed")
+    parser.add_argument("output", help="JSONL output; gzip-compressed if it ends in .gz")
+    parser.add_argument("--field", default="message", help="message field (default: message)")
+    parser.add_argument("--id-field", help="field copied to the output as 'id'")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="lines per task")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=200_000, help="lines between checkpoints"
+    )
+    parser.add_argument("--method", choices=KEYWORD_METHODS, default="tfidf")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    try:
+        relabel(
+            args.input,
+            args.output,
+            field=args.field,
+            id_field=args.id_field,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            checkpoint_every=args.checkpoint_every,
+            method=args.method,
+            restart=args.restart,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
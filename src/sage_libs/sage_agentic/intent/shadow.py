@@ -0,0 +1,259 @@
+"""Shadow evaluation: compare a candidate recognizer with live traffic off the request path.
+
+``IntentClassifier(shadow=ShadowEvaluator(candidate))`` returns the primary
+chain's result as usual; a sampled share of messages is then classified by
+``candidate`` on the shared background loop and the two results compared::
+
+    shadow = ShadowEvaluator(LLMIntentRecognizer(...), sample_rate=0.05)
+    classifier = IntentClassifier(shadow=shadow)
+    ...
+    shadow.stats()                      # agreement, confusion, latency
+    shadow.export_disagreements("disagreements.jsonl")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import IO, Any
+
+from sage_libs.sage_agentic.intent.background import BackgroundLoop, background_loop
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.metrics import IntentMetrics
+from sage_libs.sage_agentic.intent.types import IntentResult
+
+SHADOW_OUTCOMES = ("agree", "disagree", "dropped", "failed", "timeout")
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ShadowEvaluator:
+    """Sampled, bounded, fire-and-forget comparison of ``recognizer`` with the primary.
+
+    :meth:`offer` never blocks and never raises: it samples ``sample_rate`` of
+    the messages and hands them to the background loop, dropping them once
+    ``max_pending`` are queued or running. At most ``concurrency`` shadow calls
+    run at a time, each cut off after ``timeout`` seconds; failures and
+    timeouts are only counted. Results are compared by ``label`` (the catalog
+    id, e.g. ``sage_coding``).
+
+    The recognizer only ever runs on the background loop, so don't share an
+    LLM recognizer (whose client binds to its loop) with a classifier.
+    """
+
+    def __init__(
+        self,
+        recognizer: IntentRecognizer,
+        sample_rate: float = 0.05,
+        max_pending: int = 256,
+        concurrency: int = 4,
+        timeout: float | None = 10.0,
+        max_disagreements: int = 1000,
+        latency_window: int = 4096,
+        metrics: IntentMetrics | None = None,
+        loop: BackgroundLoop | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        if max_pending < 1 or concurrency < 1:
+            raise ValueError("max_pending and concurrency must be >= 1")
+        self.recognizer = recognizer
+        self.name = recognizer.__class__.__name__
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.metrics = metrics
+        self._loop = loop or background_loop()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        self._pending = 0
+        self.offered = 0
+        self.sampled = 0
+        self.outcomes = dict.fromkeys(SHADOW_OUTCOMES, 0)
+        # (primary label, shadow label) -> count
+        self._confusion: dict[tuple[str, str], int] = {}
+        self._primary_seconds: deque[float] = deque(maxlen=latency_window)
+        self._shadow_seconds: deque[float] = deque(maxlen=latency_window)
+        self._disagreements: deque[dict[str, Any]] = deque(maxlen=max_disagreements)
+
+    def offer(
+        self, ctx: IntentRecognitionContext, primary: IntentResult, primary_seconds: float
+    ) -> bool:
+        """Maybe schedule a shadow classification of ``ctx``; returns whether it was queued."""
+        queued = False
+        try:
+            with self._lock:
+                self.offered += 1
+                if self._random.random() >= self.sample_rate:
+                    return False
+                self.sampled += 1
+                if self._pending >= self.max_pending:
+                    self._count("dropped")
+                    return False
+                self._pending += 1
+                queued = True
+            # Copy what is compared now; the caller owns ``primary`` and may mutate it.
+            coro = self._evaluate(
+                IntentRecognitionContext(message=ctx.message, history=ctx.history, extra=ctx.extra),
+                primary.label or primary.intent.value,
+                primary.confidence,
+                primary_seconds,
+            )
+            try:
+                asyncio.run_coroutine_threadsafe(coro, self._loop.loop)
+            except BaseException:
+                coro.close()
+                raise
+            return True
+        except Exception:  # noqa: BLE001
+            if queued:
+                with self._lock:
+                    self._pending -= 1
+                    self._count("failed")
+                    self._idle.notify_all()
+            return False
+
+    def _count(self, outcome: str, seconds: float | None = None) -> None:
+        # Called with the lock held.
+        self.outcomes[outcome] += 1
+        if self.metrics is not None:
+            self.metrics.observe_shadow(outcome, seconds)
+
+    async def _evaluate(
+        self,
+        ctx: IntentRecognitionContext,
+        primary_label: str,
+        primary_confidence: float,
+        primary_seconds: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            # One per background loop; a forked child runs a new one.
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        started = time.perf_counter()
+        result: IntentResult | None = None
+        outcome = "failed"
+        cancelled = False
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                result = await asyncio.wait_for(self.recognizer.classify(ctx), self.timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except asyncio.CancelledError:
+            # The background loop is shutting down; still release the slot.
+            cancelled = True
+        except Exception:  # noqa: BLE001
+            outcome = "failed"
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            if result is None:
+                self._count(outcome)
+            else:
+                label = result.label or result.intent.value
+                agree = label == primary_label
+                self._count("agree" if agree else "disagree", seconds)
+                pair = (primary_label, label)
+                self._confusion[pair] = self._confusion.get(pair, 0) + 1
+                self._primary_seconds.append(primary_seconds)
+                self._shadow_seconds.append(seconds)
+                if not agree:
+                    self._disagreements.append(
+                        {
+                            "message": ctx.message,
+                            "primary": primary_label,
+                            "primary_confidence": primary_confidence,
+                            "shadow": label,
+                            "shadow_confidence": result.confidence,
+                            "primary_ms": primary_seconds * 1000,
+                            "shadow_ms": seconds * 1000,
+                        }
+                    )
+            self._idle.notify_all()
+        if cancelled:
+            raise asyncio.CancelledError
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until no shadow call is queued or running; returns ``False`` on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def confusion(self) -> dict[str, dict[str, int]]:
+        """``{primary label: {shadow label: count}}`` over compared messages."""
+        with self._lock:
+            matrix: dict[str, dict[str, int]] = {}
+            for (primary, shadow), count in self._confusion.items():
+                matrix.setdefault(primary, {})[shadow] = count
+            return matrix
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            compared = self.outcomes["agree"] + self.outcomes["disagree"]
+            primary = list(self._primary_seconds)
+            shadow = list(self._shadow_seconds)
+            stats: dict[str, Any] = {
+                "recognizer": self.name,
+                "offered": self.offered,
+                "sampled": self.sampled,
+                "pending": self._pending,
+                "outcomes": dict(self.outcomes),
+                "compared": compared,
+                "agreement_rate": self.outcomes["agree"] / compared if compared else None,
+            }
+        differences = [s - p for p, s in zip(primary, shadow)]
+        stats["latency_ms"] = {
+            name: {
+                "p50": _ms(_percentile(values, 0.5)),
+                "p95": _ms(_percentile(values, 0.95)),
+                "mean": _ms(sum(values) / len(values) if values else None),
+            }
+            for name, values in (
+                ("primary", primary),
+                ("shadow", shadow),
+                ("shadow_minus_primary", differences),
+            )
+        }
+        stats["confusion"] = self.confusion()
+        return stats
+
+    def disagreements(self) -> list[dict[str, Any]]:
+        """The most recent disagreements, oldest first."""
+        with self._lock:
+            return list(self._disagreements)
+
+    def export_disagreements(self, target: str | IO[str]) -> int:
+        """Write the kept disagreements as JSONL to a path or text file; returns the count."""
+        records = self.disagreements()
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8") as f:
+                return self.export_disagreements(f)
+        for record in records:
+            target.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(records)
+
+
+def _ms(seconds: float | None) -> float | None:
+    return seconds * 1000 if seconds is not None else None
+
+
+__all__ = ["SHADOW_OUTCOMES", "ShadowEvaluator"]
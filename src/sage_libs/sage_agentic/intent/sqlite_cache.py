@@ -0,0 +1,237 @@
+"""Host-wide persistent intent result cache backed by SQLite in WAL mode."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Hashable
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.cache import normalize_message
+from sage_libs.sage_agentic.intent.types import IntentResult, KnowledgeDomain, UserIntent
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS intent_results (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def dump_result(result: IntentResult) -> str:
+    """Serialize the cacheable fields of a result; ``raw_prediction`` is dropped."""
+    return json.dumps(
+        [
+            result.intent.value,
+            result.confidence,
+            [d.value for d in result.knowledge_domains]
+            if result.knowledge_domains is not None
+            else None,
+            result.matched_keywords,
+            result.trace,
+            {i.value: p for i, p in result.scores.items()} if result.scores is not None else None,
+            result.label,
+            {d.value: p for d, p in result.domain_scores.items()}
+            if result.domain_scores is not None
+            else None,
+        ],
+        ensure_ascii=False,
+    )
+
+
+def load_result(value: str) -> IntentResult:
+    intent, confidence, domains, matched_keywords, trace, *rest = json.loads(value)
+    # Rows written by older versions lack the trailing fields.
+    scores, label, domain_scores = (rest + [None] * 3)[:3]
+    return IntentResult(
+        intent=UserIntent(intent),
+        confidence=confidence,
+        knowledge_domains=[KnowledgeDomain(d) for d in domains] if domains is not None else None,
+        matched_keywords=matched_keywords,
+        trace=trace,
+        scores={UserIntent(i): p for i, p in scores.items()} if scores is not None else None,
+        label=label,
+        domain_scores=(
+            {KnowledgeDomain(d): p for d, p in domain_scores.items()}
+            if domain_scores is not None
+            else None
+        ),
+    )
+
+
+class SQLiteResultCache:
+    """Result cache in one SQLite file shared by every worker process on a host.
+
+    Keys are digests of ``catalog_fingerprint()``, the classifier configuration
+    (``mode``, see :class:`~cache.ResultCache`), the normalized message and
+    optionally the last ``history_turns`` turns, so a catalog, model or
+    settings change never serves stale results, across restarts too.
+    Rows older than ``ttl`` seconds are ignored. Once the table grows past
+    ``max_entries`` the oldest writes are evicted. Size is checked every
+    ``evict_interval`` writes, so reads never write.
+
+    Each thread of each process opens its own connection (reopened after
+    ``fork``). SQLite errors such as a lock held past ``timeout`` count as
+    misses and skipped writes, never as classification failures.
+
+    A hit costs about as much as a keyword classification and a miss plus
+    put about four times as much (``benchmarks/bench_sqlite_cache.py``), so
+    use it in front of LLM or other slow recognizers, not keyword-only chains.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_entries: int = 100_000,
+        ttl: float | None = 86_400.0,
+        history_turns: int = 0,
+        timeout: float = 0.05,
+        evict_interval: int = 256,
+        mmap_size: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.history_turns = history_turns
+        self.timeout = timeout
+        self.evict_interval = evict_interval
+        self.mmap_size = mmap_size
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.errors = 0
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def make_key(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None = None,
+        mode: Hashable = None,
+    ) -> bytes:
+        turns: tuple = ()
+        if self.history_turns and history:
+            turns = tuple(
+                (turn.get("role", ""), turn.get("content", ""))
+                for turn in history[-self.history_turns :]
+            )
+        material = repr((catalog.catalog_fingerprint(), mode, normalize_message(message), turns))
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: Hashable) -> IntentResult | None:
+        try:
+            row = (
+                self._connection()
+                .execute("SELECT value, expires_at FROM intent_results WHERE key = ?", (key,))
+                .fetchone()
+            )
+        except sqlite3.Error as exc:
+            self._error("read", exc)
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        value, expires_at = row
+        if expires_at < self._clock():
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return load_result(value)
+
+    def put(self, key: Hashable, result: IntentResult) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO intent_results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, dump_result(result), expires_at),
+            )
+            with self._lock:
+                self._writes += 1
+                due = self._writes % self.evict_interval == 0
+            if due:
+                self._evict(conn)
+        except sqlite3.Error as exc:
+            self._error("write", exc)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = conn.execute(
+                "DELETE FROM intent_results WHERE expires_at < ?", (self._clock(),)
+            ).rowcount
+            (size,) = conn.execute("SELECT count(*) FROM intent_results").fetchone()
+            excess = size - self.max_entries
+            if excess > 0:
+                # REPLACE gives a row a new rowid, so rowid order is write order.
+                excess = conn.execute(
+                    "DELETE FROM intent_results WHERE rowid IN "
+                    "(SELECT rowid FROM intent_results ORDER BY rowid LIMIT ?)",
+                    (excess,),
+                ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.expirations += expired
+        self.evictions += max(excess, 0)
+
+    def _error(self, operation: str, exc: sqlite3.Error) -> None:
+        self.errors += 1
+        logger.debug("Intent cache %s failed on %s: %s", operation, self.path, exc)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM intent_results")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors,
+        }
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        (size,) = self._connection().execute("SELECT count(*) FROM intent_results").fetchone()
+        return size
+
+
+__all__ = ["SQLiteResultCache", "dump_result", "load_result"]
@@ -0,0 +1,121 @@
+"""Inverted-index TF-IDF scorer over the intent catalog."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.catalog import IntentTool
+
+_LATIN = re.compile(r"[a-z0-9]+")
+_CJK = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize(text: str, ngram_range: tuple[int, int] = (1, 2)) -> list[str]:
+    """Split text into Latin word n-grams and CJK character n-grams.
+
+    Latin runs are lowercased words joined by a space (``"knowledge base"``);
+    CJK runs have no word boundaries, so every character n-gram inside a run
+    is a token (``"帮我写"`` -> ``"帮", "我", "写", "帮我", "我写"``).
+    """
+    text = text.lower()
+    low, high = ngram_range
+    tokens: list[str] = []
+    words = _LATIN.findall(text)
+    for n in range(low, high + 1):
+        tokens.extend(" ".join(words[i : i + n]) for i in range(len(words) - n + 1))
+    for run in _CJK.findall(text):
+        for n in range(low, high + 1):
+            tokens.extend(run[i : i + n] for i in range(len(run) - n + 1))
+    return tokens
+
+
+def tool_document(tool: IntentTool) -> str:
+    """The text an intent is indexed by: its keywords.
+
+    Names, descriptions and capabilities are prose; their filler words ("me",
+    "the", "是") outvote real keyword hits on short messages.
+    """
+    return "\n".join(tool.keywords)
+
+
+class TfidfIntentIndex:
+    """Cosine TF-IDF scorer backed by a token -> ``(intent, weight)`` inverted index.
+
+    Document vectors use sublinear term frequency and smoothed IDF and are
+    L2-normalized when the index is built, so scoring a message only walks the
+    postings of the tokens it contains.
+    """
+
+    def __init__(self, documents: Sequence[str], ngram_range: tuple[int, int] = (1, 2)) -> None:
+        self.ngram_range = ngram_range
+        self.size = len(documents)
+        term_counts = [Counter(tokenize(doc, ngram_range)) for doc in documents]
+        document_frequency: Counter[str] = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        self._idf = {
+            token: math.log((1 + self.size) / (1 + df)) + 1.0
+            for token, df in document_frequency.items()
+        }
+        # Tokens never seen in the catalog still count towards the query norm.
+        self._unseen_idf = math.log(1 + self.size) + 1.0
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        for doc, counts in enumerate(term_counts):
+            weights = {
+                token: (1.0 + math.log(tf)) * self._idf[token] for token, tf in counts.items()
+            }
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for token, weight in weights.items():
+                self._postings.setdefault(token, []).append((doc, weight / norm))
+
+    @classmethod
+    def from_tools(
+        cls, tools: Sequence[IntentTool], ngram_range: tuple[int, int] = (1, 2)
+    ) -> TfidfIntentIndex:
+        return cls([tool_document(tool) for tool in tools], ngram_range)
+
+    def scores(self, text: str) -> dict[int, float]:
+        """Cosine similarity of ``text`` to every document sharing a token with it."""
+        counts = Counter(tokenize(text, self.ngram_range))
+        if not counts:
+            return {}
+        scores: dict[int, float] = {}
+        query_norm = 0.0
+        for token, tf in counts.items():
+            postings = self._postings.get(token)
+            weight = (1.0 + math.log(tf)) * self._idf.get(token, self._unseen_idf)
+            query_norm += weight * weight
+            if postings is None:
+                continue
+            for doc, doc_weight in postings:
+                scores[doc] = scores.get(doc, 0.0) + weight * doc_weight
+        query_norm = math.sqrt(query_norm)
+        return {doc: score / query_norm for doc, score in scores.items()}
+
+    def best(self, text: str) -> tuple[int, float] | None:
+        """Highest-scoring document and its score; the lowest index wins ties."""
+        scores = self.scores(text)
+        if not scores:
+            return None
+        return max(sorted(scores.items()), key=lambda item: item[1])
+
+
+def _build_catalog_index(snapshot: catalog.CatalogSnapshot) -> TfidfIntentIndex:
+    return TfidfIntentIndex.from_tools(snapshot.tools)
+
+
+def catalog_index(snapshot: catalog.CatalogSnapshot | None = None) -> TfidfIntentIndex:
+    """Index over a catalog snapshot (the current one by default), built once per version.
+
+    Document ``i`` is ``snapshot.tools[i]``.
+    """
+    snapshot = snapshot or catalog.current_catalog()
+    return snapshot.derived(_build_catalog_index, _build_catalog_index)
+
+
+__all__ = ["TfidfIntentIndex", "catalog_index", "tokenize", "tool_document"]
@@ -38,10 +38,19 @@ class IntentResult:
     matched_keywords: list[str] = field(default_factory=list)
     raw_prediction: ToolPrediction | None = None
     trace: list[str] = field(default_factory=list)
+    # Normalized probability per intent, when the recognizer produces one.
+    scores: dict[UserIntent, float] | None = None
+    # Fine-grained catalog intent id, e.g. ``system_operation/restart_gateway``;
+    # ``intent`` is its top-level UserIntent. Defaults to ``intent.value``.
+    label: str | None = None
+    # Score per candidate knowledge domain when a DomainRouter picked the domains.
+    domain_scores: dict[KnowledgeDomain, float] | None = None
 
     def __post_init__(self) -> None:
         if not 0 <= self.confidence <= 1:
             raise ValueError(f"Confidence must be between 0 and 1, got {self.confidence}")
+        if self.label is None:
+            self.label = self.intent.value
 
     def should_search_knowledge(self) -> bool:
         return self.intent == UserIntent.KNOWLEDGE_QUERY
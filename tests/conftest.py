@@ -0,0 +1,15 @@
+"""Shared fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+from sage_libs.sage_agentic.intent import catalog
+
+
+@pytest.fixture
+def restore_catalog():  # type: ignore[no-untyped-def]
+    """Put the process-wide intent catalog back after a test swaps or edits it."""
+    original = catalog.current_catalog()
+    yield original
+    catalog.swap_catalog(original)
@@ -0,0 +1,163 @@
+"""Local fake OpenAI-compatible gateway for tests and benchmarks.
+
+Speaks just enough of ``POST /v1/chat/completions`` (keep-alive HTTP/1.1,
+numbered micro-batch prompts, top logprobs) to exercise
+``LLMIntentRecognizer`` end to end without a real model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+
+# Single-token labels the logprob scoring prompt asks for.
+LABEL_TOKENS = {
+    "knowledge_query": "K",
+    "sage_coding": "C",
+    "system_operation": "S",
+    "general_chat": "G",
+}
+
+
+class FakeGateway:
+    """Minimal HTTP/1.1 keep-alive server speaking /v1/chat/completions.
+
+    Requests with ``logprobs`` get top logprobs for the first token: ``label``
+    and its whitespace variant hold ``probability`` of the mass and the rest is
+    spread over the other labels and one non-label token.
+    """
+
+    def __init__(
+        self, latency: float = 0.05, label: str = "general_chat", probability: float = 0.8
+    ) -> None:
+        self.latency = latency
+        self.label = label
+        self.probability = probability
+        self.requests = 0
+        self.prompt_chars = 0
+        self.max_tokens = 0
+        self.system_prompts: set[str] = set()
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Set to e.g. 503 to answer every request with that error status.
+        self.status = 200
+        self._server: asyncio.AbstractServer | None = None
+        self._handlers: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=4096)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._handlers.values())
+            for writer in list(self._handlers):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def completion(self, request: dict) -> dict:
+        prompt = request["messages"][-1]["content"]
+        content = self.label
+        if "User messages (JSON strings):\n" in prompt:
+            # Numbered micro-batch prompt: answer one "<n>: <label>" line per message.
+            listed = prompt.split("User messages (JSON strings):\n", 1)[1].split("\n\n", 1)[0]
+            count = len(listed.splitlines())
+            content = "\n".join(f"{i}: {self.label}" for i in range(1, count + 1))
+        self.prompt_chars += sum(len(m["content"]) for m in request["messages"])
+        self.max_tokens += request.get("max_tokens") or 0
+        self.system_prompts.update(
+            m["content"] for m in request["messages"] if m["role"] == "system"
+        )
+        choice = {
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }
+        if request.get("logprobs"):
+            token = LABEL_TOKENS[self.label]
+            choice["message"]["content"] = token
+            choice["finish_reason"] = "length"
+            choice["logprobs"] = {"content": [self.token_logprobs(token, request)]}
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request.get("model") or "fake",
+            "choices": [choice],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    @property
+    def _rest(self) -> float:
+        """Mass of each other top token; " G" counts towards the answer's ``probability``."""
+        return (1 - self.probability) / len(LABEL_TOKENS)
+
+    @property
+    def expected_confidence(self) -> float:
+        """``probability`` renormalized over label tokens (the "I" mass drops out)."""
+        return self.probability / (1 - self._rest)
+
+    def token_logprobs(self, token: str, request: dict) -> dict:
+        others = [t for t in LABEL_TOKENS.values() if t != token]
+        rest = self._rest
+        # " G" is the same label with a leading space; "I" is not a label at all.
+        candidates = [(token, self.probability - rest), (f" {token}", rest), ("I", rest)]
+        candidates += [(other, rest) for other in others]
+        candidates.sort(key=lambda c: -c[1])
+        top = [
+            {"token": t, "logprob": math.log(p), "bytes": list(t.encode())}
+            for t, p in candidates[: request.get("top_logprobs") or 0]
+        ]
+        return {
+            "token": token,
+            "logprob": top[0]["logprob"] if top else 0.0,
+            "bytes": list(token.encode()),
+            "top_logprobs": top,
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._handlers[writer] = asyncio.current_task()  # type: ignore[assignment]
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b"{}"
+
+                self.requests += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                await asyncio.sleep(self.latency)
+                self.in_flight -= 1
+
+                if self.status == 200:
+                    payload = json.dumps(self.completion(json.loads(body))).encode()
+                else:
+                    error = {"message": "fake gateway error", "type": "server_error"}
+                    payload = json.dumps({"error": error}).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.status} {'OK' if self.status == 200 else 'Error'}\r\n".encode()
+                    + b"Content-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            self._handlers.pop(writer, None)
+            writer.close()
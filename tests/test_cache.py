@@ -0,0 +1,150 @@
+"""Result cache: LRU/TTL, copies, catalog invalidation, and what goes into keys."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from sage_libs.sage_agentic.intent import DomainRouter, IntentClassifier, catalog
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.distilled import DistilledModel, HashedFeatures
+from sage_libs.sage_agentic.intent.registry import RecognizerRegistry
+from sage_libs.sage_agentic.intent.sqlite_cache import SQLiteResultCache
+
+LABELS = ["general_chat", "sage_coding"]
+
+
+def _model(bias: list[float]) -> DistilledModel:
+    features = HashedFeatures(dim=64)
+    return DistilledModel(np.zeros((64, 2)), np.asarray(bias), LABELS, features=features)
+
+
+def test_lru_and_ttl() -> None:
+    now = [0.0]
+    cache = IntentResultCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    classifier = IntentClassifier(cache=cache)
+    classifier.classify_sync("hi")
+    classifier.classify_sync(" HI ")
+    classifier.classify_sync("how to install sage")
+    classifier.classify_sync("restart")
+    assert cache.stats() == {
+        "size": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 1,
+        "expirations": 0,
+        "invalidations": 0,
+    }
+    now[0] = 20
+    classifier.classify_sync("restart")
+    assert (cache.misses, cache.expirations) == (4, 1)
+
+
+def test_case_is_folded_only_for_case_insensitive_chains(tmp_path) -> None:
+    path = str(tmp_path / "model.npz")
+    _model([1.0, 0.0]).save(path)
+    classifiers = {
+        "keyword": IntentClassifier(cache=IntentResultCache()),
+        "keyword+embedding router": IntentClassifier(
+            cache=IntentResultCache(), domain_router=DomainRouter(embedding_model="hashed")
+        ),
+        "distilled": IntentClassifier(
+            mode="distilled",
+            distilled_model=path,
+            cache=IntentResultCache(),
+            registry=RecognizerRegistry(),
+        ),
+    }
+    for name, classifier in classifiers.items():
+        for message in ("stop", "STOP", " stop "):
+            classifier.classify_sync(message)
+        expected_hits = 2 if name == "keyword" else 1
+        assert classifier.cache.hits == expected_hits, name
+
+
+def test_results_are_copied_in_and_out() -> None:
+    classifier = IntentClassifier(cache=IntentResultCache())
+    first = classifier.classify_sync("restart the gateway")
+    first.trace.append("mutated")
+    second = classifier.classify_sync("restart the gateway")
+    assert "mutated" not in second.trace
+    second.trace.append("mutated")
+    assert "mutated" not in classifier.classify_sync("restart the gateway").trace
+
+
+def test_catalog_change_invalidates_entries() -> None:
+    cache = IntentResultCache()
+    classifier = IntentClassifier(cache=cache)
+    classifier.classify_sync("restart")
+    catalog.bump_catalog_version()
+    classifier.classify_sync("restart")
+    assert (cache.hits, cache.invalidations) == (0, 1)
+
+
+def test_min_confidence_is_part_of_the_key(tmp_path) -> None:
+    cache = SQLiteResultCache(tmp_path / "cache.sqlite3")
+    # The keyword answer (below 0.99) is accepted by one and falls back in the other.
+    lenient = IntentClassifier(fallback_modes=["embedding"], cache=cache, min_confidence=0.0)
+    strict = IntentClassifier(fallback_modes=["embedding"], cache=cache, min_confidence=0.99)
+
+    first = lenient.classify_sync("tell me a joke")
+    second = strict.classify_sync("tell me a joke")
+
+    assert len(first.trace) == 1
+    assert second.trace[0] == first.trace[0]
+    assert second.trace[1].startswith("EmbeddingIntentRecognizer:")
+    assert cache.stats()["hits"] == 0
+
+
+def test_context_is_part_of_the_key() -> None:
+    cache = IntentResultCache()
+    classifier = IntentClassifier(cache=cache)
+    classifier.classify_sync("restart the gateway", context="a")
+    classifier.classify_sync("restart the gateway", context="b")
+    classifier.classify_sync("restart the gateway", context="a")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_retrained_distilled_model_misses_the_cache(tmp_path) -> None:
+    path = str(tmp_path / "model.npz")
+    cache = SQLiteResultCache(tmp_path / "cache.sqlite3")
+
+    def classify() -> str:
+        classifier = IntentClassifier(
+            mode="distilled", distilled_model=path, cache=cache, registry=RecognizerRegistry()
+        )
+        return classifier.classify_sync("hello").label
+
+    _model([1.0, 0.0]).save(path)
+    assert classify() == "general_chat"
+    _model([0.0, 1.0]).save(path)
+    assert classify() == "sage_coding"
+    assert cache.stats()["hits"] == 0
+
+
+def test_embedder_settings_are_part_of_the_key() -> None:
+    from sage_libs.sage_agentic.intent.embedding_recognizer import (
+        EmbeddingIntentRecognizer,
+        HashedNgramEmbedder,
+    )
+
+    small = EmbeddingIntentRecognizer(HashedNgramEmbedder(dim=256))
+    large = EmbeddingIntentRecognizer(HashedNgramEmbedder(dim=1024))
+    assert small.cache_key != large.cache_key
+    assert EmbeddingIntentRecognizer("hashed").cache_key == large.cache_key
+
+
+def test_router_temperature_is_part_of_the_key(tmp_path) -> None:
+    cache = SQLiteResultCache(tmp_path / "cache.sqlite3")
+
+    def classify(temperature: float):  # type: ignore[no-untyped-def]
+        router = DomainRouter(embedding_model="hashed", temperature=temperature)
+        return IntentClassifier(cache=cache, domain_router=router).classify_sync(
+            "show me example code docs"
+        )
+
+    sharp = classify(0.05)
+    flat = classify(1.0)
+    assert cache.stats()["hits"] == 0
+    assert sharp.domain_scores != flat.domain_scores
+    assert classify(0.05).domain_scores == sharp.domain_scores
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,119 @@
+"""Catalog snapshots: indexed lookups, loading from files, atomic swaps."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import asdict
+
+import pytest
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.catalog import (
+    INTENT_TOOLS,
+    CatalogSnapshot,
+    current_catalog,
+    get_intent_tool,
+    load_catalog,
+)
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.types import KnowledgeDomain, UserIntent
+
+
+def _tools_with_chat_keyword(keyword: str) -> list[dict]:
+    tools = [asdict(tool) for tool in INTENT_TOOLS]
+    position = current_catalog().position(UserIntent.GENERAL_CHAT)
+    tools[position]["keywords"] = [keyword]
+    return tools
+
+
+def test_lookups() -> None:
+    snapshot = current_catalog()
+    assert current_catalog() is snapshot
+    tool = get_intent_tool(UserIntent.KNOWLEDGE_QUERY)
+    assert tool is not None and tool.tool_id == "knowledge_query"
+    # Served from the snapshot, never by position into the mutable INTENT_TOOLS.
+    assert tool is snapshot.tool(UserIntent.KNOWLEDGE_QUERY)
+    assert snapshot.knowledge_domains(UserIntent.KNOWLEDGE_QUERY) == tuple(
+        KnowledgeDomain(domain) for domain in tool.knowledge_domains
+    )
+    assert snapshot.tool_ids_for_keyword("HELLO") == ("general_chat",)
+
+
+def test_derived_tables_are_built_once_per_snapshot() -> None:
+    snapshot = CatalogSnapshot(INTENT_TOOLS)
+    builds = []
+
+    def build(built: CatalogSnapshot) -> object:
+        builds.append(built)
+        time.sleep(0.01)
+        return object()
+
+    values = []
+    threads = [
+        threading.Thread(target=lambda: values.append(snapshot.derived("key", build)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert builds == [snapshot]
+    assert len({id(value) for value in values}) == 1
+
+
+def test_edits_to_intent_tools_do_not_leak_into_a_snapshot(restore_catalog) -> None:
+    snapshot = current_catalog()
+    position = snapshot.position(UserIntent.GENERAL_CHAT)
+    INTENT_TOOLS[position].keywords.append("flurp")
+    assert "flurp" not in snapshot.tools[position].keywords
+    catalog.bump_catalog_version()
+    assert "flurp" in current_catalog().tools[position].keywords
+
+
+def test_json_and_yaml_load_the_same_catalog(tmp_path) -> None:
+    yaml = pytest.importorskip("yaml")
+    tools = _tools_with_chat_keyword("zorblax")
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps({"tools": tools}))
+    yaml_path = tmp_path / "catalog.yaml"
+    yaml_path.write_text(yaml.safe_dump(tools, allow_unicode=True))
+
+    loaded = CatalogSnapshot.load(json_path)
+    assert loaded.fingerprint == CatalogSnapshot.load(yaml_path).fingerprint
+    assert loaded.fingerprint != current_catalog().fingerprint
+
+
+def test_unknown_domain_fails_at_load(tmp_path) -> None:
+    tools = [asdict(tool) for tool in INTENT_TOOLS]
+    tools[0]["knowledge_domains"] = ["nope"]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(tools))
+    with pytest.raises(ValueError):
+        CatalogSnapshot.load(path)
+
+
+def test_swap_invalidates_caches_and_retrains_recognizers(tmp_path, restore_catalog) -> None:
+    recognizer = KeywordIntentRecognizer()
+    cache = IntentResultCache()
+    key = cache.make_key("zorblax")
+    cache.put(key, recognizer.classify_sync(IntentRecognitionContext(message="zorblax")))
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(_tools_with_chat_keyword("zorblax")))
+
+    version = catalog.catalog_version()
+    snapshot = load_catalog(path)
+    assert current_catalog() is snapshot
+    assert snapshot.version == catalog.catalog_version() == version + 1
+    assert catalog.catalog_fingerprint() == snapshot.fingerprint
+    assert INTENT_TOOLS[snapshot.position(UserIntent.GENERAL_CHAT)].keywords == ["zorblax"]
+    assert cache.get(key) is None
+
+    # The recognizer built before the swap picks up the new catalog too.
+    for keyword_recognizer in (recognizer, KeywordIntentRecognizer(method="tfidf")):
+        result = keyword_recognizer.classify_sync(IntentRecognitionContext(message="zorblax"))
+        assert result.intent == UserIntent.GENERAL_CHAT
+        assert result.matched_keywords == ["zorblax"]
@@ -0,0 +1,122 @@
+"""ChainedIntentRecognizer: traces, memory and execution strategies."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+
+from sage_libs.sage_agentic.intent.base import (
+    ChainedIntentRecognizer,
+    IntentRecognitionContext,
+    IntentRecognizer,
+)
+from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+MESSAGES = ("hi", "how to install sage", "restart the gateway", "帮我写一个 pipeline")
+
+
+class Fixed(IntentRecognizer):
+    """Answers ``confidence`` after ``delay`` seconds."""
+
+    def __init__(self, delay: float, confidence: float) -> None:
+        self.delay = delay
+        self.confidence = confidence
+        self.started = 0
+        self.cancelled = 0
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=self.confidence)
+
+
+class Fast(Fixed):
+    pass
+
+
+class Slow(Fixed):
+    pass
+
+
+def test_trace_memory_stays_flat() -> None:
+    chain = build_recognizer_chain(primary_mode="keyword", fallback_modes=["keyword"])
+    contexts = [IntentRecognitionContext(message=m) for m in MESSAGES]
+
+    async def run(calls: int) -> None:
+        for done in range(calls):
+            await chain.classify(contexts[done % len(contexts)])
+
+    # Warm up so one-off allocations and a full ring buffer don't count as growth.
+    asyncio.run(run(len(contexts) * chain.trace_size))
+    tracemalloc.start()
+    try:
+        asyncio.run(run(2_000))
+        first, _ = tracemalloc.get_traced_memory()
+        asyncio.run(run(20_000))
+        last, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(chain.recent_traces) == chain.trace_size
+    assert last - first < 64 * 1024, f"chain memory grew by {(last - first) / 1024:.1f} KiB"
+
+
+def test_results_carry_only_their_own_trace() -> None:
+    chain = build_recognizer_chain(primary_mode="keyword", fallback_modes=["keyword"])
+    ctx = IntentRecognitionContext(message="restart the gateway")
+    for _ in range(10):
+        result = asyncio.run(chain.classify(ctx))
+    assert len(result.trace) <= len(chain.recognizers)
+
+
+@pytest.mark.parametrize("strategy", ["sequential", "race", "hedge"])
+def test_accepted_result_traces_lower_confidence_steps(strategy: str) -> None:
+    chain = ChainedIntentRecognizer(
+        [Fast(0.01, 0.1), Slow(0.03, 0.9)],
+        min_confidence=0.5,
+        strategy=strategy,
+        hedge_delay=0.001,
+    )
+    result = asyncio.run(chain.classify(IntentRecognitionContext(message="x")))
+
+    assert result.confidence == 0.9
+    assert result.trace[:2] == ["Fast:0.10", "Slow:0.90"]
+    if strategy != "sequential":
+        assert result.trace[2].startswith(f"{strategy}:Slow@")
+    assert [str(step) for step in chain.recent_traces[-1].steps] == ["Fast:0.10", "Slow:0.90"]
+
+
+@pytest.mark.parametrize("strategy", ["race", "hedge"])
+def test_fallback_overlaps_a_slow_primary(strategy: str) -> None:
+    primary, fallback = Slow(0.2, 0.1), Fast(0.2, 0.9)
+    chain = ChainedIntentRecognizer(
+        [primary, fallback], min_confidence=0.5, strategy=strategy, hedge_delay=0.05
+    )
+    started = time.perf_counter()
+    result = asyncio.run(chain.classify(IntentRecognitionContext(message="x")))
+    # Sequential would take 0.4 s.
+    assert time.perf_counter() - started < 0.35
+    assert result.confidence == 0.9
+
+
+@pytest.mark.parametrize("strategy", ["race", "hedge"])
+def test_confident_primary_cancels_the_rest(strategy: str) -> None:
+    primary, fallback = Fast(0.01, 0.9), Slow(1.0, 0.9)
+    chain = ChainedIntentRecognizer([primary, fallback], strategy=strategy, hedge_delay=0.05)
+    started = time.perf_counter()
+    result = asyncio.run(chain.classify(IntentRecognitionContext(message="x")))
+    assert time.perf_counter() - started < 0.5
+    assert result.trace[0] == "Fast:0.90"
+    if strategy == "race":
+        assert (fallback.started, fallback.cancelled) == (1, 1)
+    else:
+        # The primary answered before the hedge delay, so the fallback never started.
+        assert fallback.started == 0
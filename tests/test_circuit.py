@@ -0,0 +1,167 @@
+"""CircuitBreaker: state machine, and through LLMIntentRecognizer timing, probes, metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker, CircuitOpenError
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+from sage_libs.sage_agentic.intent.metrics import IntentMetrics
+from sage_libs.sage_agentic.intent.registry import RecognizerRegistry
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_failures_open_then_a_successful_probe_closes() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(window_size=4, min_calls=4, open_seconds=10, clock=clock)
+    changes: list[tuple[str, str]] = []
+    breaker.add_listener(lambda old, new: changes.append((old, new)))
+    for failed in (False, True, False, True):
+        breaker.record(0.1, failed=failed)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    clock.now = 10
+    assert breaker.acquire() is True
+    # Only half_open_probes calls get through while the probe is out.
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record(0.1, failed=False, probe=True)
+    assert breaker.state == "closed"
+    assert changes == [("closed", "open"), ("open", "half_open"), ("half_open", "closed")]
+    assert breaker.rejected == 2
+
+
+def test_slow_calls_open_and_a_slow_probe_reopens() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(
+        slow_call_seconds=1.0, window_size=2, min_calls=2, open_seconds=5, clock=clock
+    )
+    breaker.record(2.0, failed=False)
+    breaker.record(2.0, failed=False)
+    assert breaker.state == "open"
+    clock.now = 5
+    probe = breaker.acquire()
+    breaker.record(2.0, failed=False, probe=probe)
+    assert breaker.state == "open"
+    assert breaker.transitions == {"closed": 0, "open": 2, "half_open": 1}
+
+
+def test_cancelled_probe_gives_its_slot_back() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(window_size=1, min_calls=1, open_seconds=1, clock=clock)
+    breaker.record(0.0, failed=True)
+    clock.now = 1
+
+    def interrupted() -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call_sync(interrupted)
+    assert breaker.state == "half_open"
+    assert breaker.call_sync(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+class SyncGateway:
+    """Stands in for ``openai.OpenAI``: answers after ``delay``, or raises while ``down``."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.down = False
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request: object) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.down:
+            raise ConnectionError("gateway down")
+        message = SimpleNamespace(content="general_chat")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def close(self) -> None:
+        pass
+
+
+def _recognizer(gateway: SyncGateway, breaker: CircuitBreaker, **kwargs) -> LLMIntentRecognizer:
+    recognizer = LLMIntentRecognizer(use_async_client=False, circuit_breaker=breaker, **kwargs)
+    recognizer._client = gateway
+    return recognizer
+
+
+def test_executor_queueing_does_not_trip_the_breaker() -> None:
+    # 100 callers share two executor threads: most wait far longer than
+    # slow_call_seconds for a thread, but every gateway call itself takes 20 ms.
+    breaker = CircuitBreaker(slow_call_seconds=0.2, min_calls=5)
+    recognizer = _recognizer(SyncGateway(delay=0.02), breaker, max_concurrency=100)
+
+    async def run() -> list[str]:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+        replies = await asyncio.gather(*(recognizer._complete(f"m{i}") for i in range(100)))
+        await recognizer.aclose()
+        return replies
+
+    assert asyncio.run(run()) == ["general_chat"] * 100
+    assert breaker.state == "closed"
+    assert breaker.transitions["open"] == 0
+
+
+def test_open_circuit_is_probed_in_the_background() -> None:
+    breaker = CircuitBreaker(min_calls=1, window_size=1, open_seconds=0.05)
+    gateway = SyncGateway()
+    recognizer = _recognizer(gateway, breaker)
+
+    async def run() -> None:
+        gateway.down = True
+        try:
+            await recognizer._complete("hi")
+        except ConnectionError:
+            pass
+        assert breaker.state in ("open", "half_open")
+        gateway.down = False
+        # No request of ours arrives; the background probe closes the circuit.
+        for _ in range(100):
+            if breaker.state == "closed":
+                break
+            await asyncio.sleep(0.01)
+        await recognizer.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == "closed"
+    assert gateway.calls == 2
+
+
+def test_classifier_counts_circuit_transitions_once() -> None:
+    metrics = IntentMetrics()
+    registry = RecognizerRegistry()
+    first = IntentClassifier(mode="llm", metrics=metrics, registry=registry)
+    second = IntentClassifier(mode="llm", metrics=metrics, registry=registry)
+    breaker = first._recognizer.recognizers[0].circuit_breaker
+    assert second._recognizer.recognizers[0].circuit_breaker is breaker
+
+    for _ in range(breaker.min_calls):
+        breaker.record(0.0, failed=True)
+    opened = 'intent_circuit_transitions_total{recognizer="LLMIntentRecognizer",state="open"} 1'
+    assert opened in metrics.to_prometheus()
+
+    asyncio.run(first.aclose())
+    asyncio.run(second.aclose())
+    assert not metrics._watched
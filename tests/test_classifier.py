@@ -0,0 +1,36 @@
+"""IntentClassifier entry points agree with each other."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier, catalog
+from sage_libs.sage_agentic.intent.keyword_recognizer import KNOWLEDGE_TRIGGERS
+
+
+def _messages(count: int) -> list[str]:
+    vocabulary = [k for tool in catalog.INTENT_TOOLS for k in tool.keywords]
+    vocabulary += list(KNOWLEDGE_TRIGGERS) + ["zz", " ", "日志"]
+    rng = random.Random(1)
+    return ["".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6))) for _ in range(count)]
+
+
+def test_batch_matches_single_messages() -> None:
+    classifier = IntentClassifier()
+    messages = _messages(1000)
+
+    async def run() -> None:
+        batch = await classifier.classify_batch(messages)
+        single = [await classifier.classify(m) for m in messages]
+        assert batch == single
+        assert await classifier.classify_batch([]) == []
+
+    asyncio.run(run())
+
+
+def test_batch_rejects_mismatched_histories() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(IntentClassifier().classify_batch(["a", "b"], histories=[None]))
@@ -0,0 +1,67 @@
+"""classify_sync from many threads: inline for keyword chains, shared loop otherwise."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fake_gateway import FakeGateway
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent import classifier as classifier_module
+from sage_libs.sage_agentic.intent.background import BackgroundLoop, run_sync
+from sage_libs.sage_agentic.intent.base import ChainedIntentRecognizer
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+
+MESSAGES = ("how do I restart the gateway", "write a sage pipeline", "hello", "what is sage")
+
+
+def test_keyword_chain_runs_inline_on_every_thread(monkeypatch) -> None:
+    classifier = IntentClassifier(cache=IntentResultCache())
+    assert classifier._recognizer.inline
+    expected = [asyncio.run(classifier.classify(m)).intent for m in MESSAGES]
+
+    def no_loop(coro):  # type: ignore[no-untyped-def]
+        coro.close()
+        raise AssertionError("inline chain went through the background loop")
+
+    monkeypatch.setattr(classifier_module, "run_sync", no_loop)
+    with ThreadPoolExecutor(16) as pool:
+        got = list(
+            pool.map(lambda i: classifier.classify_sync(MESSAGES[i % 4]).intent, range(2000))
+        )
+    assert got == [expected[i % 4] for i in range(2000)]
+    assert classifier.classify_sync("hello there", budget=1.0).trace
+
+
+def test_llm_chain_shares_the_background_loop() -> None:
+    # The gateway gets a loop of its own so it keeps serving while callers block.
+    server = BackgroundLoop("fake-gateway")
+    gateway = FakeGateway(latency=0.02)
+    server.run(gateway.start())
+    llm = LLMIntentRecognizer(control_plane_url=gateway.url)
+    classifier = IntentClassifier()
+    classifier._recognizer = ChainedIntentRecognizer([llm, KeywordIntentRecognizer()])
+    try:
+        assert not classifier._recognizer.inline
+        with ThreadPoolExecutor(32) as pool:
+            results = list(pool.map(lambda _: classifier.classify_sync("same message"), range(200)))
+        assert all(r.trace[-1].startswith("LLMIntentRecognizer") for r in results)
+        # Every thread's call landed on one loop, so identical messages coalesced.
+        assert gateway.requests + classifier.coalesced == 200
+        assert gateway.requests < 200
+
+        async def from_the_loop_thread() -> None:
+            assert threading.current_thread().name == "intent-background-loop"
+            with pytest.raises(RuntimeError):
+                classifier.classify_sync("x")
+
+        run_sync(from_the_loop_thread())
+    finally:
+        run_sync(llm.aclose())
+        server.run(gateway.stop())
+        server.close()
@@ -0,0 +1,94 @@
+"""In-flight coalescing: identical concurrent classifications share one call."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier, IntentMetrics
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+
+class Slow(IntentRecognizer):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if ctx.message.startswith("boom"):
+            raise RuntimeError("boom")
+        return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.8, matched_keywords=["x"])
+
+
+@pytest.fixture(params=[None, IntentResultCache], ids=["no cache", "cache"])
+def classifier(request) -> IntentClassifier:  # type: ignore[no-untyped-def]
+    cache = request.param() if request.param else None
+    classifier = IntentClassifier(cache=cache, metrics=IntentMetrics())
+    classifier._recognizer = Slow()
+    return classifier
+
+
+def test_waiters_share_one_call_and_get_copies(classifier: IntentClassifier) -> None:
+    async def run() -> list[IntentResult]:
+        tasks = [
+            asyncio.ensure_future(classifier.classify("  Is the service down ")) for _ in range(50)
+        ]
+        await asyncio.sleep(0.01)
+        # Cancelling some waiters leaves the shared call running for the rest.
+        tasks[0].cancel()
+        tasks[1].cancel()
+        return await asyncio.gather(*tasks[2:])
+
+    results = asyncio.run(run())
+    assert classifier._recognizer.calls == 1
+    assert classifier.coalesced == 49
+    assert classifier.metrics.coalesced.value() == 49
+    assert len({id(result) for result in results}) == 48
+    results[0].matched_keywords.append("y")
+    assert results[1].matched_keywords == ["x"]
+    assert not classifier._in_flight
+
+
+def test_budgeted_calls_run_alone(classifier: IntentClassifier) -> None:
+    async def run() -> None:
+        await asyncio.gather(*(classifier.classify("other", budget=5) for _ in range(2)))
+
+    asyncio.run(run())
+    assert classifier._recognizer.calls == 2
+    assert classifier.coalesced == 0
+
+
+def test_shared_call_outlives_cancelled_waiters(classifier: IntentClassifier) -> None:
+    async def run() -> None:
+        waiter = asyncio.ensure_future(classifier.classify("fresh"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert not classifier._in_flight
+    if classifier.cache is not None:
+        assert classifier.cache.get(classifier._cache_key("fresh", None, None)) is not None
+
+
+def test_errors_reach_every_waiter(classifier: IntentClassifier, caplog) -> None:
+    async def run() -> list[object]:
+        outcomes = await asyncio.gather(
+            *(classifier.classify("boom") for _ in range(3)), return_exceptions=True
+        )
+        # A failure nobody is left waiting for must not be logged as never retrieved.
+        waiter = asyncio.ensure_future(classifier.classify("boom again"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.1)
+        return outcomes
+
+    assert all(isinstance(outcome, RuntimeError) for outcome in asyncio.run(run()))
+    assert classifier._recognizer.calls == 2
+    gc.collect()
+    assert "never retrieved" not in caplog.text
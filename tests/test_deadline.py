@@ -0,0 +1,99 @@
+"""Deadlines through the chain: time boxes, skipping slow recognizers, last resort."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent.base import (
+    ChainedIntentRecognizer,
+    IntentRecognitionContext,
+    IntentRecognizer,
+)
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+
+class Slow(IntentRecognizer):
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return IntentResult(intent=UserIntent.SAGE_CODING, confidence=0.95)
+
+
+def _chain(slow: Slow, **kwargs: object) -> ChainedIntentRecognizer:
+    return ChainedIntentRecognizer([slow, KeywordIntentRecognizer()], **kwargs)
+
+
+@pytest.mark.parametrize("strategy", ["sequential", "hedge", "race"])
+def test_slow_recognizer_is_cut_off_then_skipped(strategy: str) -> None:
+    slow = Slow(0.3)
+    chain = _chain(slow, strategy=strategy, hedge_delay=0.01)
+
+    async def run() -> None:
+        started = time.perf_counter()
+        first = await chain.classify(IntentRecognitionContext.with_budget("restart gateway", 0.1))
+        assert time.perf_counter() - started < 0.25
+        assert first.intent == UserIntent.SYSTEM_OPERATION
+        assert any(entry in ("Slow:timeout", "Slow:deadline") for entry in first.trace)
+        assert chain.expected_latency(0) == pytest.approx(0.1, abs=0.05)
+
+        # Its expected latency now exceeds the budget: not even started.
+        second = await chain.classify(IntentRecognitionContext.with_budget("restart gateway", 0.05))
+        assert second.trace[0] == "Slow:over_budget"
+        assert slow.calls == 1
+
+        unbounded = await chain.classify(IntentRecognitionContext(message="restart gateway"))
+        assert unbounded.intent == UserIntent.SAGE_CODING
+
+    asyncio.run(run())
+
+
+def test_every_nth_skip_probes_the_recognizer() -> None:
+    slow = Slow(0.0)
+    chain = _chain(slow, budget_probe_interval=3)
+    chain._observe_latency(0, 1.0)
+
+    async def run() -> list[str]:
+        outcomes = []
+        for _ in range(6):
+            ctx = IntentRecognitionContext.with_budget("restart gateway", 0.5)
+            outcomes.append((await chain.classify(ctx)).trace[0])
+        return outcomes
+
+    outcomes = asyncio.run(run())
+    assert outcomes.count("Slow:0.95") == 2
+    assert outcomes.count("Slow:over_budget") == 4
+    # The fast probes pulled the estimate back under the budget.
+    assert chain.expected_latency(0) < 1.0
+
+
+def test_last_recognizer_runs_past_the_deadline_when_nothing_answered() -> None:
+    chain = _chain(Slow(0.3))
+    result = asyncio.run(chain.classify(IntentRecognitionContext.with_budget("hi", -1)))
+    assert result.trace == ["Slow:deadline", "KeywordIntentRecognizer:0.50"]
+
+
+def test_batch_respects_per_item_deadlines() -> None:
+    chain = _chain(Slow(0.3))
+    contexts = [
+        IntentRecognitionContext.with_budget("restart gateway", 0.1),
+        IntentRecognitionContext(message="hi"),
+    ]
+    first, second = asyncio.run(chain.classify_batch(contexts))
+    assert first.trace == ["Slow:timeout", "KeywordIntentRecognizer:1.00"]
+    assert second.trace == ["Slow:0.95"]
+
+
+def test_classifier_budget_reaches_the_chain() -> None:
+    classifier = IntentClassifier()
+    classifier._recognizer = _chain(Slow(0.3))
+    result = asyncio.run(classifier.classify("restart gateway", budget=0.05))
+    assert result.intent == UserIntent.SYSTEM_OPERATION
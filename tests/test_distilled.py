@@ -0,0 +1,67 @@
+"""Distilled model: training, save/load round trip, digest and chain routing."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.distilled import (
+    DistilledIntentRecognizer,
+    DistilledModel,
+    train,
+)
+from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
+
+PHRASES = {
+    "system_operation": ["restart the gateway", "重启服务", "stop all workers", "check cluster"],
+    "sage_coding": [
+        "write a pipeline",
+        "帮我写一个 operator",
+        "fix this traceback",
+        "debug my job",
+    ],
+    "general_chat": ["hello there", "你好", "thanks a lot", "how are you"],
+}
+
+
+@pytest.fixture(scope="module")
+def model() -> DistilledModel:
+    rng = random.Random(0)
+    messages, labels = [], []
+    for _ in range(1500):
+        label = rng.choice(list(PHRASES))
+        messages.append(f"{rng.choice(PHRASES[label])} {rng.choice(['', 'please', '谢谢'])}")
+        labels.append(label)
+    trained, report = train(messages, labels, dim=2**12, epochs=4)
+    assert report.validation_accuracy > 0.95
+    return trained
+
+
+def test_save_and_load_keep_predictions_and_digest(model: DistilledModel, tmp_path) -> None:
+    path = tmp_path / "model.npz"
+    model.save(path)
+    loaded = DistilledModel.load(path)
+    texts = ["restart the gateway", "你好", "write a pipeline please"]
+    # Weights are stored as float16.
+    np.testing.assert_allclose(loaded.predict_proba(texts), model.predict_proba(texts), atol=1e-2)
+    assert DistilledModel.load(path).digest == loaded.digest
+
+
+def test_batch_matches_single_messages(model: DistilledModel) -> None:
+    recognizer = DistilledIntentRecognizer(model)
+    contexts = [IntentRecognitionContext(message=m) for m in ("重启服务", "debug my job", "hi")]
+    batch = asyncio.run(recognizer.classify_batch(contexts))
+    single = [recognizer.classify_sync(ctx) for ctx in contexts]
+    assert [r.label for r in batch] == [r.label for r in single]
+    assert [r.confidence for r in batch] == pytest.approx([r.confidence for r in single])
+
+
+def test_confident_answers_stay_in_front_of_the_fallback(model: DistilledModel) -> None:
+    chain = build_recognizer_chain("distilled", ["keyword"], 0.9, distilled_model=model)
+    result = chain.classify_sync(IntentRecognitionContext(message="restart the gateway"))
+    assert result.label == "system_operation"
+    assert result.trace == [f"DistilledIntentRecognizer:{result.confidence:.2f}"]
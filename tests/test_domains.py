@@ -0,0 +1,112 @@
+"""Knowledge-domain routing: narrowing, no-signal fallback, cache keys, evaluation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from sage_libs.sage_agentic.intent import (
+    DomainRouter,
+    IntentClassifier,
+    KnowledgeDomain,
+    UserIntent,
+    evaluate_routing,
+)
+from sage_libs.sage_agentic.intent.cache import IntentResultCache
+from sage_libs.sage_agentic.intent.domains import main
+
+
+@pytest.fixture(params=[None, IntentResultCache], ids=["no cache", "cache"])
+def classifier(request) -> IntentClassifier:  # type: ignore[no-untyped-def]
+    cache = request.param() if request.param else None
+    return IntentClassifier(cache=cache, domain_router=DomainRouter())
+
+
+def test_knowledge_results_are_narrowed(classifier: IntentClassifier) -> None:
+    result = classifier.classify_sync("SAGE 怎么安装")
+    assert result.knowledge_domains == [KnowledgeDomain.SAGE_DOCS]
+    assert result.domain_scores[KnowledgeDomain.SAGE_DOCS] == 1.0
+
+    result = asyncio.run(classifier.classify("find the pdf I uploaded about the paper"))
+    assert result.knowledge_domains[0] is KnowledgeDomain.USER_UPLOADS
+
+    docs, chat = asyncio.run(classifier.classify_batch(["show me example code docs", "hello"]))
+    assert docs.knowledge_domains == [KnowledgeDomain.EXAMPLES, KnowledgeDomain.SAGE_DOCS]
+    assert chat.domain_scores is None
+
+    sync = classifier.classify_sync("论文 投稿").knowledge_domains
+    assert sync == asyncio.run(classifier.classify("论文 投稿")).knowledge_domains
+
+
+def test_no_signal_keeps_every_candidate(classifier: IntentClassifier) -> None:
+    unrouted = IntentClassifier().classify_sync("RAG 检索增强生成")
+    result = classifier.classify_sync("RAG 检索增强生成")
+    assert result.intent is UserIntent.KNOWLEDGE_QUERY
+    assert result.knowledge_domains == unrouted.knowledge_domains
+    assert result.domain_scores is None
+
+
+def test_router_is_part_of_the_cache_key() -> None:
+    cache = IntentResultCache()
+    unrouted = IntentClassifier(cache=cache).classify_sync("SAGE 怎么安装")
+    routed = IntentClassifier(cache=cache, domain_router=DomainRouter()).classify_sync(
+        "SAGE 怎么安装"
+    )
+    assert len(unrouted.knowledge_domains) > 1
+    assert routed.knowledge_domains == [KnowledgeDomain.SAGE_DOCS]
+    assert DomainRouter().key != DomainRouter(max_domains=1).key
+
+
+def test_sqlite_rows_keep_domain_scores() -> None:
+    from sage_libs.sage_agentic.intent.sqlite_cache import dump_result, load_result
+
+    result = IntentClassifier(domain_router=DomainRouter()).classify_sync("SAGE 怎么安装")
+    assert load_result(dump_result(result)).domain_scores == result.domain_scores
+    assert load_result('["general_chat", 0.3, null, [], [], null]').domain_scores is None
+
+
+def test_max_domains_and_threshold() -> None:
+    router = DomainRouter(max_domains=1, threshold=0.0)
+    domains, scores = router.route("show me example code docs")
+    assert domains == [KnowledgeDomain.EXAMPLES]
+    assert sum(scores.values()) == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        DomainRouter(max_domains=0)
+
+
+def test_evaluation(tmp_path, capsys) -> None:
+    samples = [
+        ("SAGE 怎么安装", [KnowledgeDomain.SAGE_DOCS]),
+        ("论文写作", [KnowledgeDomain.RESEARCH_GUIDANCE, KnowledgeDomain.USER_UPLOADS]),
+    ]
+    evaluation = evaluate_routing(DomainRouter(max_domains=1), samples)
+    assert evaluation.samples == 2
+    assert evaluation.routed_fanout == 1.0
+    assert evaluation.baseline_recall == 1.0
+    assert evaluation.routed_recall == pytest.approx(0.75)
+    assert evaluation.missed == {KnowledgeDomain.USER_UPLOADS: 1}
+
+    path = tmp_path / "samples.jsonl"
+    path.write_text(
+        "\n".join(json.dumps({"message": m, "domains": [d.value for d in ds]}) for m, ds in samples)
+        + "\n\n"
+    )
+    assert main([str(path), "--max-domains", "1"]) == 0
+    assert json.loads(capsys.readouterr().out) == evaluation.as_dict()
+
+
+def test_embedder_settings_are_part_of_the_key() -> None:
+    pytest.importorskip("numpy")
+    from sage_libs.sage_agentic.intent.embedding_recognizer import HashedNgramEmbedder
+
+    sharp = DomainRouter(embedding_model=HashedNgramEmbedder(), temperature=0.05)
+    flat = DomainRouter(embedding_model=HashedNgramEmbedder(dim=64), temperature=1.0)
+    assert sharp.key != flat.key
+    assert (
+        DomainRouter(embedding_model="hashed").key
+        == DomainRouter(embedding_model=HashedNgramEmbedder()).key
+    )
+    # Temperature only matters with an embedder.
+    assert DomainRouter(temperature=0.05).key == DomainRouter(temperature=1.0).key
@@ -0,0 +1,75 @@
+"""Embedding recognizer: deterministic hashed embeddings and centroid scoring."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.catalog import current_catalog
+from sage_libs.sage_agentic.intent.types import UserIntent
+
+np = pytest.importorskip("numpy")
+
+from sage_libs.sage_agentic.intent.embedding_recognizer import (  # noqa: E402
+    EmbeddingIntentRecognizer,
+    HashedNgramEmbedder,
+    build_embedder,
+)
+
+LABELLED = [
+    ("帮我写一个 pipeline", UserIntent.SAGE_CODING),
+    ("重启 gateway", UserIntent.SYSTEM_OPERATION),
+    ("restart the service", UserIntent.SYSTEM_OPERATION),
+    ("hello there", UserIntent.GENERAL_CHAT),
+]
+
+
+def test_hashed_embedder_is_deterministic_and_normalized() -> None:
+    texts = ["Restart  the gateway", "restart the gateway", "重启服务", ""]
+    vectors = HashedNgramEmbedder(dim=256).embed(texts)
+    assert vectors.shape == (4, 256)
+    np.testing.assert_array_equal(vectors, HashedNgramEmbedder(dim=256).embed(texts))
+    np.testing.assert_array_equal(vectors[0], vectors[1])
+    np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, rtol=1e-6)
+    assert not vectors[3].any()
+
+
+def test_labelled_messages() -> None:
+    recognizer = EmbeddingIntentRecognizer()
+    for message, intent in LABELLED:
+        result = recognizer.classify_sync(IntentRecognitionContext(message=message))
+        assert result.intent == intent, message
+        assert 0 < result.confidence <= 1
+
+
+def test_message_without_features_falls_back_to_chat() -> None:
+    result = EmbeddingIntentRecognizer().classify_sync(IntentRecognitionContext(message="  "))
+    assert (result.intent, result.confidence) == (UserIntent.GENERAL_CHAT, 0.3)
+
+
+def test_batch_matches_single_messages() -> None:
+    recognizer = EmbeddingIntentRecognizer()
+    contexts = [IntentRecognitionContext(message=m) for m, _ in LABELLED] + [
+        IntentRecognitionContext(message="")
+    ]
+    batch = asyncio.run(recognizer.classify_batch(contexts))
+    single = [recognizer.classify_sync(ctx) for ctx in contexts]
+    assert [r.label for r in batch] == [r.label for r in single]
+    assert [r.confidence for r in batch] == pytest.approx([r.confidence for r in single])
+    assert asyncio.run(recognizer.classify_batch([])) == []
+
+
+def test_custom_backend_and_unknown_name() -> None:
+    class Constant:
+        def embed(self, texts):  # type: ignore[no-untyped-def]
+            return np.ones((len(texts), 8), dtype=np.float32) / np.sqrt(8)
+
+    backend = Constant()
+    assert build_embedder(backend) is backend
+    result = EmbeddingIntentRecognizer(backend).classify_sync(IntentRecognitionContext("hi"))
+    # Every centroid is the same vector, so the softmax is uniform over the intents.
+    assert result.confidence == pytest.approx(1 / len(current_catalog().roots), rel=1e-5)
+    with pytest.raises(ValueError):
+        build_embedder("no-such-model")
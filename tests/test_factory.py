@@ -0,0 +1,111 @@
+"""build_recognizer_chain and the recognizer registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier, factory
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.factory import build_recognizer_chain
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+from sage_libs.sage_agentic.intent.registry import RecognizerRegistry
+
+
+def test_unknown_embedding_model_reaches_the_caller() -> None:
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        build_recognizer_chain("embedding", ["keyword"], embedding_model="no-such-model")
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        IntentClassifier(mode="embedding", embedding_model="no-such-model")
+
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown recognizer mode"):
+        build_recognizer_chain("keyword", ["no-such-mode"])
+
+
+def test_failed_build_releases_acquired_recognizers() -> None:
+    registry = RecognizerRegistry()
+    with pytest.raises(ValueError):
+        build_recognizer_chain(
+            "keyword", ["embedding"], embedding_model="no-such-model", registry=registry
+        )
+    assert registry.stats()["entries"] == 0
+
+
+def test_chain_keeps_every_requested_mode() -> None:
+    chain = build_recognizer_chain("embedding", ["keyword"], embedding_model="hashed")
+    assert [type(r).__name__ for r in chain.recognizers] == [
+        "EmbeddingIntentRecognizer",
+        "KeywordIntentRecognizer",
+    ]
+
+
+def test_loop_bound_recognizers_are_shared_within_one_loop_only() -> None:
+    registry = RecognizerRegistry()
+
+    async def acquire_pair(mode: str) -> tuple[object, object]:
+        return registry.acquire(mode), registry.acquire(mode)
+
+    first, second = asyncio.run(acquire_pair("llm"))
+    other, _ = asyncio.run(acquire_pair("llm"))
+    assert first is second
+    assert other is not first
+
+    keyword, _ = asyncio.run(acquire_pair("keyword"))
+    assert asyncio.run(acquire_pair("keyword"))[0] is keyword
+
+
+def test_chains_sharing_a_recognizer_keep_their_own_latency() -> None:
+    registry = RecognizerRegistry()
+    fast = build_recognizer_chain("keyword", registry=registry)
+    slow = build_recognizer_chain("keyword", registry=registry)
+    assert fast.recognizers[0] is slow.recognizers[0]
+
+    ctx = IntentRecognitionContext.with_budget("restart the gateway", 10.0)
+    fast.classify_sync(ctx)
+    slow._observe_latency(0, 5.0)
+
+    assert fast.expected_latency(0) < 1.0
+    assert slow.expected_latency(0) == 5.0
+    assert vars(fast.recognizers[0]).keys().isdisjoint({"_latency", "_budget_skips"})
+
+
+class Closing(KeywordIntentRecognizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = 0
+
+    async def aclose(self) -> None:
+        self.closed += 1
+
+
+def test_classifiers_share_one_build_until_the_last_release(monkeypatch) -> None:
+    monkeypatch.setitem(factory.RECOGNIZER_BUILDERS, "closing", lambda **_: Closing())
+    registry = RecognizerRegistry()
+    first = IntentClassifier(mode="closing", fallback_modes=[], registry=registry)
+    second = IntentClassifier(mode="closing", fallback_modes=[], registry=registry)
+    shared = first._recognizer.recognizers[0]
+    assert second._recognizer.recognizers[0] is shared
+    # Each classifier holds its primary and the default keyword fallback.
+    assert registry.stats() == {"entries": 2, "references": 4, "builds": 2}
+
+    asyncio.run(first.aclose())
+    asyncio.run(first.aclose())  # a second close is a no-op
+    assert shared.closed == 0
+    asyncio.run(second.aclose())
+    assert shared.closed == 1
+    assert registry.stats()["entries"] == 0
+
+
+def test_warmup_keeps_recognizers_built(monkeypatch) -> None:
+    monkeypatch.setitem(factory.RECOGNIZER_BUILDERS, "closing", lambda **_: Closing())
+    registry = RecognizerRegistry()
+    (warmed,) = registry.warmup(["closing"])
+    classifier = IntentClassifier(mode="closing", fallback_modes=[], registry=registry)
+    assert classifier._recognizer.recognizers[0] is warmed
+    asyncio.run(classifier.aclose())
+    assert warmed.closed == 0
+    asyncio.run(registry.aclose())
+    assert warmed.closed == 1
@@ -0,0 +1,123 @@
+"""Hierarchical intents: registration, coarse-to-fine picks, labels through the cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent import (
+    IntentTool,
+    UserIntent,
+    coarse_intent,
+    current_catalog,
+    register_intents,
+    unregister_intents,
+)
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.keyword_recognizer import KeywordIntentRecognizer
+
+SUB_INTENTS = (
+    IntentTool(
+        "system_operation/restart_gateway",
+        "Restart gateway",
+        "Restart the LLM gateway service",
+        keywords=["restart gateway", "reboot gateway", "gateway down"],
+    ),
+    IntentTool(
+        "system_operation/scale_workers",
+        "Scale workers",
+        "Scale the number of worker processes",
+        keywords=["scale workers", "add workers", "more workers"],
+    ),
+    IntentTool(
+        "knowledge_query/papers",
+        "Papers",
+        "Research papers and citations",
+        keywords=["paper", "citation", "arxiv"],
+    ),
+)
+
+
+@pytest.fixture
+def hierarchy(restore_catalog):  # type: ignore[no-untyped-def]
+    return register_intents(*SUB_INTENTS)
+
+
+def _ctx(message: str) -> IntentRecognitionContext:
+    return IntentRecognitionContext(message=message)
+
+
+def test_tree(hierarchy, restore_catalog) -> None:  # type: ignore[no-untyped-def]
+    assert hierarchy.hierarchical
+    assert not restore_catalog.hierarchical
+    assert hierarchy.parent_id("system_operation/restart_gateway") == "system_operation"
+    assert hierarchy.children_ids("system_operation") == (
+        "system_operation/restart_gateway",
+        "system_operation/scale_workers",
+    )
+    assert hierarchy.children_ids() == tuple(tool.tool_id for tool in restore_catalog.tools)
+    # Sub-intents without domains of their own search their parent's.
+    assert hierarchy.knowledge_domains("knowledge_query/papers") == hierarchy.knowledge_domains(
+        "knowledge_query"
+    )
+
+
+def test_coarse_intent() -> None:
+    assert coarse_intent("system_operation/x/y") is UserIntent.SYSTEM_OPERATION
+    assert coarse_intent("weather") is UserIntent.GENERAL_CHAT
+
+
+@pytest.mark.parametrize("method", ["count", "tfidf"])
+def test_keyword_recognizer_picks_sub_intents(hierarchy, method: str) -> None:  # type: ignore[no-untyped-def]
+    recognizer = KeywordIntentRecognizer(method=method)
+    result = recognizer.classify_sync(_ctx("please restart gateway now, gateway down"))
+    assert result.label == "system_operation/restart_gateway"
+    assert result.intent is UserIntent.SYSTEM_OPERATION
+
+    result = recognizer.classify_sync(_ctx("find an arxiv paper with citation"))
+    assert result.label == "knowledge_query/papers"
+    assert result.knowledge_domains
+
+    result = recognizer.classify_sync(_ctx("hi there"))
+    assert result.label == result.intent.value
+
+    batch = asyncio.run(recognizer.classify_batch([_ctx("scale workers please"), _ctx("hello")]))
+    assert [r.label for r in batch] == ["system_operation/scale_workers", "general_chat"]
+
+
+def test_embedding_recognizer_descends_the_tree(hierarchy) -> None:  # type: ignore[no-untyped-def]
+    pytest.importorskip("numpy")
+    from sage_libs.sage_agentic.intent.embedding_recognizer import EmbeddingIntentRecognizer
+
+    result = EmbeddingIntentRecognizer().classify_sync(_ctx("restart gateway, gateway down"))
+    assert result.label.startswith("system_operation")
+    assert result.intent is UserIntent.SYSTEM_OPERATION
+
+
+def test_replace_and_unregister(hierarchy) -> None:  # type: ignore[no-untyped-def]
+    register_intents(
+        IntentTool("system_operation/restart_gateway", "R", "R", keywords=["bounce it"])
+    )
+    result = KeywordIntentRecognizer().classify_sync(_ctx("bounce it"))
+    assert result.label == "system_operation/restart_gateway"
+    unregister_intents("system_operation/restart_gateway")
+    assert current_catalog().tool("system_operation/restart_gateway") is None
+    assert current_catalog().tool("system_operation/scale_workers") is not None
+
+
+def test_sqlite_rows_keep_the_label(hierarchy) -> None:  # type: ignore[no-untyped-def]
+    from sage_libs.sage_agentic.intent.sqlite_cache import dump_result, load_result
+
+    result = KeywordIntentRecognizer().classify_sync(_ctx("more workers"))
+    assert load_result(dump_result(result)).label == "system_operation/scale_workers"
+    # Rows written before labels existed still load.
+    assert load_result('["general_chat", 0.3, null, [], [], null]').label == "general_chat"
+
+
+@pytest.mark.parametrize("method", ["count", "tfidf"])
+def test_ids_outside_user_intent_keep_their_label(restore_catalog, method: str) -> None:  # type: ignore[no-untyped-def]
+    register_intents(IntentTool("weather", "Weather", "Weather", keywords=["forecast", "rain"]))
+    result = KeywordIntentRecognizer(method=method).classify_sync(_ctx("rain in the forecast?"))
+    assert result.label == "weather"
+    assert result.intent is UserIntent.GENERAL_CHAT
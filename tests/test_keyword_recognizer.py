@@ -0,0 +1,71 @@
+"""KeywordIntentRecognizer accuracy, confidence scale and batch path."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.keyword_recognizer import (
+    KNOWLEDGE_TRIGGERS,
+    KeywordIntentRecognizer,
+)
+
+LABELLED = [
+    ("stop the server please", "system_operation"),
+    ("write a pipeline that reads kafka", "sage_coding"),
+    ("tell me a joke", "general_chat"),
+    ("restart the gateway", "system_operation"),
+    ("how do I install SAGE", "knowledge_query"),
+    ("帮我写一个 pipeline", "sage_coding"),
+    ("你好", "general_chat"),
+    ("重启 gateway 服务", "system_operation"),
+    ("查看集群状态", "system_operation"),
+    ("what is a RAG pipeline", "knowledge_query"),
+    ("fix this bug in my operator", "sage_coding"),
+    ("thanks!", "general_chat"),
+    ("SAGE 的文档在哪里", "knowledge_query"),
+    ("generate code for a map operator", "sage_coding"),
+    ("check the status of the cluster", "system_operation"),
+    ("论文写作有什么建议", "knowledge_query"),
+    ("今天天气怎么样", "general_chat"),
+    ("debug this traceback", "sage_coding"),
+]
+
+
+def test_default_method_is_tfidf() -> None:
+    assert KeywordIntentRecognizer().method == "tfidf"
+
+
+@pytest.mark.parametrize("method", ["count", "tfidf"])
+@pytest.mark.parametrize("message,label", LABELLED)
+def test_labels_match(method: str, message: str, label: str) -> None:
+    recognizer = KeywordIntentRecognizer(method=method)
+    result = recognizer.classify_sync(IntentRecognitionContext(message=message))
+    assert result.label == label
+    if set(result.matched_keywords) & set(KNOWLEDGE_TRIGGERS):
+        assert result.confidence == 0.9
+    elif result.matched_keywords:
+        # Keyword hits sit on the count scale that min_confidence is set against.
+        assert result.confidence == min(len(result.matched_keywords) * 0.5, 1.0)
+
+
+def test_tfidf_discounts_keywords_shared_between_intents() -> None:
+    # "RAG" and "pipeline" are both knowledge and coding keywords; "implement" is not.
+    message = IntentRecognitionContext(message="implement a RAG pipeline")
+    assert KeywordIntentRecognizer(method="count").classify_sync(message).label == (
+        "knowledge_query"
+    )
+    result = KeywordIntentRecognizer().classify_sync(message)
+    assert result.label == "sage_coding"
+    assert result.confidence == 1.0
+
+
+@pytest.mark.parametrize("method", ["count", "tfidf"])
+def test_batch_matches_single_messages(method: str) -> None:
+    recognizer = KeywordIntentRecognizer(method=method)
+    contexts = [IntentRecognitionContext(message=m) for m, _ in LABELLED]
+    batch = asyncio.run(recognizer.classify_batch(contexts))
+    single = [recognizer.classify_sync(ctx) for ctx in contexts]
+    assert [(r.label, r.confidence) for r in batch] == [(r.label, r.confidence) for r in single]
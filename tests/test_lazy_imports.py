@@ -0,0 +1,54 @@
+"""Keyword-only users must not pay for the optional backends' imports."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("openai", "httpx", "numpy", "sqlite3", "sage.common")
+CHECK = (
+    f"\nimport sys\nprint('LOADED=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _loaded_after(code: str) -> set[str]:
+    """Run ``code`` in a fresh interpreter and return the heavy modules it loaded."""
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    proc = subprocess.run(
+        [sys.executable, "-c", code + CHECK], capture_output=True, text=True, check=True, env=env
+    )
+    loaded = proc.stdout.rsplit("LOADED=", 1)[-1].strip()
+    return {module for module in loaded.split(",") if module}
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import sage_libs.sage_agentic.intent",
+        "from sage_libs.sage_agentic.intent import IntentClassifier\n"
+        "IntentClassifier().classify_sync('restart the gateway')",
+    ],
+    ids=["import", "keyword classify"],
+)
+def test_keyword_users_load_no_optional_backend(code: str) -> None:
+    assert _loaded_after(code) == set()
+
+
+def test_llm_recognizer_defers_the_openai_client() -> None:
+    code = (
+        "from sage_libs.sage_agentic.intent import IntentClassifier\nIntentClassifier(mode='llm')"
+    )
+    assert not _loaded_after(code) & {"openai", "httpx"}
+
+
+def test_lazy_attributes_resolve() -> None:
+    code = (
+        "import sage_libs.sage_agentic.intent as intent\n"
+        "from sage_libs.sage_agentic.intent.embedding_recognizer import HashedNgramEmbedder\n"
+        "assert intent.HashedNgramEmbedder is HashedNgramEmbedder"
+    )
+    assert "numpy" in _loaded_after(code)
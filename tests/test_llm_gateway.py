@@ -0,0 +1,125 @@
+"""LLMIntentRecognizer end to end against the fake OpenAI-compatible gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fake_gateway import FakeGateway
+
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext
+from sage_libs.sage_agentic.intent.circuit import CircuitBreaker, CircuitOpenError
+from sage_libs.sage_agentic.intent.llm_recognizer import LLMIntentRecognizer
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+openai = pytest.importorskip("openai")
+
+
+def _contexts(count: int) -> list[IntentRecognitionContext]:
+    return [IntentRecognitionContext(message=f"hello #{i}") for i in range(count)]
+
+
+async def _classify(
+    gateway: FakeGateway, count: int, **kwargs: object
+) -> tuple[list[IntentResult | Exception], LLMIntentRecognizer]:
+    recognizer = LLMIntentRecognizer(control_plane_url=gateway.url, **kwargs)
+    try:
+        results = await recognizer.classify_batch(_contexts(count))
+    finally:
+        await recognizer.aclose()
+    return results, recognizer
+
+
+def _serve(test, latency: float = 0.01, **options: object):  # type: ignore[no-untyped-def]
+    """Run ``test(gateway)`` on a fresh event loop with a started gateway."""
+
+    async def main() -> object:
+        gateway = FakeGateway(latency=latency, **options)
+        await gateway.start()
+        try:
+            return await test(gateway)
+        finally:
+            await gateway.stop()
+
+    return asyncio.run(main())
+
+
+def test_async_client_reuses_a_bounded_pool() -> None:
+    async def test(gateway: FakeGateway) -> None:
+        results, _ = await _classify(gateway, 64, max_concurrency=8)
+        assert all(r.intent == UserIntent.GENERAL_CHAT for r in results)
+        assert gateway.requests == 64
+        assert gateway.peak_in_flight <= 8
+        assert gateway.connections <= 8
+
+    _serve(test)
+
+
+def test_micro_batching_sends_fewer_requests() -> None:
+    async def test(gateway: FakeGateway) -> None:
+        results, recognizer = await _classify(
+            gateway, 64, max_concurrency=8, micro_batch=True, batch_window_ms=20
+        )
+        assert all(r.intent == UserIntent.GENERAL_CHAT for r in results)
+        assert gateway.requests < 64
+        assert recognizer.batch_stats["retried"] == 0
+
+    _serve(test)
+
+
+def test_logprob_scoring_reads_confidence_off_the_top_tokens() -> None:
+    async def test(gateway: FakeGateway) -> None:
+        results, _ = await _classify(gateway, 16, scoring="logprobs")
+        assert all(r.intent == UserIntent.SAGE_CODING for r in results)
+        assert all(abs(r.confidence - gateway.expected_confidence) < 1e-6 for r in results)
+        assert gateway.max_tokens == 16
+        # One byte-identical system turn, so gateways can cache its prefix.
+        assert len(gateway.system_prompts) == 1
+
+    _serve(test, label="sage_coding", probability=0.7)
+
+
+def test_gateway_errors_open_the_circuit() -> None:
+    breaker = CircuitBreaker(min_calls=4, window_size=4, open_seconds=60)
+
+    async def test(gateway: FakeGateway) -> None:
+        gateway.status = 503
+        results, _ = await _classify(
+            gateway, 12, max_concurrency=1, circuit_breaker=breaker, background_probe=False
+        )
+        assert all(isinstance(r, Exception) for r in results)
+        assert sum(isinstance(r, CircuitOpenError) for r in results) == 8
+        assert gateway.requests == 4
+
+    _serve(test)
+    assert breaker.state == "open"
+
+
+def test_stopped_gateway_raises() -> None:
+    async def test(gateway: FakeGateway) -> None:
+        url = gateway.url
+        await gateway.stop()
+        recognizer = LLMIntentRecognizer(control_plane_url=url, timeout=2.0)
+        try:
+            with pytest.raises(openai.APIConnectionError):
+                await recognizer.classify(IntentRecognitionContext(message="hi"))
+        finally:
+            await recognizer.aclose()
+
+    _serve(test)
+
+
+def test_sync_client_under_load_keeps_the_circuit_closed() -> None:
+    breaker = CircuitBreaker(slow_call_seconds=0.5, min_calls=5)
+
+    async def test(gateway: FakeGateway) -> None:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(4))
+        results, _ = await _classify(
+            gateway, 200, max_concurrency=200, use_async_client=False, circuit_breaker=breaker
+        )
+        assert [r for r in results if isinstance(r, Exception)] == []
+
+    _serve(test, latency=0.02)
+    assert breaker.state == "closed"
+    assert breaker.transitions["open"] == 0
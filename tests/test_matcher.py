@@ -0,0 +1,37 @@
+"""KeywordAutomaton: single-pass matching equals per-keyword substring checks."""
+
+from __future__ import annotations
+
+import random
+
+from sage_libs.sage_agentic.intent import catalog
+from sage_libs.sage_agentic.intent.keyword_recognizer import KNOWLEDGE_TRIGGERS
+from sage_libs.sage_agentic.intent.matcher import KeywordAutomaton
+
+
+def _naive(groups: list[list[str]], text: str) -> dict[int, list[int]]:
+    matched: dict[int, list[int]] = {}
+    for group, keywords in enumerate(groups):
+        indices = [i for i, keyword in enumerate(keywords) if keyword.lower() in text]
+        if indices:
+            matched[group] = indices
+    return matched
+
+
+def test_catalog_keywords_match_like_substrings() -> None:
+    groups = [list(tool.keywords) for tool in catalog.INTENT_TOOLS] + [list(KNOWLEDGE_TRIGGERS)]
+    automaton = KeywordAutomaton(groups)
+    vocabulary = [keyword for keywords in groups for keyword in keywords]
+    vocabulary += ["the", "日志", "xyz", " ", "Sage", "ERROR"]
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12))).lower()
+        assert automaton.match(text) == _naive(groups, text), text
+
+
+def test_overlapping_and_shared_keywords() -> None:
+    groups = [["he", "she", "hers"], ["his", "she"], [""]]
+    automaton = KeywordAutomaton(groups)
+    assert automaton.match("ushers") == {0: [0, 1, 2], 1: [1], 2: [0]}
+    hits = sorted((hit.group, hit.index, hit.start) for hit in automaton.iter_matches("ushers"))
+    assert hits == [(0, 0, 2), (0, 1, 1), (0, 2, 2), (1, 1, 1), (2, 0, 0)]
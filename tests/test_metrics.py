@@ -0,0 +1,74 @@
+"""Metrics: Prometheus exposition and what the chain records."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier, IntentMetrics
+from sage_libs.sage_agentic.intent.base import (
+    ChainedIntentRecognizer,
+    IntentRecognitionContext,
+    IntentRecognizer,
+)
+from sage_libs.sage_agentic.intent.metrics import MetricsRegistry
+from sage_libs.sage_agentic.intent.types import IntentResult
+
+
+class Broken(IntentRecognizer):
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        raise RuntimeError("down")
+
+
+def test_exposition_format() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("path",))
+    counter.inc('a"b\\c\n')
+    counter.inc('a"b\\c\n', amount=2)
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert registry.to_prometheus().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="a\\"b\\\\c\\n"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+    assert registry.counter("requests_total", "Requests.", ("path",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("requests_total", "Requests.")
+
+
+def test_classifier_records_results_fallbacks_and_choices() -> None:
+    metrics = IntentMetrics()
+    classifier = IntentClassifier(metrics=metrics, min_confidence=0.6)
+    for message in ("hi", "how to install sage", "restart gateway"):
+        classifier.classify_sync(message)
+    asyncio.run(classifier.classify_batch(["hi", "zzz"]))
+
+    name = "KeywordIntentRecognizer"
+    # "hi" and "zzz" fall below 0.6, so both chain positions run for them.
+    assert metrics.latency.count(name) == 8
+    assert metrics.fallbacks.value(name, "low_confidence") == 6
+    assert metrics.chosen.value(name, "general_chat") == 3
+    assert metrics.chosen.value(name, "system_operation") == 1
+    chosen = 'intent_chosen_total{recognizer="KeywordIntentRecognizer",intent="knowledge_query"} 1'
+    assert chosen in metrics.to_prometheus()
+
+
+def test_errors_are_counted() -> None:
+    metrics = IntentMetrics()
+    chain = ChainedIntentRecognizer([Broken()], metrics=metrics)
+    with pytest.raises(RuntimeError, match="No intent recognizer available"):
+        asyncio.run(chain.classify(IntentRecognitionContext(message="hi")))
+    assert metrics.errors.value("Broken") == 1
+    assert metrics.latency.count("Broken") == 1
+    assert metrics.fallbacks.value("Broken", "error") == 1
@@ -0,0 +1,105 @@
+"""Bulk relabeling: record format, ordering across workers, checkpoint and resume."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+from sage_libs.sage_agentic.intent import relabel as relabel_module
+from sage_libs.sage_agentic.intent.relabel import main, relabel
+
+MESSAGES = ["how do I restart the gateway", "write a sage pipeline", "hello", "什么是 SAGE"]
+LINES = 3000
+
+
+@pytest.fixture
+def logs(tmp_path) -> str:
+    path = tmp_path / "in.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(LINES):
+            if i == 5:
+                f.write("\n")
+            elif i == 7:
+                f.write("not json\n")
+            elif i == 9:
+                f.write(json.dumps({"id": i, "message": 3}) + "\n")
+            else:
+                f.write(json.dumps({"id": i, "message": f"{MESSAGES[i % 4]} {i}"}) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def reference(logs: str, tmp_path) -> bytes:
+    path = tmp_path / "reference.jsonl"
+    stats = relabel(logs, str(path), id_field="id", workers=1, log=None)
+    assert (stats.lines, stats.errors) == (LINES, 2)
+    return path.read_bytes()
+
+
+def _read(path) -> bytes:  # type: ignore[no-untyped-def]
+    return gzip.open(path).read() if str(path).endswith(".gz") else path.read_bytes()
+
+
+def test_records(reference: bytes) -> None:
+    records = [json.loads(line) for line in reference.splitlines()]
+    assert len(records) == LINES - 1  # the blank line is skipped
+    assert records[0]["line"] == 1
+    assert records[0]["id"] == 0
+    assert records[0]["intent"] == "system_operation"
+    assert records[6]["line"] == 8
+    assert records[6]["error"].startswith("JSONDecodeError")
+    assert records[8]["error"] == "TypeError: 'message' is int, not str"
+
+
+def test_workers_keep_input_order(logs: str, reference: bytes, tmp_path) -> None:
+    out = tmp_path / "out.jsonl"
+    relabel(logs, str(out), id_field="id", workers=2, chunk_size=100, log=None)
+    assert out.read_bytes() == reference
+
+
+@pytest.mark.parametrize("name", ["out.jsonl", "out.jsonl.gz"])
+def test_resume_after_interruption(
+    logs: str, reference: bytes, tmp_path, monkeypatch, name: str
+) -> None:
+    out = tmp_path / name
+    real_chunk = relabel_module.relabel_chunk
+    calls = []
+
+    def crash_midway(lines, first_line):  # type: ignore[no-untyped-def]
+        calls.append(first_line)
+        if len(calls) == 12:
+            raise KeyboardInterrupt
+        return real_chunk(lines, first_line)
+
+    monkeypatch.setattr(relabel_module, "relabel_chunk", crash_midway)
+    with pytest.raises(KeyboardInterrupt):
+        relabel(logs, str(out), id_field="id", workers=1, chunk_size=100, checkpoint_every=500)
+    monkeypatch.undo()
+    checkpoint = json.loads((tmp_path / f"{name}.ckpt").read_text())
+    assert checkpoint["lines"] == 1000
+
+    stats = relabel(logs, str(out), id_field="id", workers=1, log=None)
+    assert (stats.resumed_from, stats.lines) == (1000, LINES - 1000)
+    assert not (tmp_path / f"{name}.ckpt").exists()
+    assert _read(out) == reference
+
+
+def test_checkpoint_from_other_settings_is_rejected(logs: str, tmp_path) -> None:
+    out = tmp_path / "out.jsonl"
+    (tmp_path / "out.jsonl.ckpt").write_text(
+        json.dumps({"identity": {}, "lines": 1, "output_bytes": 1})
+    )
+    with pytest.raises(ValueError, match="--restart"):
+        relabel(logs, str(out), log=None)
+    relabel(logs, str(out), restart=True, workers=1, log=None)
+    assert not (tmp_path / "out.jsonl.ckpt").exists()
+
+
+def test_cli(logs: str, reference: bytes, tmp_path) -> None:
+    out = tmp_path / "out.jsonl"
+    assert main([logs, str(out), "--id-field", "id", "--workers", "1"]) == 0
+    assert out.read_bytes() == reference
+    with pytest.raises(SystemExit):
+        main([logs, str(out), "--method", "bm25"])
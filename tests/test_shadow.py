@@ -0,0 +1,121 @@
+"""Shadow evaluation: comparison off the request path, bounded and never failing it."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import time
+
+import pytest
+
+from sage_libs.sage_agentic.intent import (
+    IntentClassifier,
+    IntentMetrics,
+    KeywordIntentRecognizer,
+    ShadowEvaluator,
+)
+from sage_libs.sage_agentic.intent.background import BackgroundLoop
+from sage_libs.sage_agentic.intent.base import IntentRecognitionContext, IntentRecognizer
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+MESSAGES = ["帮我写一个 pipeline", "你好", "怎么安装 SAGE", "重启 gateway"]
+
+
+class Fixed(IntentRecognizer):
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.5)
+
+
+@pytest.fixture
+def loop():  # type: ignore[no-untyped-def]
+    loop = BackgroundLoop("shadow-test")
+    yield loop
+    loop.close()
+
+
+def test_identical_recognizer_always_agrees(loop: BackgroundLoop) -> None:
+    metrics = IntentMetrics()
+    shadow = ShadowEvaluator(KeywordIntentRecognizer(), sample_rate=1.0, metrics=metrics, loop=loop)
+    classifier = IntentClassifier(shadow=shadow)
+    for message in MESSAGES:
+        classifier.classify_sync(message)
+    assert shadow.drain(5)
+    stats = shadow.stats()
+    assert stats["outcomes"]["agree"] == 4
+    assert stats["agreement_rate"] == 1.0
+    assert stats["latency_ms"]["shadow"]["p50"] is not None
+    assert 'intent_shadow_total{outcome="agree"} 4' in metrics.to_prometheus()
+
+
+def test_disagreements_are_kept_and_exported(loop: BackgroundLoop, tmp_path) -> None:
+    shadow = ShadowEvaluator(Fixed(), sample_rate=1.0, loop=loop)
+    classifier = IntentClassifier(shadow=shadow)
+
+    async def run() -> None:
+        for message in MESSAGES:
+            await classifier.classify(message)
+        await classifier.classify_batch(MESSAGES)
+
+    asyncio.run(run())
+    assert shadow.drain(5)
+    stats = shadow.stats()
+    assert stats["compared"] == 8
+    assert stats["confusion"]["general_chat"] == {"general_chat": 2}
+    assert stats["confusion"]["sage_coding"] == {"general_chat": 2}
+
+    buffer = io.StringIO()
+    assert shadow.export_disagreements(buffer) == stats["outcomes"]["disagree"] == 6
+    record = json.loads(buffer.getvalue().splitlines()[0])
+    assert (record["message"], record["primary"], record["shadow"]) == (
+        "帮我写一个 pipeline",
+        "sage_coding",
+        "general_chat",
+    )
+    path = tmp_path / "disagreements.jsonl"
+    assert shadow.export_disagreements(str(path)) == 6
+    assert path.read_text(encoding="utf-8") == buffer.getvalue()
+
+
+def test_slow_shadow_never_delays_the_primary(loop: BackgroundLoop) -> None:
+    shadow = ShadowEvaluator(
+        Fixed(delay=0.5), sample_rate=1.0, max_pending=3, concurrency=1, timeout=0.2, loop=loop
+    )
+    classifier = IntentClassifier(shadow=shadow)
+    started = time.perf_counter()
+    for message in MESSAGES * 5:
+        classifier.classify_sync(message)
+    assert time.perf_counter() - started < 0.5
+    assert shadow.drain(5)
+    outcomes = shadow.stats()["outcomes"]
+    assert (outcomes["dropped"], outcomes["timeout"]) == (17, 3)
+
+
+def test_failing_shadow_is_only_counted(loop: BackgroundLoop) -> None:
+    shadow = ShadowEvaluator(Fixed(fail=True), sample_rate=1.0, loop=loop)
+    result = IntentClassifier(shadow=shadow).classify_sync("你好")
+    assert result.intent == UserIntent.GENERAL_CHAT
+    assert shadow.drain(5)
+    assert shadow.stats()["outcomes"]["failed"] == 1
+
+
+def test_sampling(loop: BackgroundLoop) -> None:
+    shadow = ShadowEvaluator(Fixed(), sample_rate=0.0, loop=loop)
+    IntentClassifier(shadow=shadow).classify_sync("hi")
+    assert (shadow.offered, shadow.sampled) == (1, 0)
+
+    shadow = ShadowEvaluator(Fixed(), sample_rate=0.25, seed=0, loop=loop)
+    classifier = IntentClassifier(shadow=shadow)
+    for _ in range(400):
+        classifier.classify_sync("hi")
+    assert shadow.drain(5)
+    assert 60 < shadow.sampled < 140
+    with pytest.raises(ValueError):
+        ShadowEvaluator(Fixed(), sample_rate=1.5)
@@ -0,0 +1,104 @@
+"""SQLite result cache: sharing across processes, expiry, eviction, lock errors."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent.sqlite_cache import SQLiteResultCache, dump_result, load_result
+from sage_libs.sage_agentic.intent.types import IntentResult, KnowledgeDomain, UserIntent
+
+
+def _result(label: str = "general_chat") -> IntentResult:
+    return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=0.5, label=label)
+
+
+def test_rows_round_trip() -> None:
+    result = IntentResult(
+        intent=UserIntent.KNOWLEDGE_QUERY,
+        confidence=0.9,
+        knowledge_domains=[KnowledgeDomain.SAGE_DOCS],
+        matched_keywords=["安装"],
+        raw_prediction="dropped",
+        trace=["KeywordIntentRecognizer:0.90"],
+        scores={UserIntent.KNOWLEDGE_QUERY: 0.9},
+        label="knowledge_query",
+        domain_scores={KnowledgeDomain.SAGE_DOCS: 1.0},
+    )
+    loaded = load_result(dump_result(result))
+    assert loaded.raw_prediction is None
+    loaded.raw_prediction = "dropped"
+    assert loaded == result
+
+
+def test_entries_are_shared_with_another_process(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    code = (
+        "from sage_libs.sage_agentic.intent import IntentClassifier\n"
+        "from sage_libs.sage_agentic.intent.sqlite_cache import SQLiteResultCache\n"
+        f"IntentClassifier(cache=SQLiteResultCache({path!r})).classify_sync('restart the gateway')"
+    )
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+    cache = SQLiteResultCache(path)
+    result = IntentClassifier(cache=cache).classify_sync("restart the gateway")
+    assert result.intent == UserIntent.SYSTEM_OPERATION
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def _put_in_child(cache: SQLiteResultCache) -> None:
+    cache.put(cache.make_key("from the child"), _result())
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method"
+)
+def test_forked_child_opens_its_own_connection(tmp_path) -> None:
+    cache = SQLiteResultCache(tmp_path / "cache.sqlite3")
+    cache.put(cache.make_key("from the parent"), _result())
+    child = multiprocessing.get_context("fork").Process(target=_put_in_child, args=(cache,))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    assert cache.get(cache.make_key("from the child")) is not None
+    assert cache.get(cache.make_key("from the parent")) is not None
+
+
+def test_expiry_and_eviction(tmp_path) -> None:
+    now = [1000.0]
+    cache = SQLiteResultCache(
+        tmp_path / "cache.sqlite3", max_entries=3, ttl=10, evict_interval=5, clock=lambda: now[0]
+    )
+    cache.put(cache.make_key("old"), _result())
+    now[0] += 20
+    assert cache.get(cache.make_key("old")) is None
+    assert cache.expirations == 1
+    for i in range(4):
+        cache.put(cache.make_key(f"m{i}"), _result())
+    # The fifth write evicts the expired row and the oldest live one.
+    assert len(cache) == 3
+    assert cache.evictions == 1
+    assert cache.get(cache.make_key("m0")) is None
+    assert cache.get(cache.make_key("m3")) is not None
+
+
+def test_lock_timeouts_are_skipped_writes(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = SQLiteResultCache(path, timeout=0.01)
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        cache.put(cache.make_key("hi"), _result())
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    assert cache.errors == 1
+    assert cache.get(cache.make_key("hi")) is None
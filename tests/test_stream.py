@@ -0,0 +1,98 @@
+"""IntentClassifier.classify_stream: order, bounded concurrency and backpressure."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from sage_libs.sage_agentic.intent import IntentClassifier
+from sage_libs.sage_agentic.intent.base import (
+    ChainedIntentRecognizer,
+    IntentRecognitionContext,
+    IntentRecognizer,
+)
+from sage_libs.sage_agentic.intent.types import IntentResult, UserIntent
+
+
+class Sleepy(IntentRecognizer):
+    """Sleeps for the number of milliseconds in the message, tracking peak concurrency."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def classify(self, ctx: IntentRecognitionContext) -> IntentResult:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(int(ctx.message) / 1000)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+        return IntentResult(intent=UserIntent.GENERAL_CHAT, confidence=1.0)
+
+
+def _classifier() -> tuple[IntentClassifier, Sleepy]:
+    classifier = IntentClassifier()
+    sleepy = Sleepy()
+    classifier._recognizer = ChainedIntentRecognizer([sleepy])
+    return classifier, sleepy
+
+
+def test_ordered_stream_bounds_concurrency_and_reads() -> None:
+    classifier, sleepy = _classifier()
+    reads = []
+
+    async def source():  # type: ignore[no-untyped-def]
+        for i in range(20):
+            reads.append(i)
+            message = str(20 - i)
+            yield message if i % 2 else IntentRecognitionContext(message=message)
+
+    async def run() -> list[str]:
+        seen = []
+        async for item, _ in classifier.classify_stream(source(), concurrency=2, buffer_size=4):
+            seen.append(item if isinstance(item, str) else item.message)
+            # Only the buffer (plus the item just yielded) has been pulled.
+            assert len(reads) <= len(seen) + 4
+        return seen
+
+    assert asyncio.run(run()) == [str(20 - i) for i in range(20)]
+    assert sleepy.peak == 2
+
+
+def test_unordered_stream_yields_as_results_complete() -> None:
+    classifier, _ = _classifier()
+
+    async def run() -> list[str]:
+        stream = classifier.classify_stream(["60", "1", "30"], concurrency=3, ordered=False)
+        return [item async for item, _ in stream]
+
+    assert asyncio.run(run()) == ["1", "30", "60"]
+
+
+def test_closing_the_stream_cancels_pending_work() -> None:
+    classifier, sleepy = _classifier()
+
+    async def run() -> None:
+        stream = classifier.classify_stream(["1", "500", "501", "502"], concurrency=4)
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sleepy.cancelled == 3
+    assert sleepy.running == 0
+
+
+def test_concurrency_must_be_positive() -> None:
+    async def run() -> None:
+        async for _ in IntentClassifier().classify_stream(["hi"], concurrency=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())